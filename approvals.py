@@ -0,0 +1,167 @@
+"""
+Startup pre-approval pass
+
+Without it, execute_order prepends an approve of exactly the order amount to
+the bundle whenever the router allowance is short, so triggered bundles carry
+a second transaction. With PREAPPROVE set, the router allowance of every
+(wallet, sell token) the orders use is read in one batched request at startup
+and the missing approvals are sent and mined before monitoring starts, so
+trigger-time bundles only contain the swap.
+
+PREAPPROVE modes:
+  orders  - approve what the wallet's assigned orders of that token sell in total
+  max     - unlimited approval (2**256 - 1), never needs renewing
+
+Orders added later (order file reload) or allowances that ran out still get
+the trigger-time approve as before.
+"""
+import requests
+from web3 import Web3
+
+from contracts import UNISWAP_ROUTER, CHAIN_ID, ERC20_ABI
+from fast_rpc import rpc_batch
+
+# ========================================
+# Constants
+# ========================================
+
+MODES = ("orders", "max")
+MAX_ALLOWANCE = 2**256 - 1
+RECEIPT_TIMEOUT = 300       # Seconds to wait for the approvals to be mined
+
+# bytes4(keccak256("allowance(address,address)"))
+ALLOWANCE_SELECTOR = "dd62ed3e"
+
+
+def encode_allowance(owner, spender):
+    """allowance(owner, spender) calldata"""
+    return "0x" + ALLOWANCE_SELECTOR + owner[2:].lower().rjust(64, "0") + spender[2:].lower().rjust(64, "0")
+
+
+def read_allowances(rpc_url, pairs, spender=UNISWAP_ROUTER, session=None):
+    """
+    Router allowance of every (owner, token) in one batched request
+    Returns dict (owner, token) -> allowance (missing when the call failed)
+    """
+    pairs = list(pairs)
+    results = rpc_batch(session or requests.Session(), rpc_url, [
+        ("eth_call", [{"to": token, "data": encode_allowance(owner, spender)}, "latest"])
+        for owner, token in pairs
+    ])
+    return {pair: int(result, 16) for pair, result in zip(pairs, results) if result and result != "0x"}
+
+
+def required_allowances(lanes, orders):
+    """
+    Total amount every lane sells per token and the gas settings to approve it with
+    Returns dict (lane, token) -> {"amount", "gas_price_gwei", "gas_limit"}
+    """
+    required = {}
+    for order_id, (lane, token, amount) in lanes.assignments.items():
+        order = orders[order_id]
+        entry = required.setdefault((lane, token), {"amount": 0, "gas_price_gwei": 0, "gas_limit": 0})
+        entry["amount"] += amount
+        entry["gas_price_gwei"] = max(entry["gas_price_gwei"], order.gas_price_gwei)
+        entry["gas_limit"] = max(entry["gas_limit"], order.approve_gas_limit)
+    return required
+
+
+def plan_approvals(required, allowances, mode):
+    """
+    Approvals needed so every lane can swap all of its orders without approving
+    Returns a list of (lane, token, current_allowance, new_allowance, gas_price_gwei, gas_limit)
+    """
+    plan = []
+    for (lane, token), entry in required.items():
+        current = allowances.get((lane.address, token))
+        if current is not None and current >= entry["amount"]:
+            continue
+        new_allowance = MAX_ALLOWANCE if mode == "max" else entry["amount"]
+        plan.append((lane, token, current or 0, new_allowance, entry["gas_price_gwei"], entry["gas_limit"]))
+    return plan
+
+
+def send_approvals(w3, plan, spender=UNISWAP_ROUTER):
+    """
+    Sign and send the planned approvals from their lanes
+    Tokens like USDT refuse to change a non-zero allowance, so those are reset to 0 first
+    Returns the list of sent transaction hashes
+    """
+    tx_hashes = []
+    for lane, token, current, new_allowance, gas_price_gwei, gas_limit in plan:
+        contract = w3.eth.contract(address=token, abi=ERC20_ABI)
+        amounts = [0, new_allowance] if current > 0 else [new_allowance]
+        for amount in amounts:
+            tx = contract.functions.approve(spender, amount).build_transaction({
+                "from": lane.address,
+                "nonce": lane.next_nonce(w3),
+                "gas": gas_limit,
+                "gasPrice": w3.to_wei(gas_price_gwei, 'gwei'),
+                "chainId": CHAIN_ID
+            })
+            (raw, _), = lane.sign_blocking([tx])
+            tx_hashes.append(Web3.to_hex(w3.eth.send_raw_transaction(raw)))
+            lane.advance_nonce(1)
+    return tx_hashes
+
+
+def wait_for_receipts(w3, tx_hashes, timeout=RECEIPT_TIMEOUT):
+    """Wait until every transaction is mined, returns the hashes that failed or timed out"""
+    failed = []
+    for tx_hash in tx_hashes:
+        try:
+            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+            if receipt["status"] != 1:
+                failed.append(tx_hash)
+        except Exception:
+            failed.append(tx_hash)
+    return failed
+
+
+def preapprove(w3, lanes, orders, mode, spender=UNISWAP_ROUTER, timeout=RECEIPT_TIMEOUT):
+    """
+    Read all allowances the assigned orders depend on and approve what's missing
+    Returns True when every lane is approved for all of its orders
+    Never raises - orders that aren't approved approve at trigger time as before
+    """
+    required = required_allowances(lanes, orders)
+    if not required:
+        return True
+    try:
+        return _preapprove(w3, required, mode, spender, timeout)
+    except Exception as e:
+        # A half-sent plan may have used some nonces - re-read them all from chain
+        for lane, _ in required:
+            lane.reset_nonce()
+        print(f"   ⚠ Pre-approval failed, orders approve at trigger time instead: {str(e)[:200]}")
+        return False
+
+
+def _preapprove(w3, required, mode, spender, timeout):
+    allowances = read_allowances(
+        w3.provider.endpoint_uri, {(lane.address, token) for lane, token in required}, spender
+    )
+    plan = plan_approvals(required, allowances, mode)
+    print(f"🔓 Pre-approval ({mode}): {len(required) - len(plan)}/{len(required)} wallet/token allowance(s) already sufficient")
+    if not plan:
+        return True
+
+    for lane, token, current, new_allowance, _, _ in plan:
+        shown = "unlimited" if new_allowance == MAX_ALLOWANCE else new_allowance
+        print(f"   Lane {lane.index}: approving {shown} of {token} (current allowance: {current})")
+
+    tx_hashes = send_approvals(w3, plan, spender)
+    print(f"   ⏳ Waiting for {len(tx_hashes)} approval(s) to be mined...")
+    failed = wait_for_receipts(w3, tx_hashes, timeout)
+
+    # Re-read nonces from chain - a failed or stuck approval may not have used its nonce
+    for lane, *_ in plan:
+        lane.reset_nonce()
+
+    if failed:
+        print(f"   ⚠ {len(failed)} approval(s) not confirmed, those orders approve at trigger time instead:")
+        for tx_hash in failed:
+            print(f"      {tx_hash}")
+        return False
+    print(f"   ✓ All approvals mined - trigger-time bundles will only contain the swap")
+    return True
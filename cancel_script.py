@@ -1,82 +1,186 @@
+import argparse
 import asyncio
+import os
+import time
+import aiohttp
 from pythereum import TitanBuilder, BuilderRPC
 
+import order_state
+
 # ========================================
-# CONFIGURATION - Edit these values
+# CONFIGURATION
 # ========================================
 
-# Transaction hash to cancel (the hash returned by send_private_transaction)
-TX_HASH_TO_CANCEL = "0x..."
+# Give up on a single cancellation after this many seconds
+CANCEL_TIMEOUT = 10
+
+# Same builder endpoint override as limit_order_script.py
+TITAN_RPC_URL = os.environ.get('TITAN_RPC_URL')
 
 # ========================================
-# Main Function
+# Main Functions
 # ========================================
 
-async def cancel_transaction(tx_hash):
+def titan_builder():
+    """Titan Builder for BuilderRPC, pointed at TITAN_RPC_URL when set"""
+    builder = TitanBuilder()
+    if TITAN_RPC_URL:
+        builder.url = TITAN_RPC_URL
+    return builder
+
+
+async def cancel_transaction(session, url, tx_hash):
     """
     Cancel a private transaction that was sent to Titan Builder.
-    
+    BuilderRPC has no call for this, so it's a plain JSON-RPC request.
+
     Args:
+        session: An open aiohttp.ClientSession
+        url: The builder's RPC endpoint
         tx_hash: The transaction hash to cancel
-    
+
     Returns:
         Result of the cancellation attempt
     """
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "eth_cancelPrivateTransaction",
+        "params": [{"txHash": tx_hash}]
+    }
+    async with session.post(url, json=payload) as response:
+        if response.status != 200:
+            raise ConnectionError(f"HTTP {response.status} from {url}")
+        data = await response.json(content_type=None)
+    if "error" in data:
+        raise RuntimeError(data["error"].get("message", data["error"]))
+    return data.get("result")
+
+
+async def cancel_bundle(client, replacement_uuid):
+    """
+    Cancel a bundle that was sent to Titan Builder with a replacement UUID.
+
+    Args:
+        client: An open BuilderRPC session
+        replacement_uuid: The replacementUuid the bundle was submitted with
+
+    Returns:
+        Result of the cancellation attempt
+    """
+    return await client.cancel_bundle(replacement_uuid)
+
+
+async def cancel_one(client, session, url, instance, submission, state_dir=order_state.STATE_DIR):
+    """
+    Cancel a single submission and report the outcome
+    Returns a result dict, never raises
+    """
+    started = time.time()
+    key = submission.get("replacement_uuid") or submission["tx_hashes"][0]
+    try:
+        if submission.get("replacement_uuid"):
+            coro = cancel_bundle(client, submission["replacement_uuid"])
+        else:
+            coro = cancel_transaction(session, url, submission["tx_hashes"][0])
+        result = await asyncio.wait_for(coro, CANCEL_TIMEOUT)
+        if instance is not None:
+            order_state.update_status(instance, key, order_state.STATUS_CANCELLED, state_dir)
+        ok, detail = True, result
+    except Exception as e:
+        ok, detail = False, e
+    return {
+        "instance": instance,
+        "key": key,
+        "ok": ok,
+        "detail": detail,
+        "elapsed": time.time() - started
+    }
+
+
+async def cancel_all(submissions, state_dir=order_state.STATE_DIR):
+    """
+    Cancel many submissions concurrently over one shared builder session
+
+    Args:
+        submissions: List of (instance_name, submission) tuples, see order_state.load_outstanding
+        state_dir: Directory of the state files the cancelled submissions are marked in
+
+    Returns:
+        List of result dicts in the same order as submissions
+    """
+    builder = titan_builder()
+    async with BuilderRPC(builder) as client, aiohttp.ClientSession() as session:
+        return await asyncio.gather(*(
+            cancel_one(client, session, builder.url, instance, submission, state_dir)
+            for instance, submission in submissions
+        ))
+
+
+def print_results(results, elapsed):
+    print("\n" + "=" * 60)
+    print("CANCELLATION RESULTS")
     print("=" * 60)
-    print("TITAN BUILDER - CANCEL TRANSACTION")
-    print("=" * 60)
-    print(f"Transaction to cancel: {tx_hash}")
+
+    for result in results:
+        instance = result["instance"] or "manual"
+        if result["ok"]:
+            print(f"✓ [{instance}] {result['key']} ({result['elapsed'] * 1000:.0f} ms): {result['detail']}")
+        else:
+            print(f"✗ [{instance}] {result['key']} ({result['elapsed'] * 1000:.0f} ms): {str(result['detail'])[:100]}")
+
+    succeeded = sum(1 for result in results if result["ok"])
     print("=" * 60)
-    
-    async with BuilderRPC(TitanBuilder()) as client:
-        print("\n📤 Sending cancellation request...")
-        
-        try:
-            # Attempt to cancel the transaction
-            result = await client.cancel_private_transaction(tx_hash)
-            
-            print("\n" + "=" * 60)
-            print("CANCELLATION RESULT")
-            print("=" * 60)
-            print(f"✓ Success! Result: {result}")
-            print("\nNote: This cancels the transaction with the builder,")
-            print("but if it was already included in a block, the")
-            print("cancellation won't have any effect.")
-            
-            return result
-            
-        except Exception as e:
-            print("\n" + "=" * 60)
-            print("CANCELLATION FAILED")
-            print("=" * 60)
-            print(f"✗ Error: {e}")
-            print("\nPossible reasons:")
-            print("  - Transaction already included in a block")
-            print("  - Invalid transaction hash")
-            print("  - Transaction not found in builder's mempool")
-            print("  - Transaction already executed or failed")
-            
-            return None
+    print(f"Cancelled {succeeded}/{len(results)} in {elapsed * 1000:.0f} ms")
+    print("\nNote: This cancels with the builder, but anything that was")
+    print("already included in a block won't be affected.")
 
 
 async def main():
     """Main entry point for the script."""
-    
+    parser = argparse.ArgumentParser(
+        description="Cancel in-flight bundles and private transactions with Titan Builder"
+    )
+    parser.add_argument("tx_hashes", nargs="*",
+                        help="Transaction hashes to cancel (default: all pending submissions in the bot state)")
+    parser.add_argument("--instance", action="append",
+                        help="Only cancel submissions of this instance, e.g. config_1 (repeatable)")
+    parser.add_argument("--state-dir", default=order_state.STATE_DIR,
+                        help=f"Directory with the bot state files (default: {order_state.STATE_DIR})")
+    parser.add_argument("--list", action="store_true",
+                        help="Only list pending submissions, don't cancel anything")
+    args = parser.parse_args()
+
     # Validate transaction hash format
-    if TX_HASH_TO_CANCEL == "0x..." or not TX_HASH_TO_CANCEL.startswith("0x"):
-        print("⚠ ERROR: Please set TX_HASH_TO_CANCEL to a valid transaction hash!")
-        print("Example: TX_HASH_TO_CANCEL = '0x1234567890abcdef...'")
-        return
-    
-    # Cancel the transaction
-    result = await cancel_transaction(TX_HASH_TO_CANCEL)
-    
-    if result:
-        print("\n✓ Transaction cancellation completed successfully!")
+    for tx_hash in args.tx_hashes:
+        if not tx_hash.startswith("0x") or len(tx_hash) != 66:
+            print(f"⚠ ERROR: Invalid transaction hash: {tx_hash}")
+            return
+
+    if args.tx_hashes:
+        submissions = [(None, {"tx_hashes": [tx_hash]}) for tx_hash in args.tx_hashes]
     else:
-        print("\n✗ Transaction cancellation failed. See error above.")
+        submissions = order_state.load_outstanding(args.state_dir, args.instance)
+
+    print("=" * 60)
+    print("TITAN BUILDER - CANCEL SUBMISSIONS")
+    print("=" * 60)
+    for instance, submission in submissions:
+        label = submission.get("bundle_hash") or submission["tx_hashes"][0]
+        print(f"  [{instance or 'manual'}] {label}")
+    print("=" * 60)
+
+    if not submissions:
+        print("Nothing to cancel")
+        return
+    if args.list:
+        return
+
+    print(f"\n📤 Sending {len(submissions)} cancellation request(s)...")
+    started = time.time()
+    results = await cancel_all(submissions, args.state_dir)
+    print_results(results, time.time() - started)
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
@@ -0,0 +1,219 @@
+"""
+On-disk chain metadata cache
+
+Token decimals and symbols, Uniswap V2 pair addresses (getPair on
+UNISWAP_V2_FACTORY) and the token0/token1 order of those pairs never change
+once they exist, so they're read once and kept in STATE_DIR/chain-<id>.json.
+Everything a set of orders needs that isn't cached yet is read in one batched
+request; with a warm cache a start costs a single eth_chainId call however
+many orders run.
+
+Invalidation:
+  - one file per chain id, discarded when the factory or CACHE_VERSION changes
+  - pairs that don't exist yet (getPair returns 0x0) are never cached
+  - python chain_metadata.py clear [token ...] drops everything, or the given
+    tokens and their pairs
+
+Run:
+  python chain_metadata.py warm --orders configs/orders.toml
+  python chain_metadata.py show [--rpc-url https://... | --chain-id 1]
+  python chain_metadata.py clear [0xToken ...] [--chain-id 1]
+"""
+import argparse
+import json
+import os
+import requests
+from pathlib import Path
+from web3 import Web3
+
+from contracts import UNISWAP_V2_FACTORY, WETH_ADDRESS
+from fast_rpc import rpc_batch
+from quote_server import sort_tokens
+import order_loader
+import order_state
+
+# ========================================
+# Constants
+# ========================================
+
+CACHE_VERSION = 1
+
+DECIMALS_SELECTOR = "0x313ce567"
+SYMBOL_SELECTOR = "0x95d89b41"
+GET_PAIR_SELECTOR = "0xe6a43905"
+
+
+def cache_path(chain_id, state_dir=order_state.STATE_DIR):
+    return Path(state_dir) / f"chain-{chain_id}.json"
+
+
+def pair_key(token_a, token_b):
+    """Cache key of a pair - its token0:token1"""
+    return ":".join(sort_tokens(token_a, token_b))
+
+
+def decode_uint(result):
+    if not result or len(result) < 66:
+        return None
+    return int(result[2:66], 16)
+
+
+def decode_symbol(result):
+    """ERC20 symbol() as an ABI string, or bytes32 for the old tokens (MKR, SAI)"""
+    if not result or len(result) < 66:
+        return None
+    data = bytes.fromhex(result[2:])
+    if len(data) >= 64 and int.from_bytes(data[:32], "big") == 32:
+        length = int.from_bytes(data[32:64], "big")
+        return data[64:64 + length].decode("utf-8", "replace")
+    return data[:32].rstrip(b"\0").decode("utf-8", "replace")
+
+
+class ChainMetadata:
+    """Token and pair metadata of one chain, loaded from and saved to its cache file"""
+
+    def __init__(self, chain_id, state_dir=order_state.STATE_DIR, factory=UNISWAP_V2_FACTORY):
+        self.chain_id = chain_id
+        self.factory = factory
+        self.path = cache_path(chain_id, state_dir)
+        self.tokens = {}            # token -> {"decimals", "symbol"}
+        self.pairs = {}             # "token0:token1" -> pair address
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and data.get("factory") == factory:
+                self.tokens = data["tokens"]
+                self.pairs = data["pairs"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    @classmethod
+    def open(cls, rpc_url, session=None, state_dir=order_state.STATE_DIR):
+        """Cache of the chain the RPC endpoint serves"""
+        chain_id, = rpc_batch(session or requests.Session(), rpc_url, [("eth_chainId", [])])
+        if chain_id is None:
+            raise ConnectionError(f"eth_chainId failed on {rpc_url}")
+        return cls(int(chain_id, 16), state_dir)
+
+    def save(self):
+        """Atomically write the cache file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "version": CACHE_VERSION, "chain_id": self.chain_id, "factory": self.factory,
+                "tokens": self.tokens, "pairs": self.pairs
+            }, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def ensure(self, rpc_url, tokens=(), pairs=(), session=None):
+        """
+        Read whatever of the tokens and (token_a, token_b) pairs isn't cached yet in one batch
+        Returns the number of entries added
+        """
+        tokens = [token for token in dict.fromkeys(tokens) if token not in self.tokens]
+        pairs = [pair for pair in dict.fromkeys(sort_tokens(*pair) for pair in pairs)
+                 if ":".join(pair) not in self.pairs]
+        if not tokens and not pairs:
+            return 0
+
+        calls = []
+        for token in tokens:
+            calls.append(("eth_call", [{"to": token, "data": DECIMALS_SELECTOR}, "latest"]))
+            calls.append(("eth_call", [{"to": token, "data": SYMBOL_SELECTOR}, "latest"]))
+        for token0, token1 in pairs:
+            data = GET_PAIR_SELECTOR + token0[2:].lower().rjust(64, "0") + token1[2:].lower().rjust(64, "0")
+            calls.append(("eth_call", [{"to": self.factory, "data": data}, "latest"]))
+        results = rpc_batch(session or requests.Session(), rpc_url, calls)
+
+        added = 0
+        for index, token in enumerate(tokens):
+            decimals = decode_uint(results[2 * index])
+            if decimals is not None:
+                self.tokens[token] = {"decimals": decimals, "symbol": decode_symbol(results[2 * index + 1])}
+                added += 1
+        for (token0, token1), result in zip(pairs, results[2 * len(tokens):]):
+            address = decode_uint(result)
+            if address:
+                self.pairs[f"{token0}:{token1}"] = Web3.to_checksum_address(f"0x{address:040x}")
+                added += 1
+        if added:
+            self.save()
+        return added
+
+    def decimals(self, token):
+        entry = self.tokens.get(token)
+        return entry["decimals"] if entry else None
+
+    def symbol(self, token):
+        entry = self.tokens.get(token)
+        return entry["symbol"] if entry else None
+
+    def pair(self, token_a, token_b):
+        """(pair address, token0) of a Uniswap V2 pair, None if unknown or not created"""
+        address = self.pairs.get(pair_key(token_a, token_b))
+        return (address, sort_tokens(token_a, token_b)[0]) if address else None
+
+    def invalidate(self, tokens=None):
+        """Drop everything, or the given tokens and every pair they're part of"""
+        if tokens is None:
+            self.tokens, self.pairs = {}, {}
+        else:
+            tokens = set(tokens)
+            for token in tokens:
+                self.tokens.pop(token, None)
+            self.pairs = {key: address for key, address in self.pairs.items()
+                          if not tokens & set(key.split(":"))}
+        self.save()
+
+
+def order_tokens_and_pairs(orders):
+    """Tokens and swap path hops (same path as limit_order_script.py) of a set of orders"""
+    tokens, pairs = set(), set()
+    for order in orders:
+        path = [order.sell_token, WETH_ADDRESS, order.buy_token]
+        tokens.update(path)
+        pairs.update(zip(path, path[1:]))
+    return tokens, pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chain metadata cache")
+    parser.add_argument("command", choices=["warm", "show", "clear"])
+    parser.add_argument("tokens", nargs="*", help="clear: only these tokens and their pairs")
+    parser.add_argument("--orders", default=os.environ.get('CONFIG_FILE'), help="order file (default: CONFIG_FILE)")
+    parser.add_argument("--rpc-url", help="RPC endpoint (default: the first order's rpc_url)")
+    parser.add_argument("--chain-id", type=int, help="show / clear without asking the RPC endpoint")
+    args = parser.parse_args()
+
+    if args.orders and not order_loader.is_order_file(args.orders):
+        parser.error("--orders must be an order file (.json/.toml/.csv)")
+    orders = order_loader.load_orders(args.orders).values() if args.orders else []
+    rpc_url = args.rpc_url or next((order.rpc_url for order in orders), None)
+    if args.chain_id is not None and args.command != "warm":
+        metadata = ChainMetadata(args.chain_id)
+    elif rpc_url is None:
+        parser.error("--rpc-url or an order file is required")
+    else:
+        metadata = ChainMetadata.open(rpc_url)
+
+    if args.command == "warm":
+        tokens, pairs = order_tokens_and_pairs(orders)
+        added = metadata.ensure(rpc_url, tokens, pairs)
+        print(f"✓ {added} entries added, {len(metadata.tokens)} token(s) and {len(metadata.pairs)} pair(s) "
+              f"cached in {metadata.path}")
+    elif args.command == "clear":
+        checksummed = [Web3.to_checksum_address(token) for token in args.tokens]
+        metadata.invalidate(checksummed or None)
+        print(f"✓ Cleared {', '.join(checksummed) or 'everything'} in {metadata.path}")
+    else:
+        print(f"Chain {metadata.chain_id} ({metadata.path}):")
+        for token, entry in sorted(metadata.tokens.items()):
+            print(f"   {token}  {entry['symbol'] or '?':>10}  {entry['decimals']} decimals")
+        for key, address in sorted(metadata.pairs.items()):
+            token0, token1 = key.split(":")
+            print(f"   pair {address}  token0 {token0}  token1 {token1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+On-chain addresses and ABIs shared by the bot and its helper scripts
+"""
+
+WETH_ADDRESS = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+UNISWAP_ROUTER = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+UNISWAP_V2_FACTORY = "0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f"
+UNISWAP_V3_QUOTER_V2 = "0x61fFE014bA17989E743c5F6cB21bF9697530B21e"
+CHAIN_ID = 1
+
+# ERC20 ABI (minimal)
+ERC20_ABI = [
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_spender", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"}
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    }
+]
+
+# Uniswap Router ABI
+UNISWAP_ABI = [
+    {
+        "name": "getAmountsOut",
+        "type": "function",
+        "inputs": [
+            {"type": "uint256", "name": "amountIn"},
+            {"type": "address[]", "name": "path"}
+        ],
+        "outputs": [{"type": "uint256[]", "name": "amounts"}],
+        "stateMutability": "view"
+    },
+    {
+        "name": "swapExactTokensForTokens",
+        "type": "function",
+        "inputs": [
+            {"type": "uint256", "name": "amountIn"},
+            {"type": "uint256", "name": "amountOutMin"},
+            {"type": "address[]", "name": "path"},
+            {"type": "address", "name": "to"},
+            {"type": "uint256", "name": "deadline"}
+        ],
+        "outputs": [{"type": "uint256[]", "name": "amounts"}]
+    }
+]
@@ -0,0 +1,296 @@
+"""
+Runtime diagnostics for a running bot instance
+
+  - event loop lag: a task that sleeps LAG_INTERVAL and measures how late it wakes up
+  - stall detection: a watchdog thread captures the loop thread's stack when the
+    loop hasn't run for STALL_THRESHOLD seconds (i.e. a blocking call such as a
+    synchronous requests.post or web3 call) and prints it
+  - per-coroutine time: every task's steps are timed and summed by coroutine name
+  - sampling profiler: samples the loop thread's stack at SAMPLE_HZ while enabled
+    and writes folded stacks (flamegraph.pl / speedscope / inferno compatible)
+
+Toggle on a running instance:
+  kill -USR1 <pid>       start / stop the profiler (folded file written on stop)
+  kill -USR2 <pid>       print the diagnostics report
+or, with DIAGNOSTICS_PORT set, from inside the container:
+  GET http://127.0.0.1:PORT/status | /profile/start | /profile/stop
+"""
+import asyncio
+import collections
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Coroutine
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# ========================================
+# Constants
+# ========================================
+
+LAG_INTERVAL = 0.1          # Seconds between lag probes
+LAG_WINDOW = 600            # Lag samples kept for percentiles
+STALL_THRESHOLD = 1.0       # Loop blocked this long = stall, stack captured
+MAX_STALLS = 20             # Stall reports kept for the status report
+SAMPLE_HZ = 100             # Profiler samples per second
+
+# TimedCoroutine's own frames, left out of stacks and profiles
+_WRAPPER_FRAMES = {"__next__", "send", "throw", "_timed"}
+
+
+def _is_wrapper_frame(filename, name):
+    return name in _WRAPPER_FRAMES and filename == __file__
+
+
+class TimedCoroutine(Coroutine):
+    """Wraps a task's coroutine and adds the wall time of each step to an account"""
+
+    __slots__ = ("_coro", "_account")
+
+    def __init__(self, coro, account):
+        self._coro = coro
+        self._account = account
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            account = self._account
+            account[0] += elapsed
+            account[1] += 1
+            if elapsed > account[2]:
+                account[2] = elapsed
+
+    def send(self, value):
+        return self._timed(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._timed(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def __getattr__(self, name):
+        return getattr(self._coro, name)
+
+
+class Diagnostics:
+    """Lag monitor, stall watchdog, coroutine accounting and sampling profiler of one event loop"""
+
+    def __init__(self, output_dir=".", port=None, stall_threshold=STALL_THRESHOLD):
+        self.output_dir = Path(output_dir)
+        self.port = port
+        self.stall_threshold = stall_threshold
+        self.loop = None
+        self.loop_thread_id = None
+        self.heartbeat = time.monotonic()
+        self.lags = collections.deque(maxlen=LAG_WINDOW)
+        self.max_lag = 0.0
+        self.stalls = collections.deque(maxlen=MAX_STALLS)
+        self.stall_count = 0
+        self.coroutines = collections.defaultdict(lambda: [0.0, 0, 0.0])   # name -> [seconds, steps, max step]
+        self.profile = None         # Counter of folded stacks while profiling
+        self.profile_started = None
+        self._profile_lock = threading.Lock()
+        self._tasks = []
+        self._stop = threading.Event()
+        self._server = None
+
+    # ---------- setup ----------
+
+    def install(self, loop=None):
+        """Start all monitors on the running loop"""
+        self.loop = loop or asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+
+        previous_factory = self.loop.get_task_factory()
+
+        def task_factory(loop, coro, **kwargs):
+            name = getattr(coro, "__qualname__", type(coro).__name__)
+            timed = TimedCoroutine(coro, self.coroutines[name])
+            if previous_factory is not None:
+                return previous_factory(loop, timed, **kwargs)
+            return asyncio.Task(timed, loop=loop, **kwargs)
+
+        self.loop.set_task_factory(task_factory)
+        self._tasks.append(self.loop.create_task(self._lag_monitor()))
+        threading.Thread(target=self._watchdog, name="diagnostics-watchdog", daemon=True).start()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda *_: self.toggle_profile())
+            signal.signal(signal.SIGUSR2, lambda *_: print(self.report()))
+        if self.port:
+            self._start_server()
+        print(f"🩺 Diagnostics on (pid {os.getpid()}): SIGUSR1 = profiler on/off, SIGUSR2 = report"
+              + (f", http://127.0.0.1:{self.port}/status" if self.port else ""))
+
+    def uninstall(self):
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        if self.profile is not None:
+            self.stop_profile()
+        if self._server is not None:
+            self._server.shutdown()
+
+    # ---------- lag and stalls ----------
+
+    async def _lag_monitor(self):
+        while True:
+            start = time.monotonic()
+            self.heartbeat = start
+            await asyncio.sleep(LAG_INTERVAL)
+            now = time.monotonic()
+            self.heartbeat = now
+            lag = max(0.0, now - start - LAG_INTERVAL)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _loop_stack(self):
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return []
+        return [entry for entry in traceback.extract_stack(frame)
+                if not _is_wrapper_frame(entry.filename, entry.name)]
+
+    def _watchdog(self):
+        reported = None
+        while not self._stop.wait(self.stall_threshold / 4):
+            # The probe itself sleeps LAG_INTERVAL between heartbeats
+            blocked = time.monotonic() - self.heartbeat - LAG_INTERVAL
+            if blocked < self.stall_threshold:
+                reported = None
+                continue
+            if reported == self.heartbeat:
+                continue
+            # First time this stall is seen - capture where the loop thread is stuck
+            reported = self.heartbeat
+            self.stall_count += 1
+            stack = self._loop_stack()
+            self.stalls.append((time.time(), blocked, stack))
+            print(f"\n🐢 Event loop blocked for {blocked:.2f}s+ in:")
+            print("".join(traceback.format_list(stack[-8:])).rstrip())
+
+    # ---------- profiler ----------
+
+    def start_profile(self):
+        if self.profile is not None:
+            return False
+        self.profile = collections.Counter()
+        self.profile_started = time.time()
+        threading.Thread(target=self._sampler, name="diagnostics-profiler", daemon=True).start()
+        print(f"🔬 Profiler started ({SAMPLE_HZ} Hz)")
+        return True
+
+    def stop_profile(self):
+        """Stop sampling and write the folded stacks, returns the file path"""
+        with self._profile_lock:
+            profile, self.profile = self.profile, None
+        if profile is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        with open(path, "w") as f:
+            f.write(self.folded(profile))
+        print(f"🔬 Profiler stopped after {time.time() - self.profile_started:.0f}s, "
+              f"{sum(profile.values())} samples → {path}")
+        return path
+
+    def toggle_profile(self):
+        if self.profile is None:
+            self.start_profile()
+        else:
+            self.stop_profile()
+
+    def _sampler(self):
+        profile = self.profile
+        interval = 1 / SAMPLE_HZ
+        while self.profile is profile and not self._stop.wait(interval):
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if not _is_wrapper_frame(code.co_filename, code.co_name):
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                with self._profile_lock:
+                    if self.profile is profile:
+                        profile[";".join(reversed(stack))] += 1
+
+    @staticmethod
+    def folded(profile):
+        """Folded stack format: one 'frame;frame;frame count' line per stack"""
+        return "".join(f"{stack} {count}\n" for stack, count in profile.most_common())
+
+    # ---------- report ----------
+
+    def report(self, top=15):
+        lines = [f"🩺 Diagnostics report (pid {os.getpid()})"]
+        if self.lags:
+            lags = sorted(self.lags)
+            p50 = lags[len(lags) // 2]
+            p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+            lines.append(f"   Loop lag: p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, "
+                         f"max {self.max_lag * 1000:.0f} ms (last {len(lags)} probes)")
+        lines.append(f"   Stalls over {self.stall_threshold}s: {self.stall_count}")
+        for when, blocked, stack in list(self.stalls)[-3:]:
+            where = stack[-1] if stack else None
+            location = f"{os.path.basename(where.filename)}:{where.lineno} {where.name}" if where else "?"
+            lines.append(f"      {time.strftime('%H:%M:%S', time.localtime(when))} {blocked:.2f}s+ at {location}")
+
+        if self.coroutines:
+            lines.append(f"   Coroutine time (wall time of their steps on the loop):")
+            ranked = sorted(self.coroutines.items(), key=lambda item: item[1][0], reverse=True)
+            for name, (seconds, steps, max_step) in ranked[:top]:
+                lines.append(f"      {seconds:9.3f}s  {steps:7d} steps  max {max_step * 1000:7.1f} ms  {name}")
+        lines.append(f"   Profiler: {'running since ' + time.strftime('%H:%M:%S', time.localtime(self.profile_started)) if self.profile is not None else 'off'}")
+        return "\n".join(lines)
+
+    # ---------- local endpoint ----------
+
+    def _start_server(self):
+        diagnostics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/status":
+                    body = diagnostics.report()
+                elif self.path == "/profile/start":
+                    body = "started" if diagnostics.start_profile() else "already running"
+                elif self.path == "/profile/stop":
+                    profile = diagnostics.profile
+                    path = diagnostics.stop_profile()
+                    body = diagnostics.folded(profile) if path else "not running"
+                else:
+                    self.send_error(404)
+                    return
+                data = (body + "\n").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        # Own thread, so the endpoint answers even while the loop is blocked
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="diagnostics-http", daemon=True).start()
@@ -0,0 +1,181 @@
+"""
+Low-overhead getAmountsOut reads
+
+web3's contract machinery re-encodes the same getAmountsOut(amount, path)
+arguments on every tick, runs its middleware stack and decodes the whole
+uint256[] result. For a limit order the calldata never changes, so here it is
+ABI-encoded once per order, wrapped in a prebuilt JSON-RPC request body and
+sent over a persistent keep-alive connection. Only the last 32-byte word of
+the result (the final output amount) is decoded.
+
+Benchmark against the web3 path (offline, against a local stub node):
+  python fast_rpc.py [--quotes 2000]
+"""
+import argparse
+import json
+import time
+import requests
+
+from contracts import UNISWAP_ROUTER
+
+# ========================================
+# Constants
+# ========================================
+
+# bytes4(keccak256("getAmountsOut(uint256,address[])"))
+GET_AMOUNTS_OUT_SELECTOR = "d06ca61f"
+
+HEADERS = {"Content-Type": "application/json"}
+
+
+def rpc_batch(session, rpc_url, calls, timeout=10):
+    """Send a list of (method, params) as one JSON-RPC batch, results in order (None on error)"""
+    payload = [
+        {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+        for index, (method, params) in enumerate(calls)
+    ]
+    response = session.post(rpc_url, json=payload, timeout=timeout)
+    response.raise_for_status()
+    by_id = {item["id"]: item for item in response.json()}
+    return [by_id.get(index, {}).get("result") for index in range(len(calls))]
+
+
+def encode_get_amounts_out(amount_in, path):
+    """ABI-encode getAmountsOut(amount_in, path) calldata as a 0x-prefixed hex string"""
+    words = [
+        format(amount_in, "064x"),
+        format(0x40, "064x"),               # offset of the dynamic path array
+        format(len(path), "064x"),
+    ]
+    words.extend(address[2:].lower().rjust(64, "0") for address in path)
+    return "0x" + GET_AMOUNTS_OUT_SELECTOR + "".join(words)
+
+
+def decode_last_word(result):
+    """Final element of an ABI-encoded uint256[] (hex string) - the amount out"""
+    if not result or len(result) < 2 + 64 * 3:
+        return None
+    return int(result[-64:], 16)
+
+
+class FastQuoter:
+    """Sends prebuilt eth_call requests over one persistent HTTP connection"""
+
+    def __init__(self, rpc_url, router=UNISWAP_ROUTER, timeout=10):
+        self.rpc_url = rpc_url
+        self.router = router
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def prepare(self, amount_in, path, block="latest"):
+        """Encode the request for one order once - returns a PreparedQuote"""
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_call",
+            "params": [{"to": self.router, "data": encode_get_amounts_out(amount_in, path)}, block]
+        }, separators=(",", ":")).encode()
+        return PreparedQuote(self, body)
+
+    def send(self, body):
+        """POST a prebuilt body, returns the final amount out or None"""
+        response = self.session.post(self.rpc_url, data=body, headers=HEADERS, timeout=self.timeout)
+        response.raise_for_status()
+        return decode_last_word(response.json().get("result"))
+
+
+class PreparedQuote:
+    """Prebuilt getAmountsOut request of one order"""
+
+    __slots__ = ("quoter", "body")
+
+    def __init__(self, quoter, body):
+        self.quoter = quoter
+        self.body = body
+
+    def fetch(self):
+        return self.quoter.send(self.body)
+
+
+# ========================================
+# Benchmark
+# ========================================
+
+def _run_stub_node(port_queue):
+    """Minimal JSON-RPC node answering every eth_call with a fixed getAmountsOut result"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    result = "0x" + "".join(format(value, "064x") for value in (0x20, 3, 20 * 10**6, 5 * 10**15, 91 * 10**18))
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def benchmark(quotes):
+    """Measure client CPU time per quote: web3 contract call vs prebuilt raw request"""
+    import multiprocessing
+    from web3 import Web3
+    from contracts import UNISWAP_ABI, WETH_ADDRESS
+
+    port_queue = multiprocessing.Queue()
+    node = multiprocessing.Process(target=_run_stub_node, args=(port_queue,), daemon=True)
+    node.start()
+    rpc_url = f"http://127.0.0.1:{port_queue.get()}"
+
+    amount_in = 20 * 10**6
+    path = [
+        "0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        WETH_ADDRESS,
+        "0xc718dd93c450d3a97F51f0a9205d1072eD6197F9",
+    ]
+
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    router_contract = w3.eth.contract(address=UNISWAP_ROUTER, abi=UNISWAP_ABI)
+    prepared = FastQuoter(rpc_url).prepare(amount_in, path)
+
+    def web3_path():
+        return router_contract.functions.getAmountsOut(amount_in, path).call()[-1]
+
+    def fast_path():
+        return prepared.fetch()
+
+    results = {}
+    for name, quote in (("web3 contract call", web3_path), ("prebuilt raw request", fast_path)):
+        assert quote() == 91 * 10**18
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(quotes):
+            quote()
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        results[name] = cpu
+        print(f"   {name:<22} {cpu / quotes * 1e6:8.1f} µs CPU/quote   {wall / quotes * 1e6:8.1f} µs wall/quote")
+
+    node.terminate()
+    cpu_web3, cpu_fast = results.values()
+    print(f"\n   Speedup (CPU): {cpu_web3 / cpu_fast:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the fast getAmountsOut path against web3")
+    parser.add_argument("--quotes", type=int, default=2000, help="Quotes per path (default: 2000)")
+    args = parser.parse_args()
+
+    print(f"⏱️ Benchmarking {args.quotes} quotes per path against a local stub node...\n")
+    benchmark(args.quotes)
@@ -8,11 +8,30 @@
 
 echo "🔧 Generating docker-compose.yml from configs..."
 
+# RPC endpoint for the shared quote server (first RPC_URL found in the configs)
+quote_rpc_url=$(grep -h '^RPC_URL' configs/config_*.py 2>/dev/null | head -1 | sed 's/^RPC_URL *= *"\(.*\)".*/\1/')
+
 # Start docker-compose file
-cat > docker-compose.yml <<'HEADER'
+cat > docker-compose.yml <<HEADER
 version: '3.8'
 
 services:
+  # ========================================
+  # Shared Quote Server (one RPC poll per pair for all traders)
+  # ========================================
+  quote-server:
+    build: .
+    container_name: titan-quote-server
+    restart: unless-stopped
+    command: ["python", "-u", "quote_server.py"]
+    environment:
+      - QUOTE_RPC_URL=$quote_rpc_url
+      - QUOTE_SOCKET=/app/run/quotes.sock
+    volumes:
+      - quotes:/app/run
+    networks:
+      - trading-network
+
 HEADER
 
 # Find all config files and create services
@@ -38,8 +57,14 @@ for config in configs/config_*.py; do
     environment:
       - CONFIG_FILE=/app/configs/$config_name.py
       - AWS_DEFAULT_REGION=eu-north-1
+      - STATE_DIR=/app/state
+      - QUOTE_SOCKET=/app/run/quotes.sock
     volumes:
       - ./configs:/app/configs:ro
+      - ./state:/app/state
+      - quotes:/app/run
+    depends_on:
+      - quote-server
     networks:
       - trading-network
     logging:
@@ -68,6 +93,10 @@ cat >> docker-compose.yml <<'FOOTER'
 networks:
   trading-network:
     driver: bridge
+
+# Shared volume holding the quote server socket
+volumes:
+  quotes:
 FOOTER
 
 echo ""
@@ -2,75 +2,106 @@ import asyncio
 import time
 import requests
 import os
+import signal
 import sys
-import boto3
-import json
-from botocore.exceptions import ClientError
+import uuid
 from web3 import Web3
-from eth_account import Account
 from pythereum import TitanBuilder, BuilderRPC, Bundle
 
-# ========================================
-# AWS SECRETS MANAGER - Fetch Private Key
-# ========================================
-def get_secret():
-    """Fetch PRIVATE_KEY from AWS Secrets Manager"""
-    secret_name = "limit-order-bot/wallet-key"
-    region_name = 'eu-north-1'
-    
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-    
-    try:
-        get_secret_value_response = client.get_secret_value(
-            SecretId=secret_name
-        )
-    except ClientError as e:
-        # For a list of exceptions thrown, see
-        # https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_GetSecretValue.html
-        print(f"❌ FATAL: Could not fetch PRIVATE_KEY from AWS Secrets Manager!")
-        print(f"   Error: {e}")
-        print(f"   Secret: {secret_name}")
-        print(f"   Region: {region_name}")
-        raise e
-    
-    secret = get_secret_value_response['SecretString']
-    secret_dict = json.loads(secret)
-    return secret_dict.get('WALLET_KEY')  # Key name in Secrets Manager is WALLET_KEY
+from contracts import (
+    WETH_ADDRESS, UNISWAP_ROUTER, CHAIN_ID, ERC20_ABI, UNISWAP_ABI
+)
+import approvals
+import chain_metadata
+import diagnostics
+import fast_rpc
+import mempool_watcher
+import order_loader
+import order_scheduler
+import order_state
+import quote_server
+import rpc_scheduler
+import signing_service
+import wallet_lanes
 
 # ========================================
 # DYNAMIC CONFIG LOADER (for Docker)
 # ========================================
 config_file = os.environ.get('CONFIG_FILE')
+ORDER_BOOK = None
+ORDER_ID = os.environ.get('ORDER_ID')
+ORDERS = {}
 if config_file and os.path.exists(config_file):
     print(f"📦 Loading configuration from: {config_file}")
     
-    # Load config file as a module
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("config", config_file)
-    config_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(config_module)
+    if order_loader.is_order_file(config_file):
+        # Declarative order file (JSON/TOML/CSV) - ORDER_ID picks one order,
+        # without it every order in the file runs in this process
+        try:
+            ORDER_BOOK = order_loader.OrderBook(config_file)
+        except order_loader.OrderValidationError as e:
+            print(f"❌ FATAL: Invalid order file!")
+            for error in e.errors:
+                print(f"   {error}")
+            sys.exit(1)
+        if ORDER_ID is None:
+            ORDERS = dict(ORDER_BOOK.orders)
+        elif ORDER_ID in ORDER_BOOK.orders:
+            ORDERS = {ORDER_ID: ORDER_BOOK.orders[ORDER_ID]}
+        else:
+            print(f"❌ FATAL: Order {ORDER_ID!r} not found in {config_file}")
+            print(f"   Set ORDER_ID to one of: {', '.join(ORDER_BOOK.orders)}")
+            sys.exit(1)
+        if not ORDERS:
+            print(f"❌ FATAL: No orders in {config_file}")
+            sys.exit(1)
+    else:
+        # Load config file as a module
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("config", config_file)
+        config_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(config_module)
+        
+        # Copy all variables from config module to global scope
+        for attr_name in dir(config_module):
+            if not attr_name.startswith('_'):  # Skip private attributes
+                globals()[attr_name] = getattr(config_module, attr_name)
+        
+        # Validate the same way order files are validated
+        order, errors = order_loader.validate_order({
+            name: getattr(config_module, name.upper())
+            for name in order_loader.ORDER_SCHEMA
+            if hasattr(config_module, name.upper())
+        }, order_id=order_state.instance_name(config_file))
+        if errors:
+            print(f"❌ FATAL: Invalid configuration!")
+            for error in errors:
+                print(f"   {error}")
+            sys.exit(1)
+        ORDERS = {order.id: order}
     
-    # Copy all variables from config module to global scope
-    for attr_name in dir(config_module):
-        if not attr_name.startswith('_'):  # Skip private attributes
-            globals()[attr_name] = getattr(config_module, attr_name)
+    # Every order runs over the one Web3 connection monitor_and_execute opens
+    rpc_url_errors = order_loader.endpoint_errors(ORDERS.values())
+    if rpc_url_errors:
+        print(f"❌ FATAL: Invalid configuration!")
+        for error in rpc_url_errors:
+            print(f"   {error}")
+        sys.exit(1)
     
     print("✅ Configuration loaded successfully")
     
-    # Fetch PRIVATE_KEY from AWS Secrets Manager (NO FALLBACK)
+    # Fetch wallet keys from AWS Secrets Manager (NO FALLBACK)
     print("🔐 Fetching PRIVATE_KEY from AWS Secrets Manager...")
     try:
-        private_key = get_secret()
-        if not private_key:
+        wallet_keys = wallet_lanes.get_wallet_keys()
+        if not wallet_keys:
             print("❌ FATAL: PRIVATE_KEY is empty in Secrets Manager!")
             sys.exit(1)
-        globals()['PRIVATE_KEY'] = private_key
-        print("✅ PRIVATE_KEY loaded from AWS Secrets Manager")
+        # Every key is an execution lane (see wallet_lanes.py), the first one
+        # is the original single wallet
+        globals()['WALLET_KEYS'] = wallet_keys
+        globals()['PRIVATE_KEY'] = wallet_keys[0]
+        print(f"✅ PRIVATE_KEY loaded from AWS Secrets Manager ({len(wallet_keys)} wallet(s))")
     except Exception as e:
         print(f"❌ FATAL: Failed to load PRIVATE_KEY from AWS Secrets Manager!")
         print(f"   Cannot proceed without private key.")
@@ -86,9 +117,12 @@ else:
 # All configuration MUST be provided via external config files.
 # Set CONFIG_FILE environment variable to point to your config file.
 # Example: CONFIG_FILE=/app/configs/config_1.py
+# Order files (.json/.toml/.csv) are also accepted, with ORDER_ID selecting
+# the order to run (see order_loader.py) - field names are the lower-case
+# versions of the variables below.
 #
 # Required config variables:
-# - PRIVATE_KEY: Your wallet private key (or loaded from AWS Secrets Manager)
+# - PRIVATE_KEY: Your wallet private key(s) (loaded from AWS Secrets Manager)
 # - RPC_URL: Ethereum RPC endpoint
 # - SELL_TOKEN: Token to sell (address)
 # - BUY_TOKEN: Token to buy (address)
@@ -110,72 +144,64 @@ else:
 # Constants
 # ========================================
 
-WETH_ADDRESS = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
-UNISWAP_ROUTER = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
-UNISWAP_V2_FACTORY = "0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f"
-CHAIN_ID = 1
-
-# Titan Builder Bundle Tracing
-TITAN_STATS_URL = "https://stats.titanbuilder.xyz"
-BUNDLE_CHECK_DELAY = 10  # Check bundle status after 30 seconds
-MAX_BUNDLE_CHECKS = 10  # Check up to 10 times (5 minutes total)
-
-# ERC20 ABI (minimal)
-ERC20_ABI = [
-    {
-        "constant": False,
-        "inputs": [
-            {"name": "_spender", "type": "address"},
-            {"name": "_value", "type": "uint256"}
-        ],
-        "name": "approve",
-        "outputs": [{"name": "", "type": "bool"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "balance", "type": "uint256"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [
-            {"name": "_spender", "type": "address"},
-            {"name": "_owner", "type": "address"}
-        ],
-        "name": "allowance",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "type": "function"
-    }
-]
-
-# Uniswap Router ABI
-UNISWAP_ABI = [
-    {
-        "name": "getAmountsOut",
-        "type": "function",
-        "inputs": [
-            {"type": "uint256", "name": "amountIn"},
-            {"type": "address[]", "name": "path"}
-        ],
-        "outputs": [{"type": "uint256[]", "name": "amounts"}],
-        "stateMutability": "view"
-    },
-    {
-        "name": "swapExactTokensForTokens",
-        "type": "function",
-        "inputs": [
-            {"type": "uint256", "name": "amountIn"},
-            {"type": "uint256", "name": "amountOutMin"},
-            {"type": "address[]", "name": "path"},
-            {"type": "address", "name": "to"},
-            {"type": "uint256", "name": "deadline"}
-        ],
-        "outputs": [{"type": "uint256[]", "name": "amounts"}]
-    }
-]
+# Name of this instance in the shared order state (see order_state.py)
+INSTANCE_NAME = order_state.instance_name(config_file)
+
+# Titan Builder endpoints - bundle submission (default: pythereum's TitanBuilder URL)
+# and bundle tracing; overridable so the bot can run against local mocks (load_test.py)
+TITAN_RPC_URL = os.environ.get('TITAN_RPC_URL')
+TITAN_STATS_URL = os.environ.get('TITAN_STATS_URL', "https://stats.titanbuilder.xyz")
+
+# Adaptive polling - next check time depends on distance to target and volatility
+# (set ADAPTIVE_POLLING=0 to poll every CHECK_INTERVAL as before)
+ADAPTIVE_POLLING = os.environ.get('ADAPTIVE_POLLING', '1') != '0'
+
+# Raw JSON-RPC price reads with precomputed calldata (set FAST_RPC=0 to use web3 only)
+FAST_RPC = os.environ.get('FAST_RPC', '1') != '0'
+
+# Shared quote server socket (unset = every instance queries the router itself)
+QUOTE_SOCKET = os.environ.get('QUOTE_SOCKET')
+
+# Runtime diagnostics - loop lag, stalls with stacks, coroutine time and an
+# on-demand profiler (SIGUSR1 / SIGUSR2 or DIAGNOSTICS_PORT, see diagnostics.py)
+DIAGNOSTICS = os.environ.get('DIAGNOSTICS', '1') != '0'
+DIAGNOSTICS_PORT = int(os.environ.get('DIAGNOSTICS_PORT', '0')) or None
+
+# Approve the router for all orders at startup instead of inside the bundles
+# ('orders' or 'max', unset = approve at trigger time as before - see approvals.py)
+PREAPPROVE = os.environ.get('PREAPPROVE', '').strip().lower() or None
+if PREAPPROVE and PREAPPROVE not in approvals.MODES:
+    print(f"❌ FATAL: PREAPPROVE must be one of: {', '.join(approvals.MODES)}")
+    sys.exit(1)
+
+# Token decimals / symbols and pair metadata cached on disk per chain, checked
+# against the configured decimals at startup (set METADATA_CACHE=0 to skip,
+# see chain_metadata.py)
+METADATA_CACHE = os.environ.get('METADATA_CACHE', '1') != '0'
+
+# Sign transactions in this many worker processes that hold the wallet keys
+# (0 = sign inline on the event loop as before, see signing_service.py)
+SIGNING_WORKERS = int(os.environ.get('SIGNING_WORKERS', '0'))
+
+# Per-endpoint request budget (requests/s, 0 = unlimited) - when it runs out,
+# execution calls go first and price checks far from target last (see rpc_scheduler.py)
+RPC_RATE_LIMIT = rpc_scheduler.RPC_RATE_LIMIT
+
+# Back-run pending swaps that push an order over its target (unset = off).
+# MEMPOOL_BACKRUN=submit sends bundle [pending tx, our swap] for the next block,
+# check only moves the order's next price check forward (see mempool_watcher.py)
+MEMPOOL_WS_URL = mempool_watcher.MEMPOOL_WS_URL
+MEMPOOL_BACKRUN = os.environ.get('MEMPOOL_BACKRUN', 'submit').strip().lower()
+if MEMPOOL_BACKRUN not in ("submit", "check"):
+    print(f"❌ FATAL: MEMPOOL_BACKRUN must be one of: submit, check")
+    sys.exit(1)
+
+def titan_builder():
+    """Titan Builder for BuilderRPC, pointed at TITAN_RPC_URL when set"""
+    builder = TitanBuilder()
+    if TITAN_RPC_URL:
+        builder.url = TITAN_RPC_URL
+    return builder
 
 
 def check_bundle_status(bundle_hash):
@@ -235,20 +261,34 @@ def explain_bundle_status(status_data):
     return explanation
 
 
-async def track_bundle_status(bundle_hash):
+def state_name(order_id):
+    """Name of an order in the shared order state (see order_state.py)"""
+    return order_id if ORDER_BOOK is None else f"{INSTANCE_NAME}-{order_id}"
+
+
+def record_commitment(order_id, lane, token, amount):
+    """LanePool.on_change - keep the order's reserved funds in its state file for wallet_lanes.py rebalance"""
+    address = lane.address if lane is not None else None
+    order_state.record_commitment(state_name(order_id), address, token, amount)
+
+
+async def track_bundle_status(bundle_hash, order):
     """
     Track bundle status over time until it's confirmed or clearly rejected
     Returns True if bundle was executed, False otherwise
     """
     print(f"\n🔍 Tracking bundle status...")
     print(f"   Bundle Hash: {bundle_hash}")
-    print(f"   Will check every {BUNDLE_CHECK_DELAY} seconds for up to {MAX_BUNDLE_CHECKS} attempts")
+    print(f"   Will check every {order.bundle_check_delay} seconds for up to {order.max_bundle_checks} attempts")
     
-    for attempt in range(1, MAX_BUNDLE_CHECKS + 1):
-        await asyncio.sleep(BUNDLE_CHECK_DELAY)
+    for attempt in range(1, order.max_bundle_checks + 1):
+        await asyncio.sleep(order.bundle_check_delay)
         
         print(f"\n📊 Status Check #{attempt}...")
-        status_data = check_bundle_status(bundle_hash)
+        status_data = await rpc_scheduler.run(
+            TITAN_STATS_URL, rpc_scheduler.PRIORITY_STATUS, check_bundle_status, bundle_hash,
+            key=("status", bundle_hash)
+        )
         
         if status_data:
             status = status_data.get("status", "Unknown")
@@ -264,7 +304,7 @@ async def track_bundle_status(bundle_hash):
             if status in ["Invalid", "SimulationFail", "ExcludedFromBlock"]:
                 print(f"\n⚠️ Bundle was NOT included. Your funds are safe (nothing spent).")
                 if status == "ExcludedFromBlock":
-                    print(f"💡 TIP: Increase GAS_PRICE_GWEI (currently {GAS_PRICE_GWEI} gwei) and try again")
+                    print(f"💡 TIP: Increase GAS_PRICE_GWEI (currently {order.gas_price_gwei} gwei) and try again")
                 return False
             
             # If still pending or passed simulation, keep checking
@@ -273,16 +313,32 @@ async def track_bundle_status(bundle_hash):
         else:
             print(f"   ⚠️ Could not fetch status (bundle may be too recent)")
     
-    print(f"\n⏱️ Stopped tracking after {MAX_BUNDLE_CHECKS} attempts ({MAX_BUNDLE_CHECKS * BUNDLE_CHECK_DELAY} seconds)")
+    print(f"\n⏱️ Stopped tracking after {order.max_bundle_checks} attempts ({order.max_bundle_checks * order.bundle_check_delay} seconds)")
     print(f"⚠️ Bundle status unclear - please check your wallet manually!")
     return False
 
 
-def get_current_price(w3, router_contract, amount_in, swap_path):
+def get_current_price(w3, router_contract, amount_in, swap_path, quotes=None, fast_quote=None):
     """
     Get the current price for the swap (how many tokens you'd receive)
+    Uses the shared quote server when available, then the prebuilt raw
+    eth_call (fast_rpc.py), then the web3 router contract
     Returns None if price cannot be determined
     """
+    if quotes is not None:
+        quotes.subscribe(swap_path)
+        amount_out = quotes.get_amounts_out(amount_in, swap_path)
+        if amount_out is not None:
+            return amount_out
+    
+    if fast_quote is not None:
+        try:
+            amount_out = fast_quote.fetch()
+            if amount_out is not None:
+                return amount_out
+        except Exception as e:
+            print(f"   ⚠ Fast price path failed, using web3: {str(e)[:100]}")
+    
     try:
         amounts_out = router_contract.functions.getAmountsOut(
             amount_in,
@@ -296,36 +352,70 @@ def get_current_price(w3, router_contract, amount_in, swap_path):
         return None
 
 
+async def fetch_current_price(w3, router_contract, watch, quotes=None):
+    """
+    get_current_price for an order - the local quote server first, otherwise
+    an RPC read budgeted by the RPC scheduler (see rpc_scheduler.py) at near-
+    or far-from-target priority, shared by orders quoting the same swap
+    """
+    amount_in, swap_path = watch["amount_in_token_units"], watch["swap_path"]
+    if quotes is not None:
+        quotes.subscribe(swap_path)
+        amount_out = quotes.get_amounts_out(amount_in, swap_path)
+        if amount_out is not None:
+            return amount_out
+    
+    priority = rpc_scheduler.quote_priority(watch.get("last_output"), watch["min_acceptable"])
+    return await rpc_scheduler.run(
+        w3.provider.endpoint_uri, priority, get_current_price,
+        w3, router_contract, amount_in, swap_path, None, watch.get("fast_quote"),
+        key=("quote", amount_in, tuple(swap_path))
+    )
+
+
 def check_allowance(w3, token_contract, owner, spender):
     """Check current allowance for a token"""
     try:
-        return token_contract.functions.allowance(spender, owner).call()
+        return token_contract.functions.allowance(owner, spender).call()
     except:
         return 0
 
 
-async def execute_order(w3, account, sell_token_contract, router_contract, 
-                       amount_in_token_units, min_tokens_out, swap_path):
+async def execute_order(w3, lane, order, sell_token_contract, router_contract, 
+                       amount_in_token_units, min_tokens_out, swap_path,
+                       backrun_tx=None, block_number=None):
     """
-    Execute the swap order by sending a bundle to Titan Builder
+    Execute the swap order from its execution lane by sending a bundle to Titan Builder
+    The caller must hold lane.lock so no other order uses the lane's nonces meanwhile
+    With backrun_tx (a pending signed transaction) the bundle puts our
+    transactions right behind it in block_number
     Returns bundle hash if successful, None otherwise
     """
+    address = lane.address
+    
     print("\n" + "=" * 60)
-    print("⚡ EXECUTING ORDER")
+    print(f"⚡ EXECUTING ORDER {order.id} (lane {lane.index}: {address})")
     print("=" * 60)
     
-    # Get current nonce
-    nonce = w3.eth.get_transaction_count(account.address)
+    # Nonce, block and allowance reads go ahead of every queued quote
+    rpc_url = w3.provider.endpoint_uri
+    await rpc_scheduler.acquire(rpc_url, rpc_scheduler.PRIORITY_SUBMIT, 3)
+    
+    # Get current nonce (tracked per lane)
+    nonce = lane.next_nonce(w3)
     
     # Get current block timestamp for deadline
     latest_block = w3.eth.get_block('latest')
     deadline = latest_block['timestamp'] + 300  # 5 minutes from now
     
     # Check if we need to approve
-    current_allowance = check_allowance(w3, sell_token_contract, account.address, UNISWAP_ROUTER)
+    current_allowance = check_allowance(w3, sell_token_contract, address, UNISWAP_ROUTER)
     needs_approval = current_allowance < amount_in_token_units
     
-    transactions = []
+    # A back-run bundle lands only together with the pending transaction
+    transactions = [backrun_tx] if backrun_tx else []
+    tx_hashes = []
+    unsigned = []
     current_nonce = nonce
     
     if needs_approval:
@@ -335,17 +425,13 @@ async def execute_order(w3, account, sell_token_contract, router_contract,
             UNISWAP_ROUTER,
             amount_in_token_units
         ).build_transaction({
-            "from": account.address,
+            "from": address,
             "nonce": current_nonce,
-            "gas": APPROVE_GAS_LIMIT,
-            "gasPrice": w3.to_wei(GAS_PRICE_GWEI, 'gwei'),
+            "gas": order.approve_gas_limit,
+            "gasPrice": w3.to_wei(order.gas_price_gwei, 'gwei'),
             "chainId": CHAIN_ID
         })
-        
-        # Sign approve transaction
-        signed_approve = Account.sign_transaction(approve_tx, PRIVATE_KEY)
-        approve_tx_hex = signed_approve.rawTransaction.hex()
-        transactions.append(approve_tx_hex)
+        unsigned.append(approve_tx)
         current_nonce += 1
     else:
         print(f"✓ Approval not needed (allowance: {current_allowance})")
@@ -356,46 +442,71 @@ async def execute_order(w3, account, sell_token_contract, router_contract,
         amount_in_token_units,
         min_tokens_out,
         swap_path,
-        account.address,
+        address,
         deadline
     ).build_transaction({
-        "from": account.address,
+        "from": address,
         "nonce": current_nonce,
-        "gas": SWAP_GAS_LIMIT,
-        "gasPrice": w3.to_wei(GAS_PRICE_GWEI, 'gwei'),
+        "gas": order.swap_gas_limit,
+        "gasPrice": w3.to_wei(order.gas_price_gwei, 'gwei'),
         "chainId": CHAIN_ID
     })
     
-    # Sign swap transaction
-    signed_swap = Account.sign_transaction(swap_tx, PRIVATE_KEY)
-    swap_tx_hex = signed_swap.rawTransaction.hex()
-    transactions.append(swap_tx_hex)
+    unsigned.append(swap_tx)
     
-    # Simulate swap to make sure it will work
-    print("\n🔍 Final simulation check...")
+    # Sign the bundle in one go - in the signing workers when SIGNING_WORKERS is set
     try:
-        w3.eth.call({
-            'from': account.address,
-            'to': UNISWAP_ROUTER,
-            'data': swap_tx['data']
-        })
-        print("✓ Swap simulation: SUCCESS")
-    except Exception as e:
-        print(f"✗ Swap simulation FAILED: {str(e)[:200]}")
-        print("❌ Aborting order - would likely fail on-chain!")
+        signed = await asyncio.wait_for(lane.sign(unsigned), signing_service.SIGNING_TIMEOUT)
+    except (signing_service.SigningError, asyncio.TimeoutError) as e:
+        print(f"✗ Signing FAILED: {str(e)[:200] or 'timed out'}")
+        print("❌ Aborting order - bundle not signed")
         return None
+    for raw_tx, tx_hash in signed:
+        transactions.append(raw_tx)
+        tx_hashes.append(tx_hash)
+    
+    # Simulate swap to make sure it will work - a back-run swap only meets
+    # its minimum after the pending transaction, the builder simulates both
+    print("\n🔍 Final simulation check...")
+    if backrun_tx:
+        print(f"✓ Skipped for back-run of a pending transaction (block {block_number})")
+    else:
+        await rpc_scheduler.acquire(rpc_url, rpc_scheduler.PRIORITY_SIMULATE)
+        try:
+            w3.eth.call({
+                'from': address,
+                'to': UNISWAP_ROUTER,
+                'data': swap_tx['data']
+            })
+            print("✓ Swap simulation: SUCCESS")
+        except Exception as e:
+            print(f"✗ Swap simulation FAILED: {str(e)[:200]}")
+            print("❌ Aborting order - would likely fail on-chain!")
+            return None
     
     # Send to Titan Builder
     print("\n📤 Sending bundle to Titan Builder...")
     try:
-        async with BuilderRPC(TitanBuilder()) as client:
-            bundle = Bundle(txs=transactions)
+        builder = titan_builder()
+        await rpc_scheduler.acquire(builder.url, rpc_scheduler.PRIORITY_SUBMIT)
+        async with BuilderRPC(builder) as client:
+            # Replacement UUID lets cancel_script.py pull the bundle later
+            replacement_uuid = str(uuid.uuid4())
+            bundle = Bundle(
+                txs=transactions, replacement_uuid=replacement_uuid,
+                block_number=hex(block_number) if block_number else None
+            )
             bundle_result = await client.send_bundle(bundle)
             
             if bundle_result and len(bundle_result) > 0:
                 bundle_hash = bundle_result[0].get('bundleHash') if isinstance(bundle_result[0], dict) else bundle_result[0]
                 print(f"✅ Bundle submitted to Titan Builder!")
                 print(f"   Bundle Hash: {bundle_hash}")
+                print(f"   Replacement UUID: {replacement_uuid}")
+                order_state.record_submission(
+                    state_name(order.id), bundle_hash, replacement_uuid, tx_hashes,
+                    sell_token=sell_token_contract.address
+                )
                 return bundle_hash
             else:
                 print(f"❌ Bundle submission failed: {bundle_result}")
@@ -408,45 +519,117 @@ async def execute_order(w3, account, sell_token_contract, router_contract,
         return None
 
 
-async def monitor_and_execute():
+def order_parameters(w3, order):
     """
-    Main monitoring loop - checks price and executes when conditions are met
+    Derive the on-chain parameters of an order
+    Returns (sell_token_contract, amount_in_token_units, swap_path, target_tokens_human, min_acceptable)
     """
-    # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    sell_token_contract = w3.eth.contract(address=order.sell_token, abi=ERC20_ABI)
+    
+    # Convert sell amount to token units
+    amount_in_token_units = int(order.sell_amount * (10 ** order.sell_token_decimals))
+    
+    # Build swap path - USDT → WETH → {BUY_TOKEN} (standard Uniswap V2 routing)
+    swap_path = [order.sell_token, WETH_ADDRESS, order.buy_token]
     
-    # Create account from private key
-    account = Account.from_key(PRIVATE_KEY)
+    # Calculate minimum acceptable tokens in raw units (with slippage)
+    target_tokens_human = order.target_price * (1 - order.max_slippage_percent / 100)
+    min_acceptable = int(target_tokens_human * (10 ** order.buy_token_decimals))
     
-    # Calculate max runtime in seconds
+    return sell_token_contract, amount_in_token_units, swap_path, target_tokens_human, min_acceptable
+
+
+def max_runtime_seconds(order):
+    """Total max runtime of an order in seconds (0 = unlimited)"""
     total_runtime_seconds = 0
-    if MAX_RUNTIME_YEARS > 0:
-        total_runtime_seconds += MAX_RUNTIME_YEARS * 365 * 24 * 60 * 60
-    if MAX_RUNTIME_MONTHS > 0:
-        total_runtime_seconds += MAX_RUNTIME_MONTHS * 30 * 24 * 60 * 60
-    if MAX_RUNTIME_DAYS > 0:
-        total_runtime_seconds += MAX_RUNTIME_DAYS * 24 * 60 * 60
+    if order.max_runtime_years > 0:
+        total_runtime_seconds += order.max_runtime_years * 365 * 24 * 60 * 60
+    if order.max_runtime_months > 0:
+        total_runtime_seconds += order.max_runtime_months * 30 * 24 * 60 * 60
+    if order.max_runtime_days > 0:
+        total_runtime_seconds += order.max_runtime_days * 24 * 60 * 60
+    return total_runtime_seconds
+
+
+def check_order_metadata(metadata, order, swap_path):
+    """
+    Compare the configured decimals with the token contracts and warn about
+    path hops without a Uniswap V2 pair
+    Returns False if the order's decimals are wrong
+    """
+    if metadata is None:
+        return True
+    valid = True
+    for name, token, configured in (("sell_token_decimals", order.sell_token, order.sell_token_decimals),
+                                    ("buy_token_decimals", order.buy_token, order.buy_token_decimals)):
+        actual = metadata.decimals(token)
+        if actual is None:
+            print(f"   ⚠ {order.id}: could not read the decimals of {token}, using {name} = {configured}")
+        elif actual != configured:
+            print(f"\n❌ ERROR: {order.id}: {name} is {configured} but "
+                  f"{metadata.symbol(token) or token} has {actual} decimals - not starting it")
+            valid = False
+    for token_a, token_b in zip(swap_path, swap_path[1:]):
+        if metadata.pair(token_a, token_b) is None:
+            print(f"   ⚠ {order.id}: no Uniswap V2 pair for {metadata.symbol(token_a) or token_a}/"
+                  f"{metadata.symbol(token_b) or token_b} - price checks fail until it exists")
+    return valid
+
+
+def cache_order_metadata(w3, metadata, orders):
+    """Read the metadata the orders need that isn't cached yet, one batch for all of them"""
+    if metadata is None:
+        return
+    tokens, pairs = chain_metadata.order_tokens_and_pairs(orders)
+    try:
+        added = metadata.ensure(w3.provider.endpoint_uri, tokens, pairs)
+        if added:
+            print(f"🗂️ Cached {added} new token/pair entries in {metadata.path}")
+    except Exception as e:
+        print(f"   ⚠ Could not read token metadata: {str(e)[:100]}")
+
+
+def start_order(w3, lanes, order, metadata=None):
+    """
+    Print the order summary, assign the order to an execution lane that can
+    fund it and set up monitoring state
+    Returns the watch dict used by check_order, or None if the order can't run
+    """
+    (sell_token_contract, amount_in_token_units, swap_path,
+     target_tokens_human, min_acceptable) = order_parameters(w3, order)
+    if not check_order_metadata(metadata, order, swap_path):
+        return None
+    
+    # Lane balances are read once per token, not once per order
+    if any(order.sell_token not in lane.balances for lane in lanes.lanes):
+        lanes.refresh_balances(w3, [order.sell_token])
+    lane = lanes.assign(order.id, order.sell_token, amount_in_token_units)
+    address = (lane or lanes.lanes[0]).address
     
+    total_runtime_seconds = max_runtime_seconds(order)
     has_max_runtime = total_runtime_seconds > 0
     start_time = time.time()
     expiration_time = start_time + total_runtime_seconds if has_max_runtime else None
     
     print("=" * 60)
-    print("🎯 LIMIT ORDER MONITOR - TITAN BUILDER")
+    print(f"🎯 LIMIT ORDER MONITOR - TITAN BUILDER ({order.id})")
     print("=" * 60)
-    print(f"Account: {account.address}")
-    print(f"Selling: {SELL_AMOUNT} USDT")
-    print(f"Buying: {BUY_TOKEN}")
-    print(f"Target: At least {TARGET_PRICE} {BUY_TOKEN}")
-    print(f"Checking every: {CHECK_INTERVAL} seconds")
+    print(f"Account: {address}")
+    print(f"Selling: {order.sell_amount} USDT")
+    print(f"Buying: {order.buy_token}")
+    print(f"Target: At least {order.target_price} {order.buy_token}")
+    if ADAPTIVE_POLLING:
+        print(f"Checking every: {order.check_interval}-{order_scheduler.MAX_POLL_INTERVAL} seconds (adaptive)")
+    else:
+        print(f"Checking every: {order.check_interval} seconds")
     if has_max_runtime:
         runtime_str = []
-        if MAX_RUNTIME_YEARS > 0:
-            runtime_str.append(f"{MAX_RUNTIME_YEARS} year(s)")
-        if MAX_RUNTIME_MONTHS > 0:
-            runtime_str.append(f"{MAX_RUNTIME_MONTHS} month(s)")
-        if MAX_RUNTIME_DAYS > 0:
-            runtime_str.append(f"{MAX_RUNTIME_DAYS} day(s)")
+        if order.max_runtime_years > 0:
+            runtime_str.append(f"{order.max_runtime_years} year(s)")
+        if order.max_runtime_months > 0:
+            runtime_str.append(f"{order.max_runtime_months} month(s)")
+        if order.max_runtime_days > 0:
+            runtime_str.append(f"{order.max_runtime_days} day(s)")
         print(f"Max runtime: {', '.join(runtime_str)}")
         expiration_timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(expiration_time))
         print(f"Will expire at: {expiration_timestamp}")
@@ -454,113 +637,405 @@ async def monitor_and_execute():
         print(f"Max runtime: Unlimited (will run until target is met)")
     print("=" * 60)
     
-    # Create contract instances
-    sell_token_contract = w3.eth.contract(address=SELL_TOKEN, abi=ERC20_ABI)
-    router_contract = w3.eth.contract(address=UNISWAP_ROUTER, abi=UNISWAP_ABI)
-    
-    # Convert sell amount to token units
-    amount_in_token_units = int(SELL_AMOUNT * (10 ** SELL_TOKEN_DECIMALS))
-    
-    # Build swap path - USDT → WETH → {BUY_TOKEN} (standard Uniswap V2 routing)
-    swap_path = [SELL_TOKEN, WETH_ADDRESS, BUY_TOKEN]
-    
-    # Calculate minimum acceptable tokens in raw units (with slippage)
-    target_tokens_human = TARGET_PRICE * (1 - MAX_SLIPPAGE_PERCENT / 100)
-    min_acceptable = int(target_tokens_human * (10 ** BUY_TOKEN_DECIMALS))
+    if lane is None:
+        best_available = max(lane.available(order.sell_token) for lane in lanes.lanes)
+        print(f"\n❌ ERROR: Insufficient USDT balance!")
+        print(f"   Need: {order.sell_amount}, Best lane has uncommitted: {best_available / (10 ** order.sell_token_decimals)}")
+        if len(lanes) > 1:
+            print(f"   💡 TIP: Rebalance the lanes with: python wallet_lanes.py rebalance")
+        return None
     
     # Check initial balances
-    token_balance = sell_token_contract.functions.balanceOf(account.address).call()
-    token_balance_human = token_balance / (10 ** SELL_TOKEN_DECIMALS)
-    eth_balance = w3.eth.get_balance(account.address)
+    token_balance = lane.balances[order.sell_token]
+    token_balance_human = token_balance / (10 ** order.sell_token_decimals)
+    eth_balance = lane.eth_balance
     eth_balance_human = w3.from_wei(eth_balance, 'ether')
     
-    print(f"\n💰 Initial Balances:")
+    print(f"\n💰 Initial Balances (lane {lane.index}):")
     print(f"   USDT: {token_balance_human}")
     print(f"   ETH: {eth_balance_human}")
     
-    if token_balance < amount_in_token_units:
-        print(f"\n❌ ERROR: Insufficient USDT balance!")
-        print(f"   Need: {SELL_AMOUNT}, Have: {token_balance_human}")
-        return
-    
-    max_gas_cost_wei = (APPROVE_GAS_LIMIT + SWAP_GAS_LIMIT) * w3.to_wei(GAS_PRICE_GWEI, 'gwei')
+    max_gas_cost_wei = (order.approve_gas_limit + order.swap_gas_limit) * w3.to_wei(order.gas_price_gwei, 'gwei')
     if eth_balance < max_gas_cost_wei:
         max_gas_eth = w3.from_wei(max_gas_cost_wei, 'ether')
         print(f"\n⚠ WARNING: May not have enough ETH for gas!")
         print(f"   Need: ~{max_gas_eth} ETH, Have: {eth_balance_human} ETH")
     
     print(f"\n🔍 Starting price monitoring...")
-    print(f"   Will execute when price >= {TARGET_PRICE} {BUY_TOKEN}")
-    print(f"   Minimum acceptable: {target_tokens_human} {BUY_TOKEN} (with {MAX_SLIPPAGE_PERCENT}% slippage)")
+    print(f"   Will execute when price >= {order.target_price} {order.buy_token}")
+    print(f"   Minimum acceptable: {target_tokens_human} {order.buy_token} (with {order.max_slippage_percent}% slippage)")
     print(f"   (In raw blockchain units: {min_acceptable})")
     print(f"\n   Press Ctrl+C to stop monitoring\n")
     
-    check_count = 0
+    return {
+        "order": order,
+        "lane": lane,
+        "sell_token_contract": sell_token_contract,
+        "amount_in_token_units": amount_in_token_units,
+        "swap_path": swap_path,
+        "target_tokens_human": target_tokens_human,
+        "min_acceptable": min_acceptable,
+        "start_time": start_time,
+        "expiration_time": expiration_time,
+        "check_count": 0
+    }
+
+
+def reload_order(w3, lanes, watch, order, metadata=None):
+    """
+    Apply an edited order from the order file to its watch state
+    Returns False if no lane can fund the edited order or its decimals are wrong
+    """
+    if not check_order_metadata(metadata, order, order_parameters(w3, order)[2]):
+        return False
+    (watch["sell_token_contract"], watch["amount_in_token_units"], watch["swap_path"],
+     watch["target_tokens_human"], watch["min_acceptable"]) = order_parameters(w3, order)
+    watch["order"] = order
+    watch["fast_quote"] = None
     
-    try:
-        while True:
-            # Check if max runtime exceeded
-            if has_max_runtime:
-                current_time = time.time()
-                if current_time >= expiration_time:
-                    elapsed = current_time - start_time
-                    elapsed_hours = elapsed / 3600
-                    print(f"\n⏱️ Max runtime exceeded!")
-                    print(f"   Ran for: {elapsed_hours:.2f} hours")
-                    print(f"   Total checks: {check_count}")
-                    print(f"   Target price was never reached")
-                    print(f"\n⏹️ Stopping monitor - expired")
-                    break
+    # Amount or token may have changed - re-commit the funds
+    lanes.release(order.id)
+    if any(order.sell_token not in lane.balances for lane in lanes.lanes):
+        lanes.refresh_balances(w3, [order.sell_token])
+    watch["lane"] = lanes.assign(order.id, order.sell_token, watch["amount_in_token_units"])
+    if watch["lane"] is None:
+        print(f"\n❌ Order {order.id} reloaded but no lane has enough USDT for it - stopping its monitor")
+        return False
+    
+    print(f"\n🔄 Order {order.id} reloaded: target {order.target_price}, selling {order.sell_amount}")
+    return True
+
+
+async def execute_and_track(w3, lanes, router_contract, watch, backrun_tx=None, block_number=None):
+    """
+    Execute an order from its lane and follow its bundle until it's resolved
+    Returns True when the trade executed
+    """
+    order = watch["order"]
+    
+    # Orders on other lanes execute in parallel, orders sharing this
+    # lane wait until its bundle is resolved
+    lane = watch["lane"]
+    async with lane.lock:
+        bundle_hash = await execute_order(
+            w3, lane, order, watch["sell_token_contract"], router_contract,
+            watch["amount_in_token_units"], watch["min_acceptable"], watch["swap_path"],
+            backrun_tx, block_number
+        )
+        
+        if bundle_hash:
+            # Track the bundle status
+            was_executed = await track_bundle_status(bundle_hash, order)
+            # Re-read the lane nonce before its next bundle
+            lane.reset_nonce()
+    
+    if not bundle_hash:
+        print(f"\n⚠️ Bundle submission failed, will keep monitoring...")
+        return False
+    
+    order_state.update_status(
+        state_name(order.id), bundle_hash,
+        order_state.STATUS_EXECUTED if was_executed else order_state.STATUS_FAILED
+    )
+    if was_executed:
+        lanes.release(order.id, spent=True)
+        print(f"\n✅ Trade completed! Monitor stopping.")
+        return True
+    print(f"\n⚠️ Bundle was not executed. Returning to price monitoring...")
+    print(f"   Will continue checking for better opportunities...")
+    return False
+
+
+async def check_order(w3, lanes, router_contract, watch, scheduler, quotes=None, fast_quoter=None):
+    """
+    Run one price check for an order and execute it if the target is met
+    Returns the delay in seconds until the next check, or None when the order is finished
+    """
+    order = watch["order"]
+    
+    # Check if max runtime exceeded
+    if watch["expiration_time"] is not None:
+        current_time = time.time()
+        if current_time >= watch["expiration_time"]:
+            elapsed = current_time - watch["start_time"]
+            elapsed_hours = elapsed / 3600
+            print(f"\n⏱️ Max runtime exceeded! ({order.id})")
+            print(f"   Ran for: {elapsed_hours:.2f} hours")
+            print(f"   Total checks: {watch['check_count']}")
+            print(f"   Target price was never reached")
+            print(f"\n⏹️ Stopping monitor - expired")
+            return None
+    
+    watch["check_count"] += 1
+    check_count = watch["check_count"]
+    min_acceptable = watch["min_acceptable"]
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Calldata never changes for an order - encode the request once
+    if fast_quoter is not None and watch.get("fast_quote") is None:
+        watch["fast_quote"] = fast_quoter.prepare(watch["amount_in_token_units"], watch["swap_path"])
+    
+    # Get current price
+    current_output = await fetch_current_price(w3, router_contract, watch, quotes)
+    watch["last_output"] = current_output
+    
+    if current_output is None:
+        print(f"[{timestamp}] ⚠ {order.id} check #{check_count}: Could not fetch price, retrying...")
+    else:
+        # Convert raw blockchain value to human-readable
+        current_price_human = current_output / (10 ** order.buy_token_decimals)
+        print(f"[{timestamp}] {order.id} check #{check_count}: Current price = {current_price_human:.4f} {order.buy_token} for {order.sell_amount} USDT")
+        
+        # Check if price meets our target (comparing raw values)
+        if current_output >= min_acceptable:
+            print(f"\n🎯 TARGET PRICE MET!")
+            print(f"   Current: {current_price_human:.4f} {order.buy_token}")
+            print(f"   Target: {order.target_price} {order.buy_token}")
+            print(f"   Executing order NOW...")
             
-            check_count += 1
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            if await execute_and_track(w3, lanes, router_contract, watch):
+                return None
+        else:
+            percentage = (current_price_human / order.target_price) * 100
+            print(f"   → Price is {percentage:.1f}% of target, waiting...")
+    
+    # Decide when to check again
+    if not ADAPTIVE_POLLING:
+        return order.check_interval
+    return scheduler.record(order.id, current_output, min_acceptable, order.check_interval)
+
+
+async def backrun_order(w3, lanes, router_contract, watch, trigger):
+    """
+    Act on a mempool watcher prediction that a pending swap pushes the order
+    over its target (see mempool_watcher.py)
+    Returns the delay in seconds until the next check, or None when the order is finished
+    """
+    order = watch["order"]
+    predicted_human = trigger["predicted"] / (10 ** order.buy_token_decimals)
+    print(f"\n🔮 {order.id}: pending swap {trigger['tx'].get('hash')} moves the price to "
+          f"{predicted_human:.4f} {order.buy_token} (target {order.target_price})")
+    if MEMPOOL_BACKRUN != "submit":
+        return order.check_interval
+    
+    await rpc_scheduler.acquire(w3.provider.endpoint_uri, rpc_scheduler.PRIORITY_SUBMIT)
+    pending_tx = await asyncio.to_thread(mempool_watcher.raw_transaction, w3.provider.endpoint_uri, trigger["tx"])
+    if not pending_tx:
+        print(f"   ⚠ Pending transaction not available from the node, back to price checks")
+        return order.check_interval
+    
+    print(f"   Back-running it in block {trigger['block'] + 1}...")
+    if await execute_and_track(w3, lanes, router_contract, watch, pending_tx, trigger["block"] + 1):
+        return None
+    return order.check_interval
+
+
+def apply_order_file_changes(w3, lanes, watches, scheduler, metadata=None):
+    """
+    Pick up edits to the order file without restarting
+    Returns False if every order this process runs was removed
+    """
+    if ORDER_BOOK is None:
+        return True
+    added, changed, removed = ORDER_BOOK.reload()
+    if added or changed:
+        cache_order_metadata(w3, metadata, [ORDER_BOOK.orders[order_id] for order_id in added | changed])
+    
+    for order_id in removed & watches.keys():
+        print(f"\n⏹️ Order {order_id} was removed from the order file - stopping its monitor")
+        del watches[order_id]
+        scheduler.remove(order_id)
+        lanes.release(order_id)
+    for order_id in changed & watches.keys():
+        if reload_order(w3, lanes, watches[order_id], ORDER_BOOK.orders[order_id], metadata):
+            scheduler.schedule(order_id)
+        else:
+            del watches[order_id]
+            scheduler.remove(order_id)
+    # New orders only join a process that runs the whole file
+    if ORDER_ID is None:
+        for order_id in added:
+            watch = start_order(w3, lanes, ORDER_BOOK.orders[order_id], metadata)
+            if watch:
+                watches[order_id] = watch
+                scheduler.schedule(order_id)
+    return bool(watches)
+
+
+async def monitor_and_execute(orders=None):
+    """
+    Main monitoring loop - checks prices and executes orders when conditions are met
+    
+    Orders are checked in order of their next due time (see order_scheduler.py);
+    an order that triggers executes in its own task so the other orders keep
+    being checked while its bundle is tracked.
+    """
+    orders = ORDERS if orders is None else orders
+    errors = order_loader.endpoint_errors(orders.values())
+    if errors:
+        raise order_loader.OrderValidationError(errors)
+    
+    # Installed first so slow startup calls show up as stalls too
+    monitor = None
+    if DIAGNOSTICS:
+        monitor = diagnostics.Diagnostics(order_state.STATE_DIR, DIAGNOSTICS_PORT)
+        monitor.install()
+    
+    # Initialize Web3
+    w3 = Web3(Web3.HTTPProvider(next(iter(orders.values())).rpc_url))
+    
+    # Token and pair metadata from the on-disk cache (see chain_metadata.py),
+    # whatever is missing read in one batch for all orders
+    metadata = None
+    if METADATA_CACHE:
+        try:
+            metadata = chain_metadata.ChainMetadata.open(w3.provider.endpoint_uri)
+        except Exception as e:
+            print(f"   ⚠ Metadata cache unavailable, decimals not checked: {str(e)[:100]}")
+        cache_order_metadata(w3, metadata, orders.values())
+    
+    # One execution lane per wallet, balances read once per lane and token,
+    # orders of other instances sharing STATE_DIR counted when assigning
+    lanes = wallet_lanes.LanePool(WALLET_KEYS, order_state.STATE_DIR)
+    lanes.on_change = record_commitment
+    lanes.refresh_balances(w3, {order.sell_token for order in orders.values()})
+    print(f"💼 {len(lanes)} execution lane(s): {', '.join(lane.address for lane in lanes.lanes)}")
+    
+    # Hand the keys to the signing workers - this process keeps only addresses
+    signer = None
+    if SIGNING_WORKERS:
+        signer = signing_service.SigningService(WALLET_KEYS, SIGNING_WORKERS)
+        for lane in lanes.lanes:
+            lane.attach_signer(signer)
+        globals()['WALLET_KEYS'] = globals()['PRIVATE_KEY'] = None
+        print(f"🖊️ Signing in {len(signer)} worker process(es)")
+    
+    # Create contract instances
+    router_contract = w3.eth.contract(address=UNISWAP_ROUTER, abi=UNISWAP_ABI)
+    
+    # Shared quote server (see quote_server.py) - falls back to the router when unavailable
+    quotes = None
+    if QUOTE_SOCKET:
+        quotes = quote_server.QuoteClient(QUOTE_SOCKET)
+        await quotes.start()
+        print(f"📡 Using shared quote server at {QUOTE_SOCKET}")
+    
+    # Prebuilt raw eth_call requests over a persistent connection (see fast_rpc.py)
+    fast_quoter = fast_rpc.FastQuoter(w3.provider.endpoint_uri) if FAST_RPC else None
+    
+    scheduler = order_scheduler.PollScheduler()
+    watches = {}
+    for order in orders.values():
+        watch = start_order(w3, lanes, order, metadata)
+        if watch:
+            watches[order.id] = watch
+            scheduler.schedule(order.id)
+    
+    # One batched allowance check for every lane and sell token, approvals
+    # mined before monitoring starts
+    if PREAPPROVE and watches:
+        approvals.preapprove(w3, lanes, orders, PREAPPROVE)
+    
+    # Pending swaps that push an order over its target (see mempool_watcher.py),
+    # predictions are queued here and wake the loop up
+    watcher = None
+    triggers = []
+    wakeup = asyncio.Event()
+    if MEMPOOL_WS_URL:
+        def on_trigger(trigger):
+            triggers.append(trigger)
+            wakeup.set()
+        watcher = mempool_watcher.MempoolWatcher(watches, on_trigger)
+        watcher_task = asyncio.create_task(watcher.run(MEMPOOL_WS_URL, w3.provider.endpoint_uri))
+        print(f"👀 Mempool watcher on (MEMPOOL_BACKRUN={MEMPOOL_BACKRUN})")
+    
+    running = {}  # task -> order id
+    
+    # docker stop sends SIGTERM - stop like on Ctrl+C so the cleanup below runs
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+    
+    try:
+        while watches:
+            if not apply_order_file_changes(w3, lanes, watches, scheduler, metadata):
+                break
             
-            # Get current price
-            current_output = get_current_price(w3, router_contract, amount_in_token_units, swap_path)
+            # Predictions first - a back-run only works within the current block
+            wakeup.clear()
+            while triggers:
+                trigger = triggers.pop(0)
+                order_id = trigger["order_id"]
+                if order_id in watches and order_id not in running.values():
+                    task = asyncio.create_task(
+                        backrun_order(w3, lanes, router_contract, watches[order_id], trigger)
+                    )
+                    running[task] = order_id
             
-            if current_output is None:
-                print(f"[{timestamp}] ⚠ Check #{check_count}: Could not fetch price, retrying...")
-            else:
-                # Convert raw blockchain value to human-readable
-                current_price_human = current_output / (10 ** BUY_TOKEN_DECIMALS)
-                print(f"[{timestamp}] Check #{check_count}: Current price = {current_price_human:.4f} {BUY_TOKEN} for {SELL_AMOUNT} USDT")
-                
-                # Check if price meets our target (comparing raw values)
-                if current_output >= min_acceptable:
-                    print(f"\n🎯 TARGET PRICE MET!")
-                    print(f"   Current: {current_price_human:.4f} {BUY_TOKEN}")
-                    print(f"   Target: {TARGET_PRICE} {BUY_TOKEN}")
-                    print(f"   Executing order NOW...")
-                    
-                    bundle_hash = await execute_order(
-                        w3, account, sell_token_contract, router_contract,
-                        amount_in_token_units, min_acceptable, swap_path
+            for order_id in scheduler.pop_due():
+                if order_id in watches and order_id not in running.values():
+                    task = asyncio.create_task(
+                        check_order(w3, lanes, router_contract, watches[order_id], scheduler, quotes, fast_quoter)
                     )
-                    
-                    if bundle_hash:
-                        # Track the bundle status
-                        was_executed = await track_bundle_status(bundle_hash)
-                        
-                        if was_executed:
-                            print(f"\n✅ Trade completed! Monitor stopping.")
-                            break
-                        else:
-                            print(f"\n⚠️ Bundle was not executed. Returning to price monitoring...")
-                            print(f"   Will continue checking for better opportunities...")
-                    else:
-                        print(f"\n⚠️ Bundle submission failed, will keep monitoring...")
-                else:
-                    percentage = (current_price_human / TARGET_PRICE) * 100
-                    print(f"   → Price is {percentage:.1f}% of target, waiting...")
+                    running[task] = order_id
             
-            # Wait before next check
-            await asyncio.sleep(CHECK_INTERVAL)
+            # Wait until the next order is due, a running check finishes or
+            # the mempool watcher predicts a trigger
+            timeout = scheduler.time_until_next()
+            waiters = set(running)
+            if watcher is not None:
+                wake = asyncio.create_task(wakeup.wait())
+                waiters.add(wake)
+            if waiters:
+                done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if watcher is not None:
+                    wake.cancel()
+                for task in done:
+                    if task not in running:
+                        continue
+                    order_id = running.pop(task)
+                    if order_id not in watches:
+                        continue
+                    try:
+                        delay = task.result()
+                    except Exception as e:
+                        print(f"   ⚠ {order_id}: check failed: {str(e)[:100]}")
+                        delay = watches[order_id]["order"].check_interval
+                    if delay is None:
+                        del watches[order_id]
+                        scheduler.remove(order_id)
+                        lanes.release(order_id)
+                    else:
+                        scheduler.schedule(order_id, delay)
+            elif timeout is not None:
+                await asyncio.sleep(timeout)
             
-    except KeyboardInterrupt:
-        print(f"\n\n⏹ Monitoring stopped by user")
-        print(f"Total checks performed: {check_count}")
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # Under asyncio.run Ctrl+C (and SIGTERM, see above) arrive as a cancellation
+        print(f"\n\n⏹ Monitoring stopped")
+        print(f"Total checks performed: {sum(watch['check_count'] for watch in watches.values())}")
+        raise
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        for task in running:
+            task.cancel()
+        # Funds of orders this process no longer runs are free for other instances and rebalance
+        for order_id in list(lanes.assignments):
+            lanes.release(order_id)
+        if watcher is not None:
+            watcher_task.cancel()
+        if signer is not None:
+            signer.close()
+        if RPC_RATE_LIMIT:
+            print(rpc_scheduler.SCHEDULER.report())
+        if quotes is not None:
+            await quotes.stop()
+        if monitor is not None:
+            monitor.uninstall()
 
 
 if __name__ == "__main__":
-    asyncio.run(monitor_and_execute())
-
+    try:
+        asyncio.run(monitor_and_execute())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
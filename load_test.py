@@ -0,0 +1,645 @@
+"""
+Offline load test
+
+Runs the real monitor_and_execute loop end-to-end against local mocks - no
+network access, no AWS:
+  - mock Ethereum node: scripted WETH/token reserves per block (seeded random
+    walks or a trajectory file) behind getAmountsOut, getReserves, balanceOf,
+    allowance and the few other calls the bot makes
+  - mock Titan builder: eth_sendBundle, eth_cancelBundle and
+    titan_getBundleStats (every bundle reports "Submitted")
+  - mock secrets: throwaway wallet keys instead of Secrets Manager
+
+Because the price path is scripted, the first block at which every order's
+target is met is known in advance. The report compares it with the time the
+bot submitted the bundle (trigger latency), counts triggers the bot never
+acted on, and shows the CPU time and memory the bot used.
+
+Run:
+  python load_test.py --orders 1000 [--duration 120] [--block-time 2] [--wallets 4]
+  python load_test.py --orders 50 --trajectory paths.json
+  python load_test.py --sweep 100 250 500 1000 [--duration 60] [--wallets 4]
+
+Trajectory file: {"paths": [[1.0, 1.002, 0.998, ...], ...]} - price multiplier
+per block, assigned to the buy tokens round robin.
+
+--sweep runs the test once per order count (each in a fresh process) and
+reports the first count at which the bot falls behind: p50 trigger latency
+above one block or more than --max-missed of the triggered orders missed.
+A single run exits non-zero when its missed share is above --max-missed.
+ADAPTIVE_POLLING / FAST_RPC / PREAPPROVE are read from the environment as usual.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from web3 import Web3
+
+from contracts import WETH_ADDRESS
+from quote_server import sort_tokens, pair_address, get_amount_out
+
+# ========================================
+# Constants
+# ========================================
+
+USDT_ADDRESS = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+FIRST_BLOCK = 20_000_000
+
+# Scripted pools: USDT/WETH stays fixed, every WETH/token pool follows its path
+USDT_WETH_RESERVES = (100_000_000 * 10**6, 40_000 * 10**18)    # 2500 USDT per WETH
+WETH_RESERVE = 1_000 * 10**18
+TOKEN_RESERVE = 10_000_000 * 10**18                              # 10000 tokens per WETH
+
+MOCK_BALANCE = 10**30
+MOCK_ETH_BALANCE = 100 * 10**18
+
+# Function selectors answered by the mock node
+SELECTOR_GET_AMOUNTS_OUT = "d06ca61f"
+SELECTOR_GET_RESERVES = "0902f1ac"
+SELECTOR_BALANCE_OF = "70a08231"
+SELECTOR_ALLOWANCE = "dd62ed3e"
+SELECTOR_SWAP = "38ed1739"
+SELECTOR_APPROVE = "095ea7b3"
+SELECTOR_DECIMALS = "313ce567"
+SELECTOR_SYMBOL = "95d89b41"
+SELECTOR_GET_PAIR = "e6a43905"
+
+
+def mock_token(index):
+    """Deterministic checksummed address of scripted buy token #index"""
+    return Web3.to_checksum_address(Web3.keccak(text=f"load-test-token-{index}")[12:])
+
+
+def mock_wallet_keys(count):
+    """Deterministic throwaway private keys (never funded anywhere)"""
+    return [Web3.to_hex(Web3.keccak(text=f"load-test-wallet-{index}")) for index in range(count)]
+
+
+def random_paths(tokens, blocks, sigma, drift, seed):
+    """One geometric random walk of price multipliers per token"""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(tokens):
+        multiplier = 1.0
+        path = [multiplier]
+        for _ in range(blocks - 1):
+            multiplier *= math.exp(rng.gauss(drift, sigma))
+            path.append(multiplier)
+        paths.append(path)
+    return paths
+
+
+def _word(value):
+    return format(value, "064x")
+
+
+def _encode_uint_array(values):
+    return "0x" + _word(0x20) + _word(len(values)) + "".join(_word(value) for value in values)
+
+
+# ========================================
+# Mock chain
+# ========================================
+
+class MockChain:
+    """
+    Scripted Uniswap V2 state: the reserves of every pool at every block
+
+    The chain stands still at its first block until start_time is set, then
+    advances one block every block_time seconds (the last block of a path
+    repeats once the script runs out).
+    """
+
+    def __init__(self, paths, block_time):
+        self.paths = paths
+        self.block_time = block_time
+        self.start_time = 0.0
+        self.buy_tokens = [mock_token(index) for index in range(len(paths))]
+        self.pools = {pair_address(USDT_ADDRESS, WETH_ADDRESS): None}
+        for index, token in enumerate(self.buy_tokens):
+            self.pools[pair_address(WETH_ADDRESS, token)] = index
+
+    def block_index(self, now=None):
+        if not self.start_time:
+            return 0
+        now = time.time() if now is None else now
+        return max(0, int((now - self.start_time) // self.block_time))
+
+    def block_started_at(self, index):
+        return self.start_time + index * self.block_time
+
+    def reserves(self, pair, index):
+        """(reserve0, reserve1) of a pool at a block, None for unknown pools"""
+        if pair not in self.pools:
+            return None
+        path_index = self.pools[pair]
+        if path_index is None:
+            usdt_reserve, weth_reserve = USDT_WETH_RESERVES
+            token0, _ = sort_tokens(USDT_ADDRESS, WETH_ADDRESS)
+            return (usdt_reserve, weth_reserve) if token0 == USDT_ADDRESS else (weth_reserve, usdt_reserve)
+
+        path = self.paths[path_index]
+        multiplier = path[min(index, len(path) - 1)]
+        weth_reserve = int(WETH_RESERVE / multiplier)
+        token_reserve = int(TOKEN_RESERVE * multiplier)
+        token0, _ = sort_tokens(WETH_ADDRESS, self.buy_tokens[path_index])
+        return (weth_reserve, token_reserve) if token0 == WETH_ADDRESS else (token_reserve, weth_reserve)
+
+    def amounts_out(self, amount_in, path, index):
+        """router.getAmountsOut at a block, None if a hop has no pool"""
+        amounts = [amount_in]
+        for token_in, token_out in zip(path, path[1:]):
+            reserves = self.reserves(pair_address(token_in, token_out), index)
+            if reserves is None:
+                return None
+            token0, _ = sort_tokens(token_in, token_out)
+            reserve_in, reserve_out = reserves if token_in == token0 else reserves[::-1]
+            amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out))
+        return amounts
+
+    def first_block_at_or_above(self, amount_in, path, min_out):
+        """Index of the first block whose quote reaches min_out, None if it never does"""
+        blocks = max(len(p) for p in self.paths)
+        for index in range(blocks):
+            if self.amounts_out(amount_in, path, index)[-1] >= min_out:
+                return index
+        return None
+
+
+# ========================================
+# Mock node + builder
+# ========================================
+
+class MockNode:
+    """JSON-RPC handler for the node and the Titan builder / stats endpoints"""
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self.allowances = {}        # (owner, token) -> amount approved via eth_sendRawTransaction
+        self.receipts = {}          # tx hash -> receipt
+
+    def _count(self, name):
+        with self.lock:
+            self.calls[name] += 1
+
+    def _eth_call(self, call):
+        data = (call.get("data") or call.get("input") or "0x")[2:]
+        selector, args = data[:8], data[8:]
+        index = self.chain.block_index()
+
+        if selector == SELECTOR_GET_AMOUNTS_OUT:
+            self._count("getAmountsOut")
+            amount_in = int(args[0:64], 16)
+            length = int(args[128:192], 16)
+            path = [Web3.to_checksum_address("0x" + args[192 + 64 * i + 24:192 + 64 * (i + 1)])
+                    for i in range(length)]
+            amounts = self.chain.amounts_out(amount_in, path, index)
+            if amounts is None:
+                raise ValueError("execution reverted: UniswapV2Library: INVALID_PATH")
+            return _encode_uint_array(amounts)
+        if selector == SELECTOR_GET_RESERVES:
+            self._count("getReserves")
+            reserves = self.chain.reserves(Web3.to_checksum_address(call["to"]), index)
+            if reserves is None:
+                raise ValueError("execution reverted")
+            timestamp = int(self.chain.block_started_at(index))
+            return "0x" + _word(reserves[0]) + _word(reserves[1]) + _word(timestamp)
+        if selector == SELECTOR_BALANCE_OF:
+            self._count("balanceOf")
+            return "0x" + _word(MOCK_BALANCE)
+        if selector == SELECTOR_ALLOWANCE:
+            self._count("allowance")
+            owner = Web3.to_checksum_address("0x" + args[24:64])
+            return "0x" + _word(self.allowances.get((owner, Web3.to_checksum_address(call["to"])), 0))
+        if selector == SELECTOR_SWAP:
+            self._count("swap simulation")
+            return _encode_uint_array([0, 0, 0])
+        if selector == SELECTOR_DECIMALS:
+            self._count("decimals")
+            return "0x" + _word(6 if Web3.to_checksum_address(call["to"]) == USDT_ADDRESS else 18)
+        if selector == SELECTOR_SYMBOL:
+            self._count("symbol")
+            symbol = b"MOCK"
+            return "0x" + _word(0x20) + _word(len(symbol)) + symbol.ljust(32, b"\0").hex()
+        if selector == SELECTOR_GET_PAIR:
+            self._count("getPair")
+            pair = pair_address(Web3.to_checksum_address("0x" + args[24:64]),
+                                Web3.to_checksum_address("0x" + args[88:128]))
+            return "0x" + (pair[2:].lower() if pair in self.chain.pools else "").rjust(64, "0")
+        self._count("eth_call other")
+        return "0x"
+
+    def _send_raw_transaction(self, raw):
+        """Accept a legacy transaction, applying approve() to the mock allowances"""
+        import rlp
+        from eth_account import Account
+
+        nonce, gas_price, gas, to, value, data, *_ = rlp.decode(bytes.fromhex(raw[2:]))
+        sender = Account.recover_transaction(raw)
+        tx_hash = Web3.to_hex(Web3.keccak(hexstr=raw))
+        if data[:4].hex() == SELECTOR_APPROVE:
+            self._count("approvals")
+            with self.lock:
+                self.allowances[(sender, Web3.to_checksum_address(to))] = int.from_bytes(data[36:68], "big")
+        index = self.chain.block_index()
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "blockHash": Web3.to_hex(Web3.keccak(FIRST_BLOCK + index)),
+            "blockNumber": hex(FIRST_BLOCK + index),
+            "from": sender,
+            "to": Web3.to_checksum_address(to),
+            "contractAddress": None,
+            "cumulativeGasUsed": hex(50_000),
+            "gasUsed": hex(50_000),
+            "effectiveGasPrice": hex(int.from_bytes(gas_price, "big")),
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x0",
+        }
+        return tx_hash
+
+    def _send_bundle(self, bundle):
+        txs = bundle.get("txs") or []
+        if not txs or not all(isinstance(tx, str) and tx.startswith("0x") for tx in txs):
+            raise ValueError("invalid bundle: txs must be 0x-prefixed raw transactions")
+        for tx in txs:
+            bytes.fromhex(tx[2:])
+        self._count("bundles")
+        with self.lock:
+            self.calls["bundle txs"] += len(txs)
+        return {"bundleHash": Web3.to_hex(Web3.keccak(text="".join(txs)))}
+
+    def dispatch(self, method, params):
+        chain = self.chain
+        index = chain.block_index()
+        self._count(method)
+
+        if method == "eth_chainId":
+            return "0x1"
+        if method == "eth_blockNumber":
+            return hex(FIRST_BLOCK + index)
+        if method == "eth_getBlockByNumber":
+            return {
+                "number": hex(FIRST_BLOCK + index),
+                "hash": Web3.to_hex(Web3.keccak(FIRST_BLOCK + index)),
+                "parentHash": Web3.to_hex(Web3.keccak(FIRST_BLOCK + index - 1)),
+                "timestamp": hex(int(chain.block_started_at(index))),
+                "gasLimit": hex(30_000_000),
+                "gasUsed": "0x0",
+                "baseFeePerGas": hex(10**9),
+                "transactions": [],
+            }
+        if method == "eth_getBalance":
+            return hex(MOCK_ETH_BALANCE)
+        if method == "eth_getTransactionCount":
+            return "0x0"
+        if method == "eth_gasPrice":
+            return hex(20 * 10**9)
+        if method == "eth_estimateGas":
+            return hex(200_000)
+        if method == "eth_call":
+            return self._eth_call(params[0])
+        if method == "eth_sendRawTransaction":
+            return self._send_raw_transaction(params[0])
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "eth_sendBundle":
+            return self._send_bundle(params[0])
+        if method == "eth_cancelBundle":
+            return None
+        if method == "titan_getBundleStats":
+            return {"status": "Submitted", "builderPayment": "0"}
+        if method == "mock_start":
+            chain.start_time = params[0]
+            return True
+        if method == "mock_stats":
+            with self.lock:
+                return dict(self.calls)
+        raise KeyError(method)
+
+    def handle(self, request):
+        try:
+            result = self.dispatch(request.get("method"), request.get("params") or [])
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+        except KeyError:
+            error = {"code": -32601, "message": f"method not found: {request.get('method')}"}
+        except Exception as e:
+            error = {"code": -32000, "message": str(e)}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+
+
+def _run_mock_node(port_queue, paths, block_time):
+    """Serve the mock node and builder on one local port (child process)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    node = MockNode(MockChain(paths, block_time))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if isinstance(request, list):
+                response = [node.handle(item) for item in request]
+            else:
+                response = node.handle(request)
+            body = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            pass    # bot dropping keep-alive connections when it stops
+
+    server = Server(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def mock_rpc(rpc_url, method, params=None):
+    """Call a control method (mock_start / mock_stats) of the mock node"""
+    import requests
+    response = requests.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}, timeout=10)
+    return response.json()["result"]
+
+
+# ========================================
+# Load test
+# ========================================
+
+def write_order_file(path, chain, count, rpc_url, gap_percent, block_time, bundle_check_delay, seed):
+    """
+    One order per entry, spread round robin over the scripted buy tokens, each
+    with a target gap_percent (uniform range) above its quote at the first block
+    """
+    rng = random.Random(seed)
+    orders = []
+    for index in range(count):
+        buy_token = chain.buy_tokens[index % len(chain.buy_tokens)]
+        sell_amount = rng.randint(10, 1000)
+        quote = chain.amounts_out(sell_amount * 10**6, [USDT_ADDRESS, WETH_ADDRESS, buy_token], 0)[-1]
+        gap = rng.uniform(*gap_percent) / 100
+        orders.append({
+            "id": f"order-{index}",
+            "sell_token": USDT_ADDRESS,
+            "buy_token": buy_token,
+            "sell_amount": sell_amount,
+            "sell_token_decimals": 6,
+            "buy_token_decimals": 18,
+            "target_price": round(quote / 10**18 * (1 + gap), 6),
+        })
+
+    with open(path, "w") as f:
+        json.dump({
+            "defaults": {
+                "rpc_url": rpc_url,
+                "check_interval": block_time,
+                "bundle_check_delay": bundle_check_delay,
+                "max_bundle_checks": 3,
+            },
+            "orders": orders
+        }, f)
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_bot(bot, duration):
+    try:
+        await asyncio.wait_for(bot.monitor_and_execute(), timeout=duration)
+    except asyncio.TimeoutError:
+        pass
+
+
+def run(args):
+    blocks = int(args.duration // args.block_time) + 1
+    if args.trajectory:
+        with open(args.trajectory) as f:
+            paths = json.load(f)["paths"]
+        paths = [paths[index % len(paths)] for index in range(args.tokens)]
+    else:
+        paths = random_paths(args.tokens, blocks, args.sigma / 100, args.drift / 100, args.seed)
+    chain = MockChain(paths, args.block_time)
+
+    port_queue = multiprocessing.Queue()
+    node = multiprocessing.Process(target=_run_mock_node, args=(port_queue, paths, args.block_time), daemon=True)
+    node.start()
+    rpc_url = f"http://127.0.0.1:{port_queue.get()}"
+
+    workdir = Path(tempfile.mkdtemp(prefix="limit-order-load-test-"))
+    order_file = workdir / "orders.json"
+    write_order_file(order_file, chain, args.orders, rpc_url, args.gap_percent,
+                     args.block_time, args.bundle_check_delay, args.seed)
+
+    # The bot reads these at import time
+    os.environ.update({
+        "CONFIG_FILE": str(order_file),
+        "STATE_DIR": str(workdir / "state"),
+        "TITAN_RPC_URL": rpc_url,
+        "TITAN_STATS_URL": rpc_url,
+    })
+    os.environ.pop("ORDER_ID", None)
+    os.environ.pop("QUOTE_SOCKET", None)
+
+    # Mock secrets provider - throwaway keys in the Secrets Manager layout
+    import wallet_lanes
+    keys = mock_wallet_keys(args.wallets)
+    wallet_lanes.get_secret = lambda: {"WALLET_KEY": keys[0], "WALLET_KEYS": keys[1:]}
+
+    log_path = workdir / "bot.log"
+    print(f"🧪 Load test: {args.orders} order(s), {args.tokens} token(s), {args.wallets} wallet(s), "
+          f"{args.duration}s at {args.block_time}s blocks")
+    print(f"   Mock node: {rpc_url}")
+    print(f"   Bot log: {log_path}")
+
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log):
+        import limit_order_script as bot
+
+        rss_before = current_rss_mb()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        start_time = time.time()
+        chain.start_time = start_time
+        mock_rpc(rpc_url, "mock_start", [start_time])
+
+        asyncio.run(run_bot(bot, args.duration))
+
+        end_time = time.time()
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    calls = mock_rpc(rpc_url, "mock_stats")
+    node.terminate()
+
+    # Compare each order's first qualifying block with its first bundle
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    latencies = []
+    missed = []
+    early = []
+    pending_at_end = 0
+    for order in bot.ORDERS.values():
+        _, amount_in, swap_path, _, min_acceptable = bot.order_parameters(w3, order)
+        trigger_block = chain.first_block_at_or_above(amount_in, swap_path, min_acceptable)
+        trigger_time = chain.block_started_at(trigger_block) if trigger_block is not None else None
+
+        submissions = bot.order_state.load_state(bot.state_name(order.id), workdir / "state")["submissions"]
+        submitted_at = submissions[0]["submitted_at"] if submissions else None
+
+        if trigger_time is None or trigger_time > end_time:
+            if submitted_at is not None:
+                early.append(order.id)
+        elif submitted_at is not None:
+            if submitted_at < trigger_time:
+                early.append(order.id)
+            else:
+                latencies.append(submitted_at - trigger_time)
+        elif trigger_time > end_time - args.grace:
+            pending_at_end += 1
+        else:
+            missed.append(order.id)
+
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    wall = end_time - start_time
+    price_checks = calls.get("getAmountsOut", 0)
+    triggered = len(latencies) + len(missed) + pending_at_end
+
+    print(f"\n📊 Results ({wall:.1f}s, {chain.block_index(end_time)} blocks)")
+    print(f"   Triggers: {triggered} of {args.orders} order(s) reached their target during the run")
+    print(f"   Executed: {len(latencies)}  Missed: {len(missed)}  Within last {args.grace}s: {pending_at_end}")
+    if early:
+        print(f"   ⚠ Submitted before the target was met: {len(early)} ({', '.join(early[:5])})")
+    if missed:
+        print(f"   Missed orders: {', '.join(missed[:10])}{' ...' if len(missed) > 10 else ''}")
+    if latencies:
+        print(f"\n⏱️ Trigger latency (first qualifying block → bundle sent)")
+        print(f"   p50 {statistics.median(latencies):.2f}s  p90 {percentile(latencies, 0.9):.2f}s  "
+              f"p99 {percentile(latencies, 0.99):.2f}s  max {max(latencies):.2f}s  "
+              f"({statistics.mean(latencies) / args.block_time:.2f} blocks avg)")
+    print(f"\n🖥️ Resources (bot process)")
+    print(f"   CPU: {cpu:.2f}s ({cpu / wall * 100:.0f}% of one core)"
+          + (f", {cpu / price_checks * 1000:.2f} ms per price check" if price_checks else ""))
+    bundles = calls.get("bundles", 0)
+    print(f"   Price checks: {price_checks} ({price_checks / wall:.0f}/s), "
+          f"bundles: {bundles} ({calls.get('bundle txs', 0) / max(bundles, 1):.1f} txs each), "
+          f"approvals sent: {calls.get('approvals', 0)}, "
+          f"RPC requests: {sum(v for k, v in calls.items() if k.startswith(('eth_', 'titan_')))}")
+    rss_peak = usage_after.ru_maxrss / 1024 if sys.platform != "darwin" else usage_after.ru_maxrss / 2**20
+    print(f"   RSS: {rss_before:.0f} MB at start, {rss_peak:.0f} MB peak" if rss_before is not None
+          else f"   RSS: {rss_peak:.0f} MB peak")
+    if bot.RPC_RATE_LIMIT:
+        print()
+        print(bot.rpc_scheduler.SCHEDULER.report())
+
+    if triggered and len(missed) / triggered > args.max_missed:
+        print(f"\n⚠️ Missed {len(missed)} of {triggered} triggered order(s) "
+              f"({len(missed) / triggered:.0%}, limit {args.max_missed:.0%})")
+
+    return {"latencies": latencies, "missed": missed, "early": early, "triggered": triggered,
+            "cpu": cpu, "rss_peak_mb": rss_peak}
+
+
+def _run_child(args, results):
+    """One sweep step - the bot reads its config at import, so every step needs its own process"""
+    results.put(run(args))
+
+
+def sweep(args):
+    """Run once per order count and report where latency passes one block"""
+    rows = []
+    degraded_at = None
+    for orders in args.sweep:
+        step = argparse.Namespace(**vars(args))
+        step.orders = orders
+        step.tokens = args.tokens or min(orders, 20)
+        results = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_run_child, args=(step, results))
+        child.start()
+        result = results.get()
+        child.join()
+        print()
+
+        latencies = result["latencies"]
+        p50 = statistics.median(latencies) if latencies else None
+        missed_share = len(result["missed"]) / result["triggered"] if result["triggered"] else 0
+        rows.append((orders, result["triggered"], len(result["missed"]), missed_share, p50, result["cpu"]))
+        if degraded_at is None and ((p50 is not None and p50 > args.block_time) or missed_share > args.max_missed):
+            degraded_at = orders
+
+    print(f"\n📈 Sweep ({args.wallets} wallet(s), {args.duration}s at {args.block_time}s blocks)")
+    print(f"   {'orders':>7} {'triggered':>9} {'missed':>7} {'p50':>8} {'CPU':>8}")
+    for orders, triggered, missed, missed_share, p50, cpu in rows:
+        p50_text = f"{p50:.2f}s" if p50 is not None else "-"
+        print(f"   {orders:>7} {triggered:>9} {missed:>3} ({missed_share:>3.0%}) {p50_text:>8} {cpu:>7.1f}s")
+    if degraded_at is None:
+        print(f"   ✅ Keeps up at every order count (p50 ≤ {args.block_time}s, missed ≤ {args.max_missed:.0%})")
+    else:
+        print(f"   ⚠️ Falls behind at {degraded_at} order(s) "
+              f"(p50 above one block or more than {args.max_missed:.0%} missed)")
+    return degraded_at
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test of monitor_and_execute against a mock chain and builder")
+    parser.add_argument("--orders", type=int, default=100, help="Number of orders (default: 100)")
+    parser.add_argument("--tokens", type=int, default=None, help="Distinct buy tokens (default: min(orders, 20))")
+    parser.add_argument("--wallets", type=int, default=1, help="Wallet keys in the mock secret (default: 1)")
+    parser.add_argument("--duration", type=float, default=120, help="Seconds to run the bot (default: 120)")
+    parser.add_argument("--block-time", type=float, default=2, help="Seconds per mock block (default: 2)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Random walk volatility, %% per block (default: 0.5)")
+    parser.add_argument("--drift", type=float, default=0.05, help="Random walk drift, %% per block (default: 0.05)")
+    parser.add_argument("--gap-percent", type=float, nargs=2, default=(0.5, 5), metavar=("MIN", "MAX"),
+                        help="Target distance above the starting price, %% (default: 0.5 5)")
+    parser.add_argument("--trajectory", help="JSON file with scripted price paths instead of random walks")
+    parser.add_argument("--bundle-check-delay", type=float, default=0.2, help="BUNDLE_CHECK_DELAY of the orders (default: 0.2)")
+    parser.add_argument("--grace", type=float, default=None,
+                        help="Triggers this close to the end are not counted as missed (default: 2 blocks)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sweep", type=int, nargs="+", metavar="ORDERS",
+                        help="Run once per order count and report where the bot falls behind")
+    parser.add_argument("--max-missed", type=float, default=0.05,
+                        help="Share of triggered orders that may be missed (default: 0.05)")
+    args = parser.parse_args()
+
+    if min(args.sweep or [args.orders]) < 1:
+        parser.error("order counts must be at least 1")
+    args.grace = 2 * args.block_time if args.grace is None else args.grace
+    if args.sweep:
+        sys.exit(1 if sweep(args) is not None else 0)
+    args.tokens = args.tokens or min(args.orders, 20)
+    result = run(args)
+    if result["triggered"] and len(result["missed"]) / result["triggered"] > args.max_missed:
+        sys.exit(1)
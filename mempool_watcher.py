@@ -0,0 +1,432 @@
+"""
+Mempool watcher - back-run pending swaps that push an order over its target
+
+A pending Uniswap V2 router swap moves the reserves of every pair on its path.
+When the reserves after that swap give an order at least its minimum output
+while the current reserves don't, the order can execute in the same block
+right behind the pending swap (bundle [pending tx, our swap]) instead of one
+or more polls after it landed. The watcher follows pending transactions
+(eth_subscribe newPendingTransactions with full transaction objects),
+applies every relevant swap to the cached reserves of the current block and
+reports the orders it pushes over their target.
+
+Filtering is ordered cheapest first so a full public mempool stream can be
+followed: the router address is searched in the raw message text before any
+JSON parsing, then `to` and the 4-byte selector are dict lookups, then the
+path is decoded and checked against the watched pairs. Only what passes all
+of them gets the reserve math.
+
+Recorded feed (newline-delimited JSON) - written by `record`, read by `replay`:
+  {"block": n, "reserves": [["0xtoken0", "0xtoken1", r0, r1], ...]}
+  {"jsonrpc": "2.0", "method": "eth_subscription", ...}   (notification as the node sent it)
+Reserves are only recorded for the pairs of the orders, so replay with the
+same order file.
+
+Run:
+  python mempool_watcher.py record --orders configs/orders.toml --out feed.ndjson [--duration 600]
+  python mempool_watcher.py replay feed.ndjson --orders configs/orders.toml
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import time
+import aiohttp
+import requests
+from web3 import Web3
+
+from contracts import UNISWAP_ROUTER, WETH_ADDRESS
+from fast_rpc import rpc_batch
+from quote_server import get_amount_in, get_amount_out, pair_address, read_reserves, sort_tokens
+import order_loader
+
+# ========================================
+# Constants
+# ========================================
+
+MEMPOOL_WS_URL = os.environ.get('MEMPOOL_WS_URL')
+POLL_INTERVAL = 1           # Seconds between block number checks
+MAX_PATH = 8                # Longer decoded paths are treated as garbage
+
+# Routers whose swaps are decoded (lower case, as nodes send addresses)
+ROUTERS = {UNISWAP_ROUTER.lower()}
+
+# Router swap functions by selector:
+# (exact output, word of the amount, word of the limit, word of the path offset)
+# exact input:  amount = amountIn,  limit = amountOutMin
+# exact output: amount = amountOut, limit = amountInMax
+# None = the transaction value (ETH in)
+SWAP_FUNCTIONS = {
+    "0x38ed1739": (False, 0, 1, 2),         # swapExactTokensForTokens
+    "0x5c11d795": (False, 0, 1, 2),         # swapExactTokensForTokensSupportingFeeOnTransferTokens
+    "0x18cbafe5": (False, 0, 1, 2),         # swapExactTokensForETH
+    "0x791ac947": (False, 0, 1, 2),         # swapExactTokensForETHSupportingFeeOnTransferTokens
+    "0x7ff36ab5": (False, None, 0, 1),      # swapExactETHForTokens
+    "0xb6f9de95": (False, None, 0, 1),      # swapExactETHForTokensSupportingFeeOnTransferTokens
+    "0x8803dbee": (True, 0, 1, 2),          # swapTokensForExactTokens
+    "0x4a25d94a": (True, 0, 1, 2),          # swapTokensForExactETH
+    "0xfb3bdb41": (True, 0, None, 1),       # swapETHForExactTokens
+}
+
+
+def decode_swap(tx):
+    """
+    Decode a pending router swap
+    Returns (exact_output, amount, limit, path) with lower-case token addresses, or None
+    """
+    data = tx.get("input") or tx.get("data") or ""
+    layout = SWAP_FUNCTIONS.get(data[:10])
+    if layout is None:
+        return None
+    exact_output, amount_word, limit_word, path_word = layout
+    body = data[10:]
+    try:
+        def word(index):
+            return int(body[index * 64:(index + 1) * 64], 16)
+
+        value = int(tx.get("value") or "0x0", 16)
+        amount = value if amount_word is None else word(amount_word)
+        limit = value if limit_word is None else word(limit_word)
+        offset = word(path_word) // 32
+        length = word(offset)
+        if not 2 <= length <= MAX_PATH:
+            return None
+        path = ["0x" + body[(offset + 1 + i) * 64 + 24:(offset + 2 + i) * 64].lower() for i in range(length)]
+    except ValueError:
+        return None
+    if len(path[-1]) != 42:
+        return None
+    return exact_output, amount, limit, path
+
+
+def simulate_swap(reserves, exact_output, amount, limit, path):
+    """
+    Reserves of the pairs a swap goes through after it executes
+    Returns dict pair key -> [r0, r1], or None when the swap would revert or
+    uses a pair that isn't cached
+    """
+    hops = []
+    for token_in, token_out in zip(path, path[1:]):
+        key = sort_tokens(token_in, token_out)
+        entry = reserves.get(key)
+        if entry is None:
+            return None
+        zero_for_one = token_in == key[0]
+        reserve_in, reserve_out = entry if zero_for_one else entry[::-1]
+        hops.append((key, zero_for_one, reserve_in, reserve_out))
+
+    if exact_output:
+        amounts = [amount]
+        for _, _, reserve_in, reserve_out in reversed(hops):
+            amount_in = get_amount_in(amounts[0], reserve_in, reserve_out)
+            if amount_in is None:
+                return None
+            amounts.insert(0, amount_in)
+        if amounts[0] > limit:
+            return None
+    else:
+        amounts = [amount]
+        for _, _, reserve_in, reserve_out in hops:
+            amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out))
+        if amounts[-1] == 0 or amounts[-1] < limit:
+            return None
+
+    after = {}
+    for (key, zero_for_one, reserve_in, reserve_out), amount_in, amount_out in zip(hops, amounts, amounts[1:]):
+        reserve_in, reserve_out = reserve_in + amount_in, reserve_out - amount_out
+        after[key] = [reserve_in, reserve_out] if zero_for_one else [reserve_out, reserve_in]
+    return after
+
+
+def quote_hops(reserves, amount_in, hops):
+    """getAmountsOut(...)[-1] over (pair key, zero_for_one) hops, None if a pair isn't cached"""
+    amount = amount_in
+    for key, zero_for_one in hops:
+        entry = reserves.get(key)
+        if entry is None:
+            return None
+        reserve0, reserve1 = entry
+        if zero_for_one:
+            amount = get_amount_out(amount, reserve0, reserve1)
+        else:
+            amount = get_amount_out(amount, reserve1, reserve0)
+    return amount
+
+
+def raw_transaction(rpc_url, tx, session=None):
+    """Signed bytes of a pending transaction for the back-run bundle, None if the node doesn't have it"""
+    if tx.get("raw"):
+        return tx["raw"]
+    result, = rpc_batch(session or requests.Session(), rpc_url, [("eth_getRawTransactionByHash", [tx["hash"]])])
+    return result
+
+
+class MempoolWatcher:
+    """
+    Predicts which orders a pending swap pushes over their target
+
+    watches is the bot's order id -> watch dict (swap_path,
+    amount_in_token_units, min_acceptable), read live so reloaded orders are
+    picked up with the next block. Every order triggers at most once per
+    block; on_trigger(trigger) is called for each.
+    """
+
+    def __init__(self, watches, on_trigger=None):
+        self.watches = watches
+        self.on_trigger = on_trigger
+        self.block = None
+        self.reserves = {}          # pair key (token0, token1), lower case -> [reserve0, reserve1]
+        self.pairs = {}             # pair key -> order ids whose path uses it
+        self.order_hops = {}        # order id -> [(pair key, zero_for_one), ...]
+        self.triggered = set()      # order ids already triggered in this block
+        self.stats = collections.Counter()
+        self._pair_addresses = {}   # pair key -> pair contract address
+
+    def refresh_orders(self):
+        """Rebuild the pair index from the watches"""
+        self.pairs = {}
+        self.order_hops = {}
+        for order_id, watch in self.watches.items():
+            path = [token.lower() for token in watch["swap_path"]]
+            hops = []
+            for token_in, token_out in zip(path, path[1:]):
+                key = sort_tokens(token_in, token_out)
+                hops.append((key, token_in == key[0]))
+                self.pairs.setdefault(key, set()).add(order_id)
+            self.order_hops[order_id] = hops
+
+    def pair_addresses(self):
+        """Pair contract address -> pair key of every watched pair"""
+        for key in self.pairs.keys() - self._pair_addresses.keys():
+            self._pair_addresses[key] = pair_address(*map(Web3.to_checksum_address, key))
+        return {self._pair_addresses[key]: key for key in self.pairs}
+
+    def on_block(self, block, reserves):
+        """New block - reserves is pair key -> [r0, r1] at that block"""
+        self.block = block
+        self.reserves = reserves
+        self.triggered.clear()
+
+    def on_message(self, text):
+        """One raw eth_subscription notification, returns the triggers it caused"""
+        self.stats["seen"] += 1
+        if not any(router in text for router in ROUTERS):
+            return []
+        tx = json.loads(text).get("params", {}).get("result")
+        if not isinstance(tx, dict):
+            return []
+        return self.on_pending(tx)
+
+    def on_pending(self, tx):
+        """One pending transaction object, returns the triggers it caused"""
+        if (tx.get("to") or "").lower() not in ROUTERS:
+            return []
+        self.stats["router"] += 1
+        swap = decode_swap(tx)
+        if swap is None:
+            return []
+        self.stats["swaps"] += 1
+        exact_output, amount, limit, path = swap
+        touched = [key for key in map(sort_tokens, path, path[1:]) if key in self.pairs]
+        if not touched or self.block is None:
+            return []
+        self.stats["relevant"] += 1
+
+        after = simulate_swap(self.reserves, exact_output, amount, limit, path)
+        if after is None:
+            self.stats["reverts"] += 1
+            return []
+        predicted_reserves = collections.ChainMap(after, self.reserves)
+
+        triggers = []
+        for order_id in set().union(*(self.pairs[key] for key in touched)):
+            watch = self.watches.get(order_id)
+            if watch is None or order_id in self.triggered or order_id not in self.order_hops:
+                continue
+            hops = self.order_hops[order_id]
+            min_acceptable = watch["min_acceptable"]
+            predicted = quote_hops(predicted_reserves, watch["amount_in_token_units"], hops)
+            if predicted is None or predicted < min_acceptable:
+                continue
+            current = quote_hops(self.reserves, watch["amount_in_token_units"], hops)
+            if current is None or current >= min_acceptable:
+                # Already over target - the regular price check executes it
+                continue
+            trigger = {"order_id": order_id, "block": self.block, "tx": tx,
+                       "current": current, "predicted": predicted}
+            self.triggered.add(order_id)
+            self.stats["triggers"] += 1
+            triggers.append(trigger)
+            if self.on_trigger is not None:
+                self.on_trigger(trigger)
+        return triggers
+
+    # ---------- live feed ----------
+
+    async def run(self, ws_url, rpc_url, recorder=None):
+        """Follow new blocks and pending transactions until cancelled"""
+        await asyncio.gather(self.follow_blocks(rpc_url, recorder), self.follow_pending(ws_url, recorder))
+
+    async def follow_blocks(self, rpc_url, recorder=None):
+        """Re-read the watched pairs' reserves on every new block"""
+        session = requests.Session()
+        while True:
+            try:
+                block_hex, = await asyncio.to_thread(rpc_batch, session, rpc_url, [("eth_blockNumber", [])])
+                block = int(block_hex, 16)
+                if block != self.block:
+                    self.refresh_orders()
+                    addresses = self.pair_addresses()
+                    values = await asyncio.to_thread(read_reserves, session, rpc_url, list(addresses), block)
+                    reserves = {addresses[pair]: entry for pair, entry in values.items()}
+                    self.on_block(block, reserves)
+                    if recorder is not None:
+                        recorder.block(block, reserves)
+            except Exception as e:
+                print(f"   ⚠ Mempool watcher could not refresh reserves: {str(e)[:100]}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def follow_pending(self, ws_url, recorder=None):
+        """Pending transaction subscription, reconnects when the socket drops"""
+        subscribe = {"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe",
+                     "params": ["newPendingTransactions", True]}
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(ws_url, heartbeat=30, max_msg_size=0) as ws:
+                        await ws.send_json(subscribe)
+                        print(f"👀 Mempool watcher subscribed to pending transactions")
+                        async for message in ws:
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            if recorder is not None:
+                                recorder.message(message.data)
+                            self.on_message(message.data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"   ⚠ Mempool subscription dropped: {str(e)[:100]}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+# ========================================
+# Recorded feeds
+# ========================================
+
+class FeedRecorder:
+    """Writes blocks and pending transaction notifications in the replay format"""
+
+    def __init__(self, path):
+        self.file = open(path, "a")
+
+    def block(self, block, reserves):
+        entries = [[token0, token1, reserve0, reserve1] for (token0, token1), (reserve0, reserve1) in reserves.items()]
+        self.file.write(json.dumps({"block": block, "reserves": entries}) + "\n")
+
+    def message(self, text):
+        self.file.write(text.strip() + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def replay(path, watcher):
+    """
+    Feed a recorded file through the watcher
+    Returns (pending messages, seconds spent filtering them)
+    """
+    watcher.refresh_orders()
+    messages = 0
+    elapsed = 0.0
+    with open(path) as f:
+        for line in f:
+            if line.startswith('{"block"'):
+                entry = json.loads(line)
+                watcher.on_block(entry["block"], {
+                    (token0, token1): [reserve0, reserve1] for token0, token1, reserve0, reserve1 in entry["reserves"]
+                })
+                continue
+            messages += 1
+            start = time.perf_counter()
+            watcher.on_message(line)
+            elapsed += time.perf_counter() - start
+    return messages, elapsed
+
+
+def order_watches(path):
+    """Watch dicts of an order file, same path and minimum output as limit_order_script.py"""
+    watches = {}
+    for order in order_loader.load_orders(path).values():
+        target_tokens_human = order.target_price * (1 - order.max_slippage_percent / 100)
+        watches[order.id] = {
+            "swap_path": [order.sell_token, WETH_ADDRESS, order.buy_token],
+            "amount_in_token_units": int(order.sell_amount * (10 ** order.sell_token_decimals)),
+            "min_acceptable": int(target_tokens_human * (10 ** order.buy_token_decimals)),
+            "rpc_url": order.rpc_url,
+        }
+    return watches
+
+
+async def record(args, watches):
+    recorder = FeedRecorder(args.out)
+    watcher = MempoolWatcher(watches, on_trigger=print_trigger)
+    rpc_url = args.rpc_url or next(iter(watches.values()))["rpc_url"]
+    print(f"📼 Recording pending transactions to {args.out}" + (f" for {args.duration}s" if args.duration else ""))
+    try:
+        await asyncio.wait_for(watcher.run(args.ws_url, rpc_url, recorder), timeout=args.duration or None)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        recorder.close()
+    print_stats(watcher)
+
+
+def print_trigger(trigger):
+    print(f"🔮 Block {trigger['block']}: {trigger['tx'].get('hash')} pushes {trigger['order_id']} "
+          f"from {trigger['current']} to {trigger['predicted']}")
+
+
+def print_stats(watcher):
+    stats = watcher.stats
+    print(f"   {stats['seen']} pending, {stats['router']} to the router, {stats['swaps']} swaps, "
+          f"{stats['relevant']} on watched pairs ({stats['reverts']} would revert), {stats['triggers']} trigger(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back-run predictions from pending swaps")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="record a live pending transaction feed")
+    record_parser.add_argument("--ws-url", default=MEMPOOL_WS_URL, help="websocket endpoint (default: MEMPOOL_WS_URL)")
+    record_parser.add_argument("--rpc-url", help="HTTP endpoint for reserves (default: the first order's rpc_url)")
+    record_parser.add_argument("--out", required=True)
+    record_parser.add_argument("--duration", type=float, default=0, help="seconds, 0 = until Ctrl+C")
+    replay_parser = subparsers.add_parser("replay", help="run a recorded feed through the watcher")
+    replay_parser.add_argument("feed")
+    for subparser in (record_parser, replay_parser):
+        subparser.add_argument("--orders", default=os.environ.get('CONFIG_FILE'), help="order file (default: CONFIG_FILE)")
+    args = parser.parse_args()
+
+    if not args.orders:
+        parser.error("--orders or CONFIG_FILE is required")
+    watches = order_watches(args.orders)
+
+    if args.command == "record":
+        if not args.ws_url:
+            parser.error("--ws-url or MEMPOOL_WS_URL is required")
+        try:
+            asyncio.run(record(args, watches))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    watcher = MempoolWatcher(watches, on_trigger=print_trigger)
+    messages, elapsed = replay(args.feed, watcher)
+    print_stats(watcher)
+    if messages:
+        print(f"   Filtered {messages} pending transactions in {elapsed:.3f}s "
+              f"({messages / max(elapsed, 1e-9):,.0f} tx/s, {elapsed / messages * 1e6:.1f} µs each)")
+
+
+if __name__ == "__main__":
+    main()
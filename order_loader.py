@@ -0,0 +1,297 @@
+"""
+Declarative order files (JSON / TOML / CSV)
+
+An order file holds plain data only - nothing is executed. Every order is
+validated once when the file is loaded (checksummed addresses, decimals,
+numeric ranges) so a bad entry fails at startup instead of at trigger time.
+All orders of a file share one rpc_url - a process runs them over a single
+connection - so set it in [defaults].
+
+JSON / TOML layout:
+
+    [defaults]                      # optional, applied to every order
+    rpc_url = "https://..."
+    gas_price_gwei = 50
+
+    [[orders]]
+    id = "usdt-pmmx"
+    sell_token = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+    buy_token = "0xc718dd93c450d3a97F51f0a9205d1072eD6197F9"
+    sell_amount = 20
+    ...
+
+CSV layout: one order per row, header row with the field names below.
+"""
+import csv
+import json
+import math
+import os
+import tomllib
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from web3 import Web3
+
+# ========================================
+# Schema
+# ========================================
+
+# field name -> (type, minimum, maximum, default)
+# default None = required
+ORDER_SCHEMA = {
+    "rpc_url": (str, None, None, None),
+    "sell_token": ("address", None, None, None),
+    "buy_token": ("address", None, None, None),
+    "sell_amount": (float, 0, None, None),
+    "sell_token_decimals": (int, 0, 36, None),
+    "buy_token_decimals": (int, 0, 36, None),
+    "target_price": (float, 0, None, None),
+    "check_interval": (float, 0, 3600, 2),
+    "max_slippage_percent": (float, 0, 100, 0),
+    "max_runtime_days": (int, 0, None, 1),
+    "max_runtime_months": (int, 0, None, 0),
+    "max_runtime_years": (int, 0, None, 0),
+    "gas_price_gwei": (float, 0, 10000, 50),
+    "approve_gas_limit": (int, 21000, 30_000_000, 80000),
+    "swap_gas_limit": (int, 21000, 30_000_000, 500000),
+    "bundle_check_delay": (float, 0, None, 10),
+    "max_bundle_checks": (int, 1, None, 10),
+}
+
+
+class OrderValidationError(ValueError):
+    """Raised when an order file contains invalid entries"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
+@dataclass(frozen=True)
+class Order:
+    id: str
+    rpc_url: str
+    sell_token: str
+    buy_token: str
+    sell_amount: float
+    sell_token_decimals: int
+    buy_token_decimals: int
+    target_price: float
+    check_interval: float
+    max_slippage_percent: float
+    max_runtime_days: int
+    max_runtime_months: int
+    max_runtime_years: int
+    gas_price_gwei: float
+    approve_gas_limit: int
+    swap_gas_limit: int
+    bundle_check_delay: float
+    max_bundle_checks: int
+
+    def as_config(self):
+        """Order as the upper-case config variables limit_order_script.py uses"""
+        return {name.upper(): value for name, value in asdict(self).items() if name != "id"}
+
+
+@lru_cache(maxsize=None)
+def _is_checksum_address(value):
+    # Order files repeat the same handful of tokens, so hash each only once
+    return Web3.is_checksum_address(value)
+
+
+def _coerce(name, value, spec):
+    """Convert and range-check one field, returns (value, error)"""
+    kind, minimum, maximum, _ = spec
+
+    if kind == "address":
+        if not isinstance(value, str) or not _is_checksum_address(value):
+            return None, f"{name}: {value!r} is not a checksummed address"
+        return value, None
+
+    if kind is str:
+        if not isinstance(value, str) or not value:
+            return None, f"{name}: expected a non-empty string"
+        return value, None
+
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        if kind is int:
+            number = int(value)
+            if isinstance(value, float) and number != value:
+                raise ValueError
+        else:
+            number = float(value)
+            if not math.isfinite(number):
+                raise ValueError
+    except (TypeError, ValueError, OverflowError):
+        return None, f"{name}: {value!r} is not a valid {kind.__name__}"
+
+    if minimum is not None and number < minimum:
+        return None, f"{name}: {number} is below the minimum {minimum}"
+    if maximum is not None and number > maximum:
+        return None, f"{name}: {number} is above the maximum {maximum}"
+    return number, None
+
+
+def validate_order(raw, order_id=None, defaults=None):
+    """
+    Validate one raw order dict (keys are case-insensitive)
+    Returns (Order, []) or (None, [errors])
+    """
+    if not isinstance(raw, dict):
+        return None, [f"order {order_id or '?'}: expected a table of fields, got {type(raw).__name__}"]
+    if None in raw:
+        # csv.DictReader puts the values of a row's extra columns under None
+        return None, [f"order {order_id or '?'}: {len(raw[None])} value(s) more than the header has columns"]
+    bad_keys = [k for k in (defaults or {}).keys() | raw.keys() if not isinstance(k, str)]
+    if bad_keys:
+        return None, [f"order {order_id or '?'}: field names must be strings, got {bad_keys[0]!r}"]
+
+    entry = {k.lower(): v for k, v in (defaults or {}).items()}
+    entry.update({k.lower(): v for k, v in raw.items() if v != ""})
+    order_id = str(entry.pop("id", order_id or ""))
+
+    values = {"id": order_id}
+    errors = []
+    for name, spec in ORDER_SCHEMA.items():
+        if name not in entry:
+            if spec[3] is None:
+                errors.append(f"{name}: missing")
+                continue
+            values[name] = spec[3]
+            continue
+        value, error = _coerce(name, entry.pop(name), spec)
+        if error:
+            errors.append(error)
+        values[name] = value
+
+    for name in entry:
+        errors.append(f"{name}: unknown field")
+
+    if not errors:
+        if values["sell_token"] == values["buy_token"]:
+            errors.append("buy_token: must differ from sell_token")
+        for name in ("sell_amount", "target_price"):
+            if values[name] == 0:
+                errors.append(f"{name}: must be greater than 0")
+
+    if errors:
+        return None, [f"order {order_id or '?'}: {error}" for error in errors]
+    return Order(**values), []
+
+
+# ========================================
+# Loading
+# ========================================
+
+def _read_entries(path):
+    """Read (defaults, [raw orders]) from a JSON, TOML or CSV order file"""
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        with open(path, newline='') as f:
+            return {}, list(csv.DictReader(f))
+
+    if suffix == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    elif suffix == ".toml":
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        raise ValueError(f"Unsupported order file format: {path.suffix}")
+
+    if isinstance(data, list):
+        return {}, data
+    if not isinstance(data, dict):
+        raise OrderValidationError([f"{path.name}: expected orders or a table with [[orders]]"])
+    defaults, entries = data.get("defaults", {}), data.get("orders", [])
+    if not isinstance(defaults, dict):
+        raise OrderValidationError([f"{path.name}: defaults must be a table of fields"])
+    if not isinstance(entries, list):
+        raise OrderValidationError([f"{path.name}: orders must be a list of orders"])
+    return defaults, entries
+
+
+def load_orders(path):
+    """
+    Load and validate every order in an order file
+    Returns dict of order id -> Order, raises OrderValidationError
+    """
+    path = Path(path)
+    defaults, entries = _read_entries(path)
+
+    orders = {}
+    errors = []
+    for index, raw in enumerate(entries, start=1):
+        order, order_errors = validate_order(raw, order_id=f"{path.stem}-{index}", defaults=defaults)
+        if order_errors:
+            errors.extend(order_errors)
+        elif order.id in orders:
+            errors.append(f"order {order.id}: duplicate id")
+        else:
+            orders[order.id] = order
+
+    errors.extend(endpoint_errors(orders.values()))
+    if errors:
+        raise OrderValidationError(errors)
+    return orders
+
+
+def endpoint_errors(orders):
+    """A process runs all of its orders over one connection - errors if they name several rpc_urls"""
+    rpc_urls = sorted({order.rpc_url for order in orders})
+    if len(rpc_urls) > 1:
+        return [f"rpc_url: all orders must use the same endpoint, found {len(rpc_urls)}: {', '.join(rpc_urls)}"]
+    return []
+
+
+def is_order_file(path):
+    return Path(path).suffix.lower() in (".json", ".toml", ".csv")
+
+
+class OrderBook:
+    """
+    Orders loaded from one file, with cheap hot reload
+
+    reload() only re-parses when the file modification time changed and
+    reports which orders were added, changed or removed. An invalid edit,
+    or one that moves the orders to another rpc_url, keeps the previously
+    loaded orders.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self.orders = load_orders(self.path)
+
+    def reload(self):
+        """Returns (added, changed, removed) order ids, all empty if nothing changed"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return set(), set(), set()
+        if mtime == self._mtime:
+            return set(), set(), set()
+
+        # Recorded before parsing, so a rejected edit is reported once and
+        # the file is only read again when it changes again
+        self._mtime = mtime
+        try:
+            orders = load_orders(self.path)
+        except (OrderValidationError, ValueError, OSError, csv.Error) as e:
+            print(f"⚠ Order file {self.path} not reloaded: {str(e)[:200]}")
+            return set(), set(), set()
+        old_urls = {order.rpc_url for order in self.orders.values()}
+        new_urls = {order.rpc_url for order in orders.values()}
+        if old_urls and new_urls and old_urls != new_urls:
+            print(f"⚠ Order file {self.path} not reloaded: rpc_url changed, restart to switch endpoints")
+            return set(), set(), set()
+
+        added = orders.keys() - self.orders.keys()
+        removed = self.orders.keys() - orders.keys()
+        changed = {order_id for order_id in orders.keys() & self.orders.keys()
+                   if orders[order_id] != self.orders[order_id]}
+        self.orders = orders
+        return set(added), changed, set(removed)
@@ -0,0 +1,158 @@
+"""
+Adaptive price polling for limit orders
+
+Instead of polling every order at a fixed CHECK_INTERVAL, each order's next
+check is derived from how far its price is from the target and how volatile
+the price has recently been. An order at 40% of target in a quiet market can
+wait minutes; an order at 99.9% is checked every block.
+
+Due orders are kept in a priority queue (heap) keyed by their next check
+time, so the dispatcher only ever touches orders that are actually due.
+"""
+import heapq
+import itertools
+import math
+import time
+
+# ========================================
+# Constants
+# ========================================
+
+BLOCK_TIME = 12             # Seconds per block - fastest useful cadence
+MAX_POLL_INTERVAL = 120     # Never leave an order unchecked longer than this
+VOLATILITY_HALFLIFE = 300   # Seconds for the volatility estimate to decay by half
+SAFETY_SIGMAS = 4           # Price must be this many sigmas away to wait longer
+MIN_VOLATILITY_SAMPLES = 3  # Price changes seen before the volatility estimate is used
+MIN_VOLATILITY = 1e-4       # Floor of sigma per sqrt(second) (~3% a day)
+
+
+class PollScheduler:
+    """
+    Priority queue of orders by next check time, with per-order volatility tracking
+
+    Usage:
+        scheduler.schedule(order_id)                      # due now
+        for order_id in scheduler.pop_due(): ...          # check due orders
+        delay = scheduler.record(order_id, price, target, check_interval)
+        scheduler.schedule(order_id, delay)
+    """
+
+    def __init__(self, max_interval=MAX_POLL_INTERVAL, halflife=VOLATILITY_HALFLIFE,
+                 safety_sigmas=SAFETY_SIGMAS, clock=time.monotonic):
+        self.max_interval = max_interval
+        self.halflife = halflife
+        self.safety_sigmas = safety_sigmas
+        self.clock = clock
+        self._heap = []
+        self._entries = {}          # order_id -> (due, seq) of its live heap entry
+        self._counter = itertools.count()
+        self._last_price = {}       # order_id -> (time, price)
+        self._variance_rate = {}    # order_id -> EWMA of squared log return per second
+        self._samples = {}          # order_id -> number of samples in the estimate
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, order_id):
+        return order_id in self._entries
+
+    def schedule(self, order_id, delay=0):
+        """(Re)schedule an order to be due after delay seconds"""
+        due = self.clock() + delay
+        seq = next(self._counter)
+        self._entries[order_id] = (due, seq)
+        heapq.heappush(self._heap, (due, seq, order_id))
+
+    def remove(self, order_id):
+        """Stop scheduling an order (its heap entry is dropped lazily)"""
+        self._entries.pop(order_id, None)
+        self._last_price.pop(order_id, None)
+        self._variance_rate.pop(order_id, None)
+        self._samples.pop(order_id, None)
+
+    def _drop_stale(self):
+        while self._heap:
+            due, seq, order_id = self._heap[0]
+            if self._entries.get(order_id) == (due, seq):
+                return
+            heapq.heappop(self._heap)
+
+    def pop_due(self, now=None):
+        """Remove and return all orders whose check time has come, earliest first"""
+        now = self.clock() if now is None else now
+        due_orders = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, order_id = heapq.heappop(self._heap)
+            del self._entries[order_id]
+            due_orders.append(order_id)
+            self._drop_stale()
+        return due_orders
+
+    def time_until_next(self, now=None):
+        """Seconds until the next order is due (0 if overdue), None if queue is empty"""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        now = self.clock() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
+
+    def volatility(self, order_id):
+        """
+        Estimated standard deviation of the log price per sqrt(second)
+        None if unknown - fewer than MIN_VOLATILITY_SAMPLES samples, or none of them moved
+        """
+        variance_rate = self._variance_rate.get(order_id)
+        if not variance_rate or self._samples.get(order_id, 0) < MIN_VOLATILITY_SAMPLES:
+            return None
+        return max(MIN_VOLATILITY, math.sqrt(variance_rate))
+
+    def _update_volatility(self, order_id, price, now):
+        previous = self._last_price.get(order_id)
+        self._last_price[order_id] = (now, price)
+        if previous is None:
+            return
+        previous_time, previous_price = previous
+        elapsed = now - previous_time
+        if elapsed <= 0 or previous_price <= 0:
+            return
+
+        log_return = math.log(price / previous_price)
+        sample = log_return * log_return / elapsed
+        # Plain average of the first samples, then the time-decayed EWMA
+        samples = self._samples.get(order_id, 0) + 1
+        self._samples[order_id] = samples
+        weight = max(1 / samples, 1 - 0.5 ** (elapsed / self.halflife))
+        current = self._variance_rate.get(order_id, 0.0)
+        self._variance_rate[order_id] = current + weight * (sample - current)
+
+    def next_interval(self, order_id, price, target, min_interval):
+        """
+        Seconds to wait before the next check of an order
+
+        The wait is the time the price would need to cover the remaining
+        distance to target at SAFETY_SIGMAS standard deviations:
+            t = (ln(target / price) / (SAFETY_SIGMAS * sigma))^2
+        clamped to [min_interval, max_interval].
+        """
+        min_interval = min(min_interval, BLOCK_TIME)
+        if price is None or price <= 0 or target <= 0 or price >= target:
+            return min_interval
+
+        sigma = self.volatility(order_id)
+        if sigma is None:
+            # No usable volatility estimate yet - stay conservative
+            return min_interval
+
+        distance = math.log(target / price)
+        interval = (distance / (self.safety_sigmas * sigma)) ** 2
+        return max(min_interval, min(self.max_interval, interval))
+
+    def record(self, order_id, price, target, min_interval):
+        """
+        Record a price observation and return the delay until the next check
+        price may be None when the check failed (order is retried soon)
+        """
+        if price is not None and price > 0:
+            self._update_volatility(order_id, price, self.clock())
+        return self.next_interval(order_id, price, target, min_interval)
@@ -0,0 +1,178 @@
+"""
+Shared on-disk state for running limit order instances.
+
+Every bot instance writes the bundles and transactions it has submitted to
+STATE_DIR/<instance>.json so other tools (cancel_script.py) can act on
+whatever is still in flight without copying hashes out of the logs. The
+wallet funds an order has reserved are kept there too, so `wallet_lanes.py
+rebalance` leaves them alone.
+
+Updates hold an exclusive lock on STATE_DIR/<instance>.lock for the whole
+load-modify-write, so the bot and cancel_script.py don't lose each other's
+status changes.
+"""
+import contextlib
+import fcntl
+import json
+import os
+import socket
+import time
+from pathlib import Path
+
+# ========================================
+# Constants
+# ========================================
+
+STATE_DIR = Path(os.environ.get('STATE_DIR', Path(__file__).parent / "state"))
+
+STATUS_PENDING = "pending"
+STATUS_EXECUTED = "executed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+def instance_name(config_file):
+    """Name used for the state file of the instance running config_file"""
+    return Path(config_file).stem if config_file else "default"
+
+
+def state_path(name, state_dir=STATE_DIR):
+    return Path(state_dir) / f"{name}.json"
+
+
+@contextlib.contextmanager
+def locked(name, state_dir=STATE_DIR):
+    """Hold the instance's state lock (for a load_state ... save_state sequence)"""
+    Path(state_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(state_dir) / f"{name}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_state(name, state_dir=STATE_DIR):
+    """Load the state of one instance (empty state if none was written yet)"""
+    path = state_path(name, state_dir)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"instance": name, "submissions": []}
+
+
+def save_state(state, state_dir=STATE_DIR):
+    """Atomically write the state of one instance"""
+    Path(state_dir).mkdir(parents=True, exist_ok=True)
+    path = state_path(state["instance"], state_dir)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def record_submission(name, bundle_hash, replacement_uuid, tx_hashes,
+                      state_dir=STATE_DIR, **extra):
+    """Record a bundle that was just sent to the builder as pending"""
+    with locked(name, state_dir):
+        state = load_state(name, state_dir)
+        state["pid"] = os.getpid()
+        state["submissions"].append({
+            "bundle_hash": bundle_hash,
+            "replacement_uuid": replacement_uuid,
+            "tx_hashes": list(tx_hashes),
+            "submitted_at": time.time(),
+            "status": STATUS_PENDING,
+            **extra
+        })
+        save_state(state, state_dir)
+
+
+def update_status(name, key, status, state_dir=STATE_DIR):
+    """
+    Update the status of the pending submission identified by key
+    (bundle hash, replacement uuid or one of its tx hashes)
+    Returns True if a submission was updated
+    """
+    with locked(name, state_dir):
+        state = load_state(name, state_dir)
+        updated = False
+        for submission in state["submissions"]:
+            if submission.get("status") != STATUS_PENDING:
+                continue
+            if key in (submission.get("bundle_hash"), submission.get("replacement_uuid")) \
+                    or key in submission.get("tx_hashes", []):
+                submission["status"] = status
+                submission["updated_at"] = time.time()
+                updated = True
+        if updated:
+            save_state(state, state_dir)
+    return updated
+
+
+def record_commitment(name, address, token, amount, state_dir=STATE_DIR):
+    """Record the wallet and sell token amount reserved by an order (address None = released)"""
+    with locked(name, state_dir):
+        state = load_state(name, state_dir)
+        if address is None:
+            if state.pop("commitment", None) is None:
+                return
+        else:
+            state["pid"] = os.getpid()
+            state["commitment"] = {"address": address, "token": token, "amount": amount,
+                                   "host": socket.gethostname(), "pid": os.getpid(),
+                                   "updated_at": time.time()}
+        save_state(state, state_dir)
+
+
+def is_alive(commitment):
+    """
+    False when the process that recorded the commitment is gone
+    Only checkable on the same host (container) - commitments of others count as alive
+    """
+    if commitment.get("host") != socket.gethostname() or not commitment.get("pid"):
+        return True
+    try:
+        os.kill(commitment["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def load_commitments(state_dir=STATE_DIR, other_processes=False):
+    """
+    Collect the funds reserved by orders across instances, leaving out those
+    of processes that died without releasing them (and with other_processes,
+    those of this process)
+    Returns a list of (instance_name, commitment) tuples
+    """
+    commitments = []
+    host, pid = socket.gethostname(), os.getpid()
+    for path in sorted(Path(state_dir).glob("*.json")):
+        commitment = load_state(path.stem, state_dir).get("commitment")
+        if not commitment or not is_alive(commitment):
+            continue
+        if other_processes and commitment.get("host") == host and commitment.get("pid") == pid:
+            continue
+        commitments.append((path.stem, commitment))
+    return commitments
+
+
+def load_outstanding(state_dir=STATE_DIR, instances=None):
+    """
+    Collect all pending submissions across instances
+    Returns a list of (instance_name, submission) tuples
+    """
+    outstanding = []
+    for path in sorted(Path(state_dir).glob("*.json")):
+        name = path.stem
+        if instances and name not in instances:
+            continue
+        # Other files share the directory (chain_metadata.py's chain-<id>.json)
+        for submission in load_state(name, state_dir).get("submissions", []):
+            if submission.get("status") == STATUS_PENDING:
+                outstanding.append((name, submission))
+    return outstanding
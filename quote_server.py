@@ -0,0 +1,280 @@
+"""
+Shared local quote server
+
+One process keeps the reserves of every Uniswap V2 pair that any bot instance
+needs current (one batched getReserves round-trip per block) and pushes
+changes over a Unix socket. Bot instances subscribe to the pairs of their
+swap paths and compute getAmountsOut locally from those reserves, so RPC cost
+scales with the number of distinct pairs rather than with the number of
+containers.
+
+Protocol (newline-delimited JSON):
+  client -> server  {"subscribe": [["0xTokenA", "0xTokenB"], ...]}
+  server -> client  {"pair": "0x..", "token0": "0x..", "reserves": [r0, r1], "block": n}
+  server -> client  {"block": n}                       (heartbeat, once per block)
+
+Run:
+  QUOTE_RPC_URL=https://... python quote_server.py
+"""
+import asyncio
+import json
+import os
+import time
+from functools import lru_cache
+import requests
+from web3 import Web3
+
+from contracts import UNISWAP_V2_FACTORY
+from fast_rpc import rpc_batch
+from order_scheduler import BLOCK_TIME
+
+# ========================================
+# Constants
+# ========================================
+
+QUOTE_SOCKET = os.environ.get('QUOTE_SOCKET', "/tmp/limit-order-quotes.sock")
+QUOTE_RPC_URL = os.environ.get('QUOTE_RPC_URL')
+POLL_INTERVAL = 1           # Seconds between block number checks
+# Client ignores quotes when no heartbeat for this long - about one block, a
+# price more than a block old isn't good enough to trigger an order on
+STALE_AFTER = BLOCK_TIME + 3
+
+# keccak of the UniswapV2Pair creation code, used for CREATE2 pair addresses
+UNISWAP_V2_PAIR_INIT_CODE_HASH = "0x96e8ac4277198ff8b6f785478aa9a39f403cb768dd02cbee326c3e7da348845f"
+GET_RESERVES_SELECTOR = "0x0902f1ac"
+
+
+def sort_tokens(token_a, token_b):
+    """Token order of a Uniswap V2 pair (token0, token1)"""
+    return (token_a, token_b) if int(token_a, 16) < int(token_b, 16) else (token_b, token_a)
+
+
+@lru_cache(maxsize=None)
+def pair_address(token_a, token_b, factory=UNISWAP_V2_FACTORY):
+    """Uniswap V2 pair address computed offline via CREATE2 (no getPair call)"""
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = Web3.keccak(bytes.fromhex(token0[2:]) + bytes.fromhex(token1[2:]))
+    raw = Web3.keccak(
+        b'\xff' + bytes.fromhex(factory[2:]) + salt + bytes.fromhex(UNISWAP_V2_PAIR_INIT_CODE_HASH[2:])
+    )
+    return Web3.to_checksum_address(raw[12:])
+
+
+def get_amount_out(amount_in, reserve_in, reserve_out):
+    """UniswapV2Library.getAmountOut (0.3% fee)"""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * 997
+    return amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+
+
+def get_amount_in(amount_out, reserve_in, reserve_out):
+    """UniswapV2Library.getAmountIn (0.3% fee), None if the pool can't provide amount_out"""
+    if amount_out <= 0 or reserve_in <= 0 or amount_out >= reserve_out:
+        return None
+    return reserve_in * amount_out * 1000 // ((reserve_out - amount_out) * 997) + 1
+
+
+def read_reserves(session, rpc_url, pairs, block):
+    """getReserves of the given pairs at a block in one batch request, dict pair -> [r0, r1]"""
+    results = rpc_batch(session, rpc_url, [
+        ("eth_call", [{"to": pair, "data": GET_RESERVES_SELECTOR}, hex(block)])
+        for pair in pairs
+    ])
+    reserves = {}
+    for pair, result in zip(pairs, results):
+        if result and len(result) >= 2 + 64 * 2:
+            data = result[2:]
+            reserves[pair] = [int(data[0:64], 16), int(data[64:128], 16)]
+    return reserves
+
+
+# ========================================
+# Server
+# ========================================
+
+class QuoteServer:
+    """Polls reserves of all subscribed pairs once per block and fans them out"""
+
+    def __init__(self, rpc_url, socket_path=QUOTE_SOCKET):
+        self.rpc_url = rpc_url
+        self.socket_path = socket_path
+        self.session = requests.Session()
+        self.pairs = {}             # pair address -> {"token0", "reserves", "subscribers"}
+        self.block = None
+
+    def _rpc_batch(self, calls):
+        """Send a list of (method, params) as one JSON-RPC batch, results in order"""
+        return rpc_batch(self.session, self.rpc_url, calls)
+
+    def fetch_reserves(self, pairs, block):
+        """Read the reserves of the given pairs in one batch request"""
+        return read_reserves(self.session, self.rpc_url, pairs, block)
+
+    def _send(self, writer, message):
+        try:
+            writer.write((json.dumps(message) + "\n").encode())
+        except Exception:
+            pass
+
+    def _pair_message(self, pair):
+        entry = self.pairs[pair]
+        return {"pair": pair, "token0": entry["token0"], "reserves": entry["reserves"], "block": self.block}
+
+    async def handle_client(self, reader, writer):
+        subscribed = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                for token_a, token_b in request.get("subscribe", []):
+                    pair = pair_address(token_a, token_b)
+                    entry = self.pairs.setdefault(pair, {
+                        "token0": sort_tokens(token_a, token_b)[0],
+                        "reserves": None,
+                        "subscribers": set()
+                    })
+                    entry["subscribers"].add(writer)
+                    subscribed.add(pair)
+                    if entry["reserves"] is not None:
+                        self._send(writer, self._pair_message(pair))
+                    else:
+                        # Unknown pair - refresh on the next poll instead of the next block
+                        self.block = None
+                await writer.drain()
+        finally:
+            for pair in subscribed:
+                entry = self.pairs.get(pair)
+                if entry:
+                    entry["subscribers"].discard(writer)
+                    if not entry["subscribers"]:
+                        del self.pairs[pair]
+            writer.close()
+
+    async def poll_chain(self):
+        """Refresh reserves on every new block and push what changed"""
+        while True:
+            try:
+                block_hex, = await asyncio.to_thread(self._rpc_batch, [("eth_blockNumber", [])])
+                block = int(block_hex, 16)
+                if block != self.block and self.pairs:
+                    fetched = set(self.pairs)
+                    reserves = await asyncio.to_thread(self.fetch_reserves, list(fetched), block)
+                    # A pair subscribed during the fetch isn't in it - leave the block
+                    # unset so the next poll fetches again instead of the next block
+                    if not self.pairs.keys() - fetched:
+                        self.block = block
+                    for pair, values in reserves.items():
+                        entry = self.pairs.get(pair)
+                        if entry is None:
+                            continue
+                        if values != entry["reserves"]:
+                            entry["reserves"] = values
+                            for writer in entry["subscribers"]:
+                                self._send(writer, self._pair_message(pair))
+                    writers = {w for entry in self.pairs.values() for w in entry["subscribers"]}
+                    for writer in writers:
+                        self._send(writer, {"block": block})
+                    print(f"[{time.strftime('%H:%M:%S')}] Block {block}: {len(reserves)}/{len(self.pairs)} pair(s) refreshed")
+                else:
+                    self.block = block
+            except Exception as e:
+                print(f"   ⚠ Could not refresh reserves: {str(e)[:100]}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        print(f"📡 Quote server listening on {self.socket_path}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.poll_chain())
+
+
+# ========================================
+# Client
+# ========================================
+
+class QuoteClient:
+    """
+    Subscribes to pairs on the local quote server and quotes swap paths from
+    the pushed reserves. get_amounts_out returns None whenever a quote can't be
+    trusted (not connected, pair not known yet, no heartbeat for STALE_AFTER)
+    so the caller can fall back to an on-chain call.
+    """
+
+    def __init__(self, socket_path=QUOTE_SOCKET):
+        self.socket_path = socket_path
+        self.reserves = {}          # pair address -> (token0, reserve0, reserve1)
+        self.pairs = set()          # (token_a, token_b) subscribed
+        self.last_heartbeat = 0
+        self._writer = None
+        self._task = None
+
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def subscribe(self, path):
+        """Subscribe to every hop of a swap path"""
+        new_pairs = [(a, b) for a, b in zip(path, path[1:]) if (a, b) not in self.pairs]
+        self.pairs.update(new_pairs)
+        if new_pairs and self._writer is not None:
+            self._writer.write((json.dumps({"subscribe": new_pairs}) + "\n").encode())
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                self._writer = writer
+                if self.pairs:
+                    writer.write((json.dumps({"subscribe": list(self.pairs)}) + "\n").encode())
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    message = json.loads(line)
+                    self.last_heartbeat = time.monotonic()
+                    if "pair" in message:
+                        reserve0, reserve1 = message["reserves"]
+                        self.reserves[message["pair"]] = (message["token0"], reserve0, reserve1)
+            except (OSError, json.JSONDecodeError):
+                pass
+            self._writer = None
+            self.reserves.clear()
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def get_amounts_out(self, amount_in, path):
+        """Same result as router.getAmountsOut(amount_in, path)[-1], or None"""
+        if self._writer is None or time.monotonic() - self.last_heartbeat > STALE_AFTER:
+            return None
+        amount = amount_in
+        for token_in, token_out in zip(path, path[1:]):
+            entry = self.reserves.get(pair_address(token_in, token_out))
+            if entry is None:
+                return None
+            token0, reserve0, reserve1 = entry
+            if token_in == token0:
+                amount = get_amount_out(amount, reserve0, reserve1)
+            else:
+                amount = get_amount_out(amount, reserve1, reserve0)
+        return amount
+
+
+if __name__ == "__main__":
+    if not QUOTE_RPC_URL:
+        print("❌ Set QUOTE_RPC_URL to the Ethereum RPC endpoint")
+        raise SystemExit(1)
+    asyncio.run(QuoteServer(QUOTE_RPC_URL).serve())
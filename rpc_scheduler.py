@@ -0,0 +1,178 @@
+"""
+Priority-aware RPC scheduling with per-endpoint rate budgets
+
+All orders share one provider key, so once its rate limit is hit price
+polling and execution fail alike. With RPC_RATE_LIMIT set, every RPC the bot
+makes first takes a token from its endpoint's bucket (RPC_RATE_LIMIT
+requests/s, RPC_BURST deep). While the bucket is empty, waiting requests are
+served strictly by priority class:
+
+  PRIORITY_SUBMIT       nonce / block / allowance reads for a bundle, bundle submission
+  PRIORITY_SIMULATE     the eth_call simulation before submitting
+  PRIORITY_QUOTE_NEAR   price checks of orders within NEAR_TARGET_PERCENT of target
+  PRIORITY_QUOTE_FAR    every other price check
+  PRIORITY_STATUS       bundle status polling
+
+so a trigger never waits behind routine polling. Quote and status requests
+carry a key; a request whose key is already queued or in flight shares that
+request's result instead of spending another token.
+
+The budget is per process. When several containers share one key, give each
+of them its share of the provider limit. RPC_RATE_LIMIT=0 (default) turns
+budgeting off and every call runs as before.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import defaultdict
+
+# ========================================
+# Constants
+# ========================================
+
+RPC_RATE_LIMIT = float(os.environ.get('RPC_RATE_LIMIT', '0'))      # Requests per second per endpoint
+RPC_BURST = float(os.environ.get('RPC_BURST', '0')) or max(1.0, RPC_RATE_LIMIT)
+NEAR_TARGET_PERCENT = 2.0   # Orders this close to their minimum output quote at the higher priority
+
+PRIORITY_SUBMIT = 0
+PRIORITY_SIMULATE = 1
+PRIORITY_QUOTE_NEAR = 2
+PRIORITY_QUOTE_FAR = 3
+PRIORITY_STATUS = 4
+PRIORITY_NAMES = ("submit", "simulate", "quote near", "quote far", "status")
+
+
+def quote_priority(last_output, min_acceptable):
+    """Priority of an order's next price check from its last quote"""
+    if last_output is None or last_output >= min_acceptable * (1 - NEAR_TARGET_PERCENT / 100):
+        return PRIORITY_QUOTE_NEAR
+    return PRIORITY_QUOTE_FAR
+
+
+class TokenBucket:
+    """rate tokens per second, at most burst stored"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+
+    def take(self, count=1):
+        """Take count tokens, returns 0 on success or the seconds until they're available"""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= count:
+            self.tokens -= count
+            return 0
+        return (count - self.tokens) / self.rate
+
+
+class RpcScheduler:
+    """Token buckets per endpoint and a priority queue of the requests waiting for them"""
+
+    def __init__(self, rate=RPC_RATE_LIMIT, burst=RPC_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}          # endpoint -> TokenBucket
+        self._waiters = {}          # endpoint -> heap of (priority, seq, count, future)
+        self._timers = {}           # endpoint -> TimerHandle of the next dispatch
+        self._inflight = {}         # key -> task of a queued / running call
+        self._counter = itertools.count()
+        self.stats = defaultdict(lambda: [0, 0.0])     # priority -> [requests, seconds waited]
+        self.coalesced = 0
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    async def acquire(self, endpoint, priority, count=1):
+        """Wait until the endpoint's budget allows count requests of this priority"""
+        if not self.enabled:
+            return
+        count = min(count, self.burst)
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            bucket = self._buckets[endpoint] = TokenBucket(self.rate, self.burst)
+        waiters = self._waiters.setdefault(endpoint, [])
+        stats = self.stats[priority]
+        stats[0] += 1
+        if not waiters and bucket.take(count) == 0:
+            return
+
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(waiters, (priority, next(self._counter), count, future))
+        self._dispatch(endpoint)
+        try:
+            await future
+        finally:
+            stats[1] += time.monotonic() - start
+
+    def _dispatch(self, endpoint):
+        """Grant tokens to the waiters of an endpoint, highest priority first"""
+        waiters = self._waiters[endpoint]
+        bucket = self._buckets[endpoint]
+        while waiters:
+            _, _, count, future = waiters[0]
+            if future.done():
+                heapq.heappop(waiters)
+                continue
+            wait = bucket.take(count)
+            if wait > 0:
+                if endpoint not in self._timers:
+                    self._timers[endpoint] = asyncio.get_running_loop().call_later(wait, self._on_timer, endpoint)
+                return
+            heapq.heappop(waiters)
+            future.set_result(None)
+
+    def _on_timer(self, endpoint):
+        del self._timers[endpoint]
+        self._dispatch(endpoint)
+
+    async def run(self, endpoint, priority, fn, *args, key=None, count=1):
+        """
+        Run a blocking RPC function in a thread once the budget allows
+        Calls with the key of a queued or running call share its result
+        Without a rate limit fn runs inline as before
+        """
+        if not self.enabled:
+            return fn(*args)
+        if key is not None and key in self._inflight:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight[key])
+
+        async def call():
+            await self.acquire(endpoint, priority, count)
+            return await asyncio.to_thread(fn, *args)
+
+        task = asyncio.ensure_future(call())
+        if key is not None:
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None) if self._inflight.get(key) is task else None)
+        return await asyncio.shield(task)
+
+    def report(self):
+        lines = [f"🚦 RPC budget {self.rate:g}/s per endpoint (burst {self.burst:g}), "
+                 f"{self.coalesced} request(s) coalesced"]
+        for priority in sorted(self.stats):
+            requests, waited = self.stats[priority]
+            lines.append(f"   {PRIORITY_NAMES[priority]:<11} {requests:7.0f} requests, "
+                         f"avg wait {waited / max(requests, 1) * 1000:7.1f} ms")
+        return "\n".join(lines)
+
+
+# Shared by everything in the process
+SCHEDULER = RpcScheduler()
+
+
+async def acquire(endpoint, priority, count=1):
+    await SCHEDULER.acquire(endpoint, priority, count)
+
+
+async def run(endpoint, priority, fn, *args, key=None, count=1):
+    return await SCHEDULER.run(endpoint, priority, fn, *args, key=key, count=count)
@@ -0,0 +1,274 @@
+"""
+Transaction signing off the event loop
+
+SigningService runs SIGNING_WORKERS worker processes (`python
+signing_service.py worker`). Each worker receives the private keys once on
+its stdin when it starts; the service itself only keeps the wallet
+addresses, so after ExecutionLane.attach_signer the bot process holds no key
+material. ECDSA signing and RLP encoding then happen in the workers, in
+parallel, while the event loop keeps serving quotes.
+
+Every sign() call is one job (usually a whole bundle). A thread per worker
+takes the next job plus everything else queued at that moment, up to
+BATCH_SIZE, and sends it as one request, so re-signing many bundles in the
+same block costs a few pipe round-trips instead of one per transaction.
+
+A worker that dies fails its batch and is not replaced - the keys are gone
+from this process. The remaining workers take over the queue; once none is
+left every queued and later job fails with SigningError instead of waiting.
+
+Protocol (newline-delimited JSON over the worker's stdin / stdout):
+  parent -> worker  ["0xkey", ...]                    once, at start
+  worker -> parent  ["0xAddress", ...]
+  parent -> worker  [["0xAddress", [tx, ...]], ...]   one batch of jobs
+  worker -> parent  [[["0xraw", "0xhash"], ...] | {"error": "..."}, ...]
+
+Benchmark:
+  python signing_service.py benchmark [--transactions 5000] [--workers 1 2 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from web3 import Web3
+from eth_account import Account
+from eth_keys.backends import get_backend
+
+from contracts import CHAIN_ID, UNISWAP_ROUTER
+from wallet_lanes import raw_transaction
+
+# ========================================
+# Constants
+# ========================================
+
+BATCH_SIZE = 64             # Jobs sent to a worker in one request
+MAX_WORKERS = 8
+SIGNING_TIMEOUT = 10        # Seconds a caller waits for a signed bundle
+
+
+class SigningError(RuntimeError):
+    """A transaction could not be signed, or the worker died"""
+
+
+class SigningService:
+    """Signs transactions of the given wallets in a pool of worker processes"""
+
+    def __init__(self, private_keys, workers=2):
+        self.addresses = []
+        self._jobs = queue.Queue()
+        self._processes = []
+        self._threads = []
+        self._lock = threading.Lock()
+        self._alive = 0             # Workers still serving jobs
+        self._error = None          # Set once no worker is left
+        workers = max(1, min(workers, MAX_WORKERS))
+        for index in range(workers):
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "worker"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+            )
+            process.stdin.write(json.dumps(list(private_keys)) + "\n")
+            process.stdin.flush()
+            addresses = json.loads(process.stdout.readline() or "null")
+            if addresses is None:
+                self.close()
+                raise SigningError("signing worker failed to start")
+            self.addresses = addresses
+            self._processes.append(process)
+            self._alive += 1
+            thread = threading.Thread(target=self._run, args=(process,), name=f"signing-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __len__(self):
+        return len(self._processes)
+
+    def submit(self, address, transactions):
+        """Queue transactions of one wallet, returns a Future of [(raw tx hex, tx hash hex), ...]"""
+        future = Future()
+        with self._lock:
+            if self._error is not None:
+                future.set_running_or_notify_cancel()
+                future.set_exception(self._error)
+            else:
+                self._jobs.put((address, list(transactions), future))
+        return future
+
+    async def sign(self, address, transactions):
+        return await asyncio.wrap_future(self.submit(address, transactions))
+
+    def sign_blocking(self, address, transactions, timeout=SIGNING_TIMEOUT):
+        try:
+            return self.submit(address, transactions).result(timeout)
+        except TimeoutError:
+            raise SigningError(f"no signature after {timeout}s") from None
+
+    def close(self):
+        with self._lock:
+            self._error = SigningError("signing service closed")
+        for _ in self._threads:
+            self._jobs.put(None)
+        for process in self._processes:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except Exception:
+                process.kill()
+
+    def _run(self, process):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            batch = [job]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    # Shutdown - leave the sentinel for this thread's next get
+                    self._jobs.put(None)
+                    break
+                batch.append(job)
+            # Jobs whose caller gave up (timed out) are dropped, the rest can't be cancelled now
+            batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                process.stdin.write(json.dumps([[address, txs] for address, txs, _ in batch]) + "\n")
+                process.stdin.flush()
+                results = json.loads(process.stdout.readline() or "null")
+                if results is None:
+                    raise SigningError(f"signing worker {process.pid} exited")
+            except Exception as e:
+                error = e if isinstance(e, SigningError) else SigningError(str(e))
+                for *_, future in batch:
+                    future.set_exception(error)
+                self._worker_died(process, error)
+                return
+
+            for (_, _, future), result in zip(batch, results):
+                if isinstance(result, dict):
+                    future.set_exception(SigningError(result["error"]))
+                else:
+                    future.set_result([tuple(signed) for signed in result])
+
+    def _worker_died(self, process, error):
+        """Leave the queue to the other workers, or fail everything when this was the last one"""
+        print(f"⚠ Signing worker {process.pid} stopped: {error}")
+        process.kill()
+        with self._lock:
+            self._alive -= 1
+            if self._alive > 0:
+                return
+            if self._error is None:
+                self._error = SigningError("no signing worker left")
+            # No later job gets queued now - fail the ones that already are
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    return
+                if job is not None and job[2].set_running_or_notify_cancel():
+                    job[2].set_exception(self._error)
+
+
+# ========================================
+# Worker
+# ========================================
+
+def worker():
+    """Worker process main: keys from the first stdin line, then batches of jobs"""
+    accounts = {account.address: account for account in map(Account.from_key, json.loads(sys.stdin.readline()))}
+    print(json.dumps(list(accounts)), flush=True)
+    for line in sys.stdin:
+        results = []
+        for address, transactions in json.loads(line):
+            try:
+                account = accounts[address]
+                signed = [account.sign_transaction(tx) for tx in transactions]
+                results.append([[Web3.to_hex(raw_transaction(s)), Web3.to_hex(s.hash)] for s in signed])
+            except KeyError:
+                results.append({"error": f"no key for {address}"})
+            except Exception as e:
+                results.append({"error": str(e)[:200]})
+        print(json.dumps(results), flush=True)
+
+
+# ========================================
+# Benchmark
+# ========================================
+
+def benchmark_transactions(address, count):
+    """Swap-sized legacy transactions like the ones execute_order signs"""
+    data = "0x38ed1739" + "00" * 32 * 8
+    return [{
+        "from": address, "to": UNISWAP_ROUTER, "value": 0, "data": data, "nonce": nonce,
+        "gas": 500000, "gasPrice": 50 * 10**9, "chainId": CHAIN_ID
+    } for nonce in range(count)]
+
+
+def benchmark(args):
+    keys = [Web3.to_hex(Web3.keccak(text=f"signing-benchmark-{index}")) for index in range(args.wallets)]
+    addresses = [Account.from_key(key).address for key in keys]
+    per_wallet = args.transactions // len(keys)
+    jobs = [(address, tx) for address in addresses
+            for tx in benchmark_transactions(address, per_wallet)]
+    bundles = [jobs[index:index + args.bundle_size] for index in range(0, len(jobs), args.bundle_size)]
+    backend = type(get_backend()).__name__
+    print(f"🖊️ Signing {len(jobs)} transactions ({len(bundles)} bundles of {args.bundle_size}, "
+          f"{len(keys)} wallet(s), {backend}, {os.cpu_count()} CPU(s))")
+    if backend == "NativeECCBackend":
+        print(f"   ⚠ Pure Python ECDSA - pip install coincurve for a much faster backend")
+
+    # "loop busy" is the CPU time of the calling thread (the event loop in the bot) per transaction
+    accounts = {address: Account.from_key(key) for address, key in zip(addresses, keys)}
+    start, busy = time.perf_counter(), time.thread_time()
+    for address, tx in jobs:
+        accounts[address].sign_transaction(tx)
+    inline = len(jobs) / (time.perf_counter() - start)
+    busy = (time.thread_time() - busy) / len(jobs)
+    print(f"   inline:       {inline:8,.0f} tx/s, loop busy {busy * 1e6:6.0f} µs/tx")
+
+    for workers in args.workers:
+        service = SigningService(keys, workers)
+        try:
+            start, busy = time.perf_counter(), time.thread_time()
+            futures = [service.submit(bundle[0][0], [tx for _, tx in bundle]) for bundle in bundles]
+            submitted = time.thread_time() - busy
+            for future in futures:
+                future.result()
+            rate = len(jobs) / (time.perf_counter() - start)
+        finally:
+            service.close()
+        print(f"   {workers} worker(s):  {rate:8,.0f} tx/s, loop busy {submitted / len(jobs) * 1e6:6.0f} µs/tx"
+              f"  ({rate / inline:.1f}x inline throughput)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transaction signing worker pool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("worker", help="run as a signing worker (started by SigningService)")
+    bench_parser = subparsers.add_parser("benchmark", help="signed transactions per second")
+    bench_parser.add_argument("--transactions", type=int, default=5000)
+    bench_parser.add_argument("--wallets", type=int, default=4)
+    bench_parser.add_argument("--bundle-size", type=int, default=2, help="transactions per job")
+    bench_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        worker()
+    else:
+        benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+import cancel_script
+
+TX_HASH = "0x" + "ab" * 32
+
+
+async def with_builder(handler, test):
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await test(session, f"http://127.0.0.1:{port}/")
+    finally:
+        await runner.cleanup()
+
+
+def test_cancel_transaction_sends_eth_cancel_private_transaction():
+    requests = []
+
+    async def handler(request):
+        body = await request.json()
+        requests.append(body)
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": True})
+
+    result = asyncio.run(with_builder(handler, lambda session, url: cancel_script.cancel_transaction(session, url, TX_HASH)))
+    assert result is True
+    assert requests[0]["method"] == "eth_cancelPrivateTransaction"
+    assert requests[0]["params"] == [{"txHash": TX_HASH}]
+
+
+def test_cancel_transaction_raises_on_rpc_error():
+    async def handler(request):
+        return web.json_response({"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "unknown tx"}})
+
+    async def test(session, url):
+        try:
+            await cancel_script.cancel_transaction(session, url, TX_HASH)
+        except RuntimeError as e:
+            return str(e)
+    assert asyncio.run(with_builder(handler, test)) == "unknown tx"
@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+import order_loader
+
+SELL_TOKEN = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+BUY_TOKEN = "0xc718dd93c450d3a97F51f0a9205d1072eD6197F9"
+
+
+def write_orders(path, orders, mtime_ns):
+    path.write_text(json.dumps({
+        "defaults": {"rpc_url": "http://127.0.0.1:8545", "sell_token": SELL_TOKEN, "buy_token": BUY_TOKEN,
+                     "sell_token_decimals": 6, "buy_token_decimals": 18},
+        "orders": orders
+    }))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_rejected_edit_is_parsed_once(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "orders.json"
+    write_orders(path, [{"id": "a", "sell_amount": 1, "target_price": 2}], 1_000_000_000)
+    book = order_loader.OrderBook(path)
+
+    calls = []
+    load_orders = order_loader.load_orders
+    monkeypatch.setattr(order_loader, "load_orders", lambda p: calls.append(p) or load_orders(p))
+
+    write_orders(path, [{"id": "a", "sell_amount": 1, "target_price": "nan"}], 2_000_000_000)
+    for _ in range(3):
+        assert book.reload() == (set(), set(), set())
+    assert len(calls) == 1
+    assert capsys.readouterr().out.count("not reloaded") == 1
+    assert book.orders["a"].target_price == 2
+
+    # The next edit is picked up again
+    write_orders(path, [{"id": "a", "sell_amount": 1, "target_price": 3}], 3_000_000_000)
+    assert book.reload() == (set(), {"a"}, set())
+    assert book.orders["a"].target_price == 3
+    assert len(calls) == 2
+
+
+def test_malformed_entries_are_validation_errors(tmp_path):
+    path = tmp_path / "orders.json"
+    path.write_text(json.dumps({"orders": ["x"]}))
+    with pytest.raises(order_loader.OrderValidationError, match="expected a table of fields"):
+        order_loader.load_orders(path)
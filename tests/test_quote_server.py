@@ -0,0 +1,39 @@
+import asyncio
+
+import quote_server
+
+PAIR_A = "0x0d4a11d5EEaaC28EC3F61d100daF4d40471f1852"
+PAIR_B = "0xB4e16d0168e52d35CaCD2c6185b44281Ec28C9Dc"
+
+
+def test_pair_subscribed_during_fetch_is_fetched_on_next_poll(monkeypatch):
+    monkeypatch.setattr(quote_server, "POLL_INTERVAL", 0.01)
+    server = quote_server.QuoteServer("http://127.0.0.1:1")
+    server.pairs[PAIR_A] = {"token0": "0x0", "reserves": None, "subscribers": set()}
+    server._rpc_batch = lambda calls: ["0x10"]
+    fetches = []
+
+    def fetch_reserves(pairs, block):
+        fetches.append(set(pairs))
+        if len(fetches) == 1:
+            # What handle_client does for a new pair while this fetch is running
+            server.pairs[PAIR_B] = {"token0": "0x0", "reserves": None, "subscribers": set()}
+            server.block = None
+        return {pair: (1, 2) for pair in pairs}
+    server.fetch_reserves = fetch_reserves
+
+    async def run():
+        task = asyncio.create_task(server.poll_chain())
+        while len(fetches) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+    # Same block, fetched again because of the new pair
+    assert fetches == [{PAIR_A}, {PAIR_A, PAIR_B}]
+    assert server.block == 16
+    assert server.pairs[PAIR_B]["reserves"] == (1, 2)
+
+
+def test_stale_after_is_about_one_block():
+    assert quote_server.STALE_AFTER < 2 * quote_server.BLOCK_TIME
@@ -0,0 +1,80 @@
+import v3_pool
+from v3_pool import compute_swap_step, get_sqrt_ratio_at_tick
+
+# Values from the v3-core TickMath / SwapMath specs
+# (encodePriceSqrt(1, 1), encodePriceSqrt(101, 100), encodePriceSqrt(1000, 100))
+PRICE_1_1 = 79228162514264337593543950336
+PRICE_101_100 = 79623317895830914510487008059
+PRICE_1000_100 = 250541448375047931186501464011
+
+TOKEN0 = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+TOKEN1 = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+
+def test_sqrt_ratio_at_tick():
+    assert get_sqrt_ratio_at_tick(v3_pool.MIN_TICK) == v3_pool.MIN_SQRT_RATIO == 4295128739
+    assert get_sqrt_ratio_at_tick(v3_pool.MAX_TICK) == v3_pool.MAX_SQRT_RATIO \
+        == 1461446703485210103287273052203988822378723970342
+    assert get_sqrt_ratio_at_tick(0) == PRICE_1_1
+    assert get_sqrt_ratio_at_tick(50) == 79426470787362580746886972461
+    assert get_sqrt_ratio_at_tick(-50) == 79030349367926598376800521322
+    assert get_sqrt_ratio_at_tick(5000) == 101729702841318637793976746270
+    assert get_sqrt_ratio_at_tick(150000) == 143194173941309278083010301478497
+    assert get_sqrt_ratio_at_tick(738203) == 847134979253254120489401328389043031315994541
+
+
+def test_swap_step_capped_at_price_target():
+    price, amount_in, amount_out, fee = compute_swap_step(PRICE_1_1, PRICE_101_100, 2 * 10**18, 10**18, 600)
+    assert (amount_in, amount_out, fee) == (9975124224178055, 9925619580021728, 5988667735148)
+    assert price == PRICE_101_100
+
+
+def test_swap_step_spends_whole_input():
+    price, amount_in, amount_out, fee = compute_swap_step(PRICE_1_1, PRICE_1000_100, 2 * 10**18, 10**18, 600)
+    assert (amount_in, amount_out, fee) == (999400000000000000, 666399946655997866, 600000000000000)
+    assert price < PRICE_1000_100
+
+
+def test_swap_step_entire_input_taken_as_fee():
+    assert compute_swap_step(2413, 79887613182836312, 1985041575832132834610021537970, 10, 1872) \
+        == (2413, 0, 0, 10)
+
+
+def _pool():
+    """1:1 pool, 0.3% fee, one narrow and one wide position around the price"""
+    pool = v3_pool.V3Pool("0x0", TOKEN0, TOKEN1, 3000, 60)
+    narrow, wide = 3 * 10**21, 10**21
+    ticks = {
+        -6000: (wide, wide), -600: (narrow, narrow),
+        600: (narrow, -narrow), 6000: (wide, -wide),
+    }
+    pool.load(PRICE_1_1, 0, narrow + wide, ticks, (-2, 1), 1)
+    return pool, narrow, wide
+
+
+def test_quote_within_one_range():
+    pool, narrow, wide = _pool()
+    _, _, expected, _ = compute_swap_step(PRICE_1_1, get_sqrt_ratio_at_tick(-600), narrow + wide, 10**18, 3000)
+    assert pool.quote(10**18, TOKEN0) == expected
+    _, _, expected, _ = compute_swap_step(PRICE_1_1, get_sqrt_ratio_at_tick(600), narrow + wide, 10**18, 3000)
+    assert pool.quote(10**18, TOKEN1) == expected
+
+
+def test_quote_crosses_initialized_tick():
+    pool, narrow, wide = _pool()
+    amount = 2 * 10**20
+    price, step_in, first_out, fee = compute_swap_step(
+        PRICE_1_1, get_sqrt_ratio_at_tick(-600), narrow + wide, amount, 3000
+    )
+    assert price == get_sqrt_ratio_at_tick(-600)
+    _, _, second_out, _ = compute_swap_step(
+        price, get_sqrt_ratio_at_tick(-6000), wide, amount - step_in - fee, 3000
+    )
+    assert pool.quote_exact_input(amount, True) == first_out + second_out
+
+
+def test_quote_outside_synced_words_is_none():
+    pool, _, _ = _pool()
+    # Drains both positions and walks into bitmap words that were never synced
+    assert pool.quote_exact_input(10**23, True) is None
+    assert pool.quote_exact_input(0, True) is None
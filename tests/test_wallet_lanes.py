@@ -0,0 +1,75 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+
+from web3 import Web3
+
+import order_state
+import wallet_lanes
+
+TOKEN = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+KEYS = [Web3.to_hex(Web3.keccak(text=f"lane-test-{index}")) for index in range(2)]
+
+
+def make_pool(state_dir):
+    pool = wallet_lanes.LanePool(KEYS, state_dir)
+    for lane in pool.lanes:
+        lane.balances[TOKEN] = 1000
+    return pool
+
+
+def write_commitment(state_dir, name, address, amount, pid):
+    """State file of an order another process runs"""
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / f"{name}.json").write_text(json.dumps({
+        "instance": name, "submissions": [],
+        "commitment": {"address": address, "token": TOKEN, "amount": amount,
+                       "host": socket.gethostname(), "pid": pid}
+    }))
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_assign_counts_other_instances(tmp_path):
+    pool = make_pool(tmp_path)
+    write_commitment(tmp_path, "trader-1", pool.lanes[0].address, 600, os.getppid())
+
+    lane = pool.assign("order-a", TOKEN, 300)
+    assert lane is pool.lanes[1]
+    # Lane 0 has 400 left after the other instance's 600
+    assert pool.assign("order-b", TOKEN, 500) is pool.lanes[1]
+    assert pool.assign("order-c", TOKEN, 500) is None
+
+
+def test_commitments_of_dead_processes_are_dropped(tmp_path):
+    pool = make_pool(tmp_path)
+    write_commitment(tmp_path, "trader-1", pool.lanes[0].address, 600, dead_pid())
+    write_commitment(tmp_path, "trader-2", pool.lanes[1].address, 100, os.getppid())
+
+    assert [name for name, _ in order_state.load_commitments(tmp_path)] == ["trader-2"]
+    assert pool.load_shared_commitments(tmp_path) == 1
+    assert pool.lanes[0].available(TOKEN) == 1000
+    assert pool.lanes[1].available(TOKEN) == 900
+
+
+def test_own_commitments_are_recorded_and_released(tmp_path):
+    pool = make_pool(tmp_path)
+    pool.on_change = lambda order_id, lane, token, amount: order_state.record_commitment(
+        order_id, lane.address if lane else None, token, amount, tmp_path)
+    lane = pool.assign("order-a", TOKEN, 300)
+
+    # Counted by others, not by this process
+    assert [name for name, _ in order_state.load_commitments(tmp_path)] == ["order-a"]
+    assert order_state.load_commitments(tmp_path, other_processes=True) == []
+    other = make_pool(tmp_path)
+    other.load_shared_commitments(tmp_path)
+    assert other.lanes[lane.index].available(TOKEN) == 700
+
+    pool.release("order-a")
+    assert order_state.load_commitments(tmp_path) == []
@@ -0,0 +1,543 @@
+"""
+Local Uniswap V3 quoting
+
+Quoting a V3 pool through the on-chain Quoter is a full swap simulation per
+call. Here a pool's slot0, active liquidity and initialized ticks are synced
+into memory once (one batched request) and then kept current from its
+Swap / Mint / Burn logs, one eth_getLogs per block for all pools. Exact-input
+quotes run a port of the pool's swap loop with the same integer math
+(TickMath, SqrtPriceMath, SwapMath, tick bitmap word stepping). It has only
+been compared with QuoterV2 offline - run with --check to compare against a
+live node before relying on it.
+
+Standalone for now: limit_order_script.py and quote_server.py don't import
+it. Orders are still quoted and executed through the V2 router only, since
+the bot has no V3 execution path (SwapRouter calldata, approvals).
+
+Only the tick bitmap words within WORD_RANGE of the current tick are synced;
+a quote that would cross into an unsynced word returns None (caller falls
+back to the on-chain Quoter) instead of a wrong number.
+
+Run:
+  python v3_pool.py --rpc-url URL --pool 0x... --token-in 0x... --amount-in 1000000 [--watch] [--check]
+"""
+import argparse
+import bisect
+import math
+import time
+import requests
+from web3 import Web3
+
+from contracts import UNISWAP_V3_QUOTER_V2
+from fast_rpc import rpc_batch
+
+# ========================================
+# Constants
+# ========================================
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+Q96 = 1 << 96
+MAX_UINT256 = (1 << 256) - 1
+
+WORD_RANGE = 20             # Bitmap words synced on each side of the current tick
+RESYNC_BLOCKS = 1000        # Full resync after this many blocks (also covers reorgs)
+MAX_LOG_RANGE = 500         # Resync instead of replaying more blocks of logs than this
+
+# Function selectors
+SLOT0_SELECTOR = "0x3850c7bd"
+LIQUIDITY_SELECTOR = "0x1a686502"
+FEE_SELECTOR = "0xddca3f43"
+TICK_SPACING_SELECTOR = "0xd0c93a7c"
+TOKEN0_SELECTOR = "0x0dfe1681"
+TOKEN1_SELECTOR = "0xd21220a7"
+TICK_BITMAP_SELECTOR = "0x5339c296"
+TICKS_SELECTOR = "0xf30dba93"
+QUOTE_EXACT_INPUT_SINGLE_SELECTOR = "0xc6a5026a"
+
+# Event topics
+SWAP_TOPIC = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
+MINT_TOPIC = "0x7a53080ba414158be7ec69b987b5fb7d07dee101fe85488f0853ae16239d0bde"
+BURN_TOPIC = "0x0c396cd989a39f4459b5fa1aed6a9a8dcdbc45908acfd67e028cd568da98982c"
+
+
+# ========================================
+# Pool math (ports of the v3-core libraries)
+# ========================================
+
+def mul_div(a, b, denominator):
+    """FullMath.mulDiv"""
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a, b, denominator):
+    """FullMath.mulDivRoundingUp"""
+    return -(-a * b // denominator)
+
+
+def div_rounding_up(x, y):
+    """UnsafeMath.divRoundingUp"""
+    return -(-x // y)
+
+
+def get_sqrt_ratio_at_tick(tick):
+    """TickMath.getSqrtRatioAtTick - sqrt(1.0001^tick) as Q64.96, rounded up"""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"tick {tick} out of range")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 0x100000000000000000000000000000000
+    for bit, factor in (
+        (0x2, 0xfff97272373d413259a46990580e213a),
+        (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+        (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+        (0x10, 0xffcb9843d60f6159c9db58835c926644),
+        (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+        (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+        (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+        (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+        (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+        (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+        (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+        (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+        (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+        (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+        (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+        (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+        (0x20000, 0x5d6af8dedb81196699c329225ee604),
+        (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+        (0x80000, 0x48a170391f7dc42444e8fa2),
+    ):
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96):
+    """TickMath.getTickAtSqrtRatio - greatest tick whose sqrt ratio is <= sqrt_price_x96"""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError("sqrt price out of range")
+    # Estimate from the float log, then settle on the exact tick with the integer math
+    tick = math.floor(2 * math.log(sqrt_price_x96 / Q96) / math.log(1.0001))
+    tick = max(MIN_TICK, min(MAX_TICK - 1, tick))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK - 1 and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_amount0_delta(sqrt_a, sqrt_b, liquidity, round_up):
+    """SqrtPriceMath.getAmount0Delta"""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_b - sqrt_a
+    if round_up:
+        return div_rounding_up(mul_div_rounding_up(numerator1, numerator2, sqrt_b), sqrt_a)
+    return mul_div(numerator1, numerator2, sqrt_b) // sqrt_a
+
+
+def get_amount1_delta(sqrt_a, sqrt_b, liquidity, round_up):
+    """SqrtPriceMath.getAmount1Delta"""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return mul_div(liquidity, sqrt_b - sqrt_a, Q96)
+
+
+def get_next_sqrt_price_from_input(sqrt_price_x96, liquidity, amount_in, zero_for_one):
+    """SqrtPriceMath.getNextSqrtPriceFromInput"""
+    if zero_for_one:
+        # getNextSqrtPriceFromAmount0RoundingUp(add=True)
+        if amount_in == 0:
+            return sqrt_price_x96
+        numerator1 = liquidity << 96
+        product = amount_in * sqrt_price_x96
+        if product <= MAX_UINT256:
+            denominator = numerator1 + product
+            if denominator <= MAX_UINT256:
+                return mul_div_rounding_up(numerator1, sqrt_price_x96, denominator)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount_in)
+    # getNextSqrtPriceFromAmount1RoundingDown(add=True)
+    return sqrt_price_x96 + (amount_in << 96) // liquidity
+
+
+def compute_swap_step(sqrt_price_current, sqrt_price_target, liquidity, amount_remaining, fee_pips):
+    """
+    SwapMath.computeSwapStep for exact input (amount_remaining > 0)
+    Returns (sqrt_price_next, amount_in, amount_out, fee_amount)
+    """
+    zero_for_one = sqrt_price_current >= sqrt_price_target
+
+    amount_remaining_less_fee = mul_div(amount_remaining, 10**6 - fee_pips, 10**6)
+    if zero_for_one:
+        amount_in = get_amount0_delta(sqrt_price_target, sqrt_price_current, liquidity, True)
+    else:
+        amount_in = get_amount1_delta(sqrt_price_current, sqrt_price_target, liquidity, True)
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_price_next = sqrt_price_target
+    else:
+        sqrt_price_next = get_next_sqrt_price_from_input(
+            sqrt_price_current, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_price_next == sqrt_price_target
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(sqrt_price_next, sqrt_price_current, liquidity, True)
+        amount_out = get_amount1_delta(sqrt_price_next, sqrt_price_current, liquidity, False)
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(sqrt_price_current, sqrt_price_next, liquidity, True)
+        amount_out = get_amount0_delta(sqrt_price_current, sqrt_price_next, liquidity, False)
+
+    if not reached_target:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 10**6 - fee_pips)
+    return sqrt_price_next, amount_in, amount_out, fee_amount
+
+
+# ========================================
+# Pool state
+# ========================================
+
+class UnsyncedRange(Exception):
+    """A swap would leave the part of the tick bitmap that was synced"""
+
+
+class V3Pool:
+    """In-memory copy of the swap-relevant state of one Uniswap V3 pool"""
+
+    def __init__(self, address, token0, token1, fee, tick_spacing):
+        self.address = address
+        self.token0 = token0
+        self.token1 = token1
+        self.fee = fee
+        self.tick_spacing = tick_spacing
+        self.sqrt_price_x96 = 0
+        self.tick = 0
+        self.liquidity = 0
+        self.ticks = {}             # tick -> [liquidity_gross, liquidity_net]
+        self.initialized = []       # sorted compressed ticks (tick // tick_spacing) with liquidity
+        self.words = (0, -1)        # synced bitmap word range (inclusive)
+        self.block = None
+
+    def __repr__(self):
+        return f"V3Pool({self.address}, fee={self.fee}, tick={self.tick})"
+
+    def load(self, sqrt_price_x96, tick, liquidity, ticks, words, block):
+        """Replace the state with a fresh sync (ticks: dict tick -> (gross, net))"""
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+        self.ticks = {t: list(values) for t, values in ticks.items() if values[0]}
+        self.initialized = sorted(t // self.tick_spacing for t in self.ticks)
+        self.words = words
+        self.block = block
+
+    def _in_synced_words(self, tick):
+        return self.words[0] <= (tick // self.tick_spacing) >> 8 <= self.words[1]
+
+    def _update_tick(self, tick, gross_delta, net_delta):
+        if not self._in_synced_words(tick):
+            return
+        entry = self.ticks.get(tick)
+        if entry is None:
+            entry = self.ticks[tick] = [0, 0]
+            bisect.insort(self.initialized, tick // self.tick_spacing)
+        entry[0] += gross_delta
+        entry[1] += net_delta
+        if entry[0] == 0:
+            del self.ticks[tick]
+            self.initialized.remove(tick // self.tick_spacing)
+
+    def apply_swap(self, sqrt_price_x96, liquidity, tick):
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.liquidity = liquidity
+        self.tick = tick
+
+    def apply_liquidity_change(self, tick_lower, tick_upper, amount):
+        """Mint (amount > 0) or Burn (amount < 0) of a position"""
+        if amount == 0:
+            return
+        self._update_tick(tick_lower, amount, amount)
+        self._update_tick(tick_upper, amount, -amount)
+        if tick_lower <= self.tick < tick_upper:
+            self.liquidity += amount
+
+    def apply_log(self, log):
+        """Apply one Swap / Mint / Burn log (eth_getLogs format)"""
+        topic = log["topics"][0]
+        data = log["data"][2:]
+        words = [data[i:i + 64] for i in range(0, len(data), 64)]
+        if topic == SWAP_TOPIC:
+            self.apply_swap(int(words[2], 16), int(words[3], 16), _signed(words[4]))
+        elif topic == MINT_TOPIC:
+            self.apply_liquidity_change(_signed(log["topics"][2][2:]), _signed(log["topics"][3][2:]), int(words[1], 16))
+        elif topic == BURN_TOPIC:
+            self.apply_liquidity_change(_signed(log["topics"][2][2:]), _signed(log["topics"][3][2:]), -int(words[0], 16))
+
+    def next_initialized_tick_within_one_word(self, tick, lte):
+        """TickBitmap.nextInitializedTickWithinOneWord on the synced ticks"""
+        compressed = tick // self.tick_spacing
+        if lte:
+            word_start = compressed - (compressed & 255)
+            if not self.words[0] <= compressed >> 8 <= self.words[1]:
+                raise UnsyncedRange(tick)
+            index = bisect.bisect_right(self.initialized, compressed) - 1
+            if index >= 0 and self.initialized[index] >= word_start:
+                return self.initialized[index] * self.tick_spacing, True
+            return word_start * self.tick_spacing, False
+
+        start = compressed + 1
+        word_end = start + (255 - (start & 255))
+        if not self.words[0] <= start >> 8 <= self.words[1]:
+            raise UnsyncedRange(tick)
+        index = bisect.bisect_left(self.initialized, start)
+        if index < len(self.initialized) and self.initialized[index] <= word_end:
+            return self.initialized[index] * self.tick_spacing, True
+        return word_end * self.tick_spacing, False
+
+    def quote_exact_input(self, amount_in, zero_for_one):
+        """
+        Output of swapping amount_in through the pool (UniswapV3Pool.swap, no price limit)
+        Returns None if the swap can't be quoted from the synced state
+        """
+        if amount_in <= 0 or self.sqrt_price_x96 == 0:
+            return None
+        sqrt_price_limit = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+
+        remaining = amount_in
+        amount_out = 0
+        sqrt_price = self.sqrt_price_x96
+        tick = self.tick
+        liquidity = self.liquidity
+
+        try:
+            while remaining != 0 and sqrt_price != sqrt_price_limit:
+                sqrt_price_start = sqrt_price
+                tick_next, initialized = self.next_initialized_tick_within_one_word(tick, zero_for_one)
+                tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+                sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+                if zero_for_one:
+                    target = sqrt_price_limit if sqrt_price_next < sqrt_price_limit else sqrt_price_next
+                else:
+                    target = sqrt_price_limit if sqrt_price_next > sqrt_price_limit else sqrt_price_next
+                sqrt_price, step_in, step_out, fee_amount = compute_swap_step(
+                    sqrt_price, target, liquidity, remaining, self.fee
+                )
+                remaining -= step_in + fee_amount
+                amount_out += step_out
+
+                if sqrt_price == sqrt_price_next:
+                    if initialized:
+                        liquidity_net = self.ticks[tick_next][1]
+                        liquidity += -liquidity_net if zero_for_one else liquidity_net
+                    tick = tick_next - 1 if zero_for_one else tick_next
+                elif sqrt_price != sqrt_price_start:
+                    tick = get_tick_at_sqrt_ratio(sqrt_price)
+        except UnsyncedRange:
+            return None
+
+        # Pool ran out of liquidity - the router would revert or fill partially
+        return amount_out if remaining == 0 else None
+
+    def quote(self, amount_in, token_in):
+        """Output amount of the other token for amount_in of token_in"""
+        return self.quote_exact_input(amount_in, token_in == self.token0)
+
+
+def _signed(word, bits=256):
+    """Two's complement hex word (int24 / int128 values are sign-extended) to int"""
+    value = int(word, 16)
+    return value - (1 << bits) if value >= 1 << (bits - 1) else value
+
+
+def _encode_int(value):
+    return format(value & MAX_UINT256, "064x")
+
+
+# ========================================
+# Sync from chain
+# ========================================
+
+class V3PoolSync:
+    """
+    Keeps a set of V3 pools current: one batched sync per pool, then one
+    eth_getLogs per block for all pools together
+    """
+
+    def __init__(self, rpc_url, word_range=WORD_RANGE):
+        self.rpc_url = rpc_url
+        self.word_range = word_range
+        self.session = requests.Session()
+        self.pools = {}             # address -> V3Pool
+        self.block = None
+        self.synced_at = None
+        self.requests = 0           # JSON-RPC round-trips (for comparison with the Quoter)
+
+    def _batch(self, calls):
+        self.requests += 1
+        return rpc_batch(self.session, self.rpc_url, calls)
+
+    def block_number(self):
+        block_hex, = self._batch([("eth_blockNumber", [])])
+        return int(block_hex, 16)
+
+    def add_pool(self, address):
+        """Read the immutables of a pool and sync its state"""
+        address = Web3.to_checksum_address(address)
+        results = self._batch([
+            ("eth_call", [{"to": address, "data": selector}, "latest"])
+            for selector in (TOKEN0_SELECTOR, TOKEN1_SELECTOR, FEE_SELECTOR, TICK_SPACING_SELECTOR)
+        ])
+        if not all(results):
+            raise ValueError(f"{address} is not a Uniswap V3 pool")
+        token0, token1 = (Web3.to_checksum_address("0x" + result[-40:]) for result in results[:2])
+        pool = V3Pool(address, token0, token1, int(results[2], 16), _signed(results[3][2:]))
+        self.pools[address] = pool
+        self.sync(pool, self.block if self.block is not None else self.block_number())
+        return pool
+
+    def sync(self, pool, block):
+        """Read slot0, liquidity and the initialized ticks around the current tick at one block"""
+        block_tag = hex(block)
+        slot0, liquidity = self._batch([
+            ("eth_call", [{"to": pool.address, "data": SLOT0_SELECTOR}, block_tag]),
+            ("eth_call", [{"to": pool.address, "data": LIQUIDITY_SELECTOR}, block_tag]),
+        ])
+        sqrt_price_x96 = int(slot0[2:66], 16)
+        tick = _signed(slot0[66:130])
+
+        center = (tick // pool.tick_spacing) >> 8
+        min_word = (MIN_TICK // pool.tick_spacing) >> 8
+        max_word = (MAX_TICK // pool.tick_spacing) >> 8
+        words = range(max(min_word, center - self.word_range), min(max_word, center + self.word_range) + 1)
+        bitmaps = self._batch([
+            ("eth_call", [{"to": pool.address, "data": TICK_BITMAP_SELECTOR + _encode_int(word)}, block_tag])
+            for word in words
+        ])
+
+        initialized = []
+        for word, bitmap in zip(words, bitmaps):
+            bitmap = int(bitmap, 16) if bitmap else 0
+            while bitmap:
+                bit = (bitmap & -bitmap).bit_length() - 1
+                initialized.append(((word << 8) + bit) * pool.tick_spacing)
+                bitmap &= bitmap - 1
+
+        ticks = {}
+        if initialized:
+            results = self._batch([
+                ("eth_call", [{"to": pool.address, "data": TICKS_SELECTOR + _encode_int(t)}, block_tag])
+                for t in initialized
+            ])
+            for t, result in zip(initialized, results):
+                if not result:
+                    raise ValueError(f"Could not read tick {t} of {pool.address}")
+                ticks[t] = (int(result[2:66], 16), _signed(result[66:130]))
+
+        pool.load(sqrt_price_x96, tick, int(liquidity, 16), ticks, (words[0], words[-1]), block)
+        self.block = block if self.block is None else max(self.block, block)
+        if self.synced_at is None:
+            self.synced_at = block
+
+    def update(self):
+        """
+        Apply the Swap / Mint / Burn logs of all pools since the last update
+        Returns the number of logs applied
+        """
+        latest = self.block_number()
+        if self.block is None or latest <= self.block:
+            return 0
+
+        if latest - self.block > MAX_LOG_RANGE or latest - self.synced_at >= RESYNC_BLOCKS:
+            self.synced_at = None
+            for pool in self.pools.values():
+                self.sync(pool, latest)
+            return 0
+
+        logs, = self._batch([("eth_getLogs", [{
+            "address": list(self.pools),
+            "fromBlock": hex(self.block + 1),
+            "toBlock": hex(latest),
+            "topics": [[SWAP_TOPIC, MINT_TOPIC, BURN_TOPIC]],
+        }])])
+        logs = sorted(logs or [], key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+        for log in logs:
+            pool = self.pools.get(Web3.to_checksum_address(log["address"]))
+            if pool is not None:
+                pool.apply_log(log)
+        for pool in self.pools.values():
+            pool.block = latest
+        self.block = latest
+        return len(logs)
+
+    def quote_route(self, amount_in, token_in, pools):
+        """Exact-input quote through a list of pool addresses, None if any hop can't be quoted"""
+        amount = amount_in
+        for address in pools:
+            pool = self.pools[address]
+            amount = pool.quote(amount, token_in)
+            if amount is None:
+                return None
+            token_in = pool.token1 if token_in == pool.token0 else pool.token0
+        return amount
+
+
+def quoter_quote(rpc_url, pool, amount_in, token_in, quoter=UNISWAP_V3_QUOTER_V2, block="latest"):
+    """QuoterV2.quoteExactInputSingle via eth_call (for checking the local quote)"""
+    token_out = pool.token1 if token_in == pool.token0 else pool.token0
+    data = QUOTE_EXACT_INPUT_SINGLE_SELECTOR + "".join(
+        _encode_int(value) for value in (int(token_in, 16), int(token_out, 16), amount_in, pool.fee, 0)
+    )
+    result, = rpc_batch(requests.Session(), rpc_url, [("eth_call", [{"to": quoter, "data": data}, block])])
+    return int(result[2:66], 16) if result else None
+
+
+# ========================================
+# CLI
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Quote a Uniswap V3 pool locally from synced state")
+    parser.add_argument("--rpc-url", required=True, help="Ethereum RPC endpoint")
+    parser.add_argument("--pool", required=True, help="Uniswap V3 pool address")
+    parser.add_argument("--token-in", required=True, help="Token to sell (one of the pool's tokens)")
+    parser.add_argument("--amount-in", type=int, required=True, help="Amount in raw token units")
+    parser.add_argument("--watch", action="store_true", help="Keep following new blocks")
+    parser.add_argument("--check", action="store_true", help="Compare every quote with QuoterV2")
+    args = parser.parse_args()
+
+    sync = V3PoolSync(args.rpc_url)
+    pool = sync.add_pool(args.pool)
+    token_in = Web3.to_checksum_address(args.token_in)
+    print(f"🦄 {pool.address}: {pool.token0}/{pool.token1}, fee {pool.fee}, "
+          f"{len(pool.ticks)} initialized tick(s) synced at block {sync.block}")
+
+    while True:
+        amount_out = pool.quote(args.amount_in, token_in)
+        line = f"[{time.strftime('%H:%M:%S')}] Block {sync.block}: {args.amount_in} in → {amount_out} out"
+        if args.check:
+            expected = quoter_quote(args.rpc_url, pool, args.amount_in, token_in, block=hex(sync.block))
+            line += " ✓ matches QuoterV2" if expected == amount_out else f" ✗ QuoterV2 says {expected}"
+        print(line)
+        if not args.watch:
+            break
+        last_block = sync.block
+        while sync.block == last_block:
+            time.sleep(1)
+            sync.update()
+
+
+if __name__ == "__main__":
+    main()
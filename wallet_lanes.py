@@ -0,0 +1,365 @@
+"""
+Multi-wallet execution lanes
+
+Every wallet in the pool is an execution lane with its own nonce sequence and
+balance book. Orders are assigned to the lane that can fund them, so orders
+on different lanes never race on the same nonce and can land in the same
+block. Orders sharing a lane execute one after another.
+
+Instances that share a STATE_DIR (the trader containers) also count each
+other's orders: assignment runs under a lock on the state directory and sees
+the commitments the other instances recorded (see order_state.py), so each
+container's order goes to the least used lane.
+
+The wallet keys come from the same Secrets Manager secret as before:
+  WALLET_KEY   - single key (the original layout)
+  WALLET_KEYS  - additional keys, JSON list or comma separated
+
+Run directly to inspect or rebalance the lanes:
+  python wallet_lanes.py status --rpc-url URL --token 0x...
+  python wallet_lanes.py rebalance --rpc-url URL --token 0x... [--execute]
+Funds that running orders have reserved (recorded in the order state files,
+see order_state.py) are never moved.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+import boto3
+from botocore.exceptions import ClientError
+from web3 import Web3
+from eth_account import Account
+
+from contracts import CHAIN_ID, ERC20_ABI
+import order_state
+
+# ========================================
+# Constants
+# ========================================
+
+SECRET_NAME = os.environ.get('WALLET_SECRET_NAME', "limit-order-bot/wallet-key")
+SECRET_REGION = 'eu-north-1'
+
+TRANSFER_GAS_LIMIT = 100000
+SHARED_REFRESH = 10         # Seconds the other instances' commitments are cached for
+
+
+# ========================================
+# AWS SECRETS MANAGER - Fetch Wallet Keys
+# ========================================
+def get_secret():
+    """Fetch the wallet secret (dict) from AWS Secrets Manager"""
+    secret_name = SECRET_NAME
+    region_name = SECRET_REGION
+
+    # Create a Secrets Manager client
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+    except ClientError as e:
+        # For a list of exceptions thrown, see
+        # https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_GetSecretValue.html
+        print(f"❌ FATAL: Could not fetch PRIVATE_KEY from AWS Secrets Manager!")
+        print(f"   Error: {e}")
+        print(f"   Secret: {secret_name}")
+        print(f"   Region: {region_name}")
+        raise e
+
+    secret = get_secret_value_response['SecretString']
+    return json.loads(secret)
+
+
+def wallet_keys_from_secret(secret_dict):
+    """List of unique private keys in a wallet secret, WALLET_KEY first"""
+    keys = []
+    if secret_dict.get('WALLET_KEY'):
+        keys.append(secret_dict['WALLET_KEY'])
+
+    extra = secret_dict.get('WALLET_KEYS') or []
+    if isinstance(extra, str):
+        extra = json.loads(extra) if extra.strip().startswith('[') else extra.split(',')
+    keys.extend(key.strip() for key in extra if key.strip())
+
+    return list(dict.fromkeys(keys))
+
+
+def get_wallet_keys():
+    """Fetch all wallet private keys from AWS Secrets Manager"""
+    return wallet_keys_from_secret(get_secret())
+
+
+def raw_transaction(signed):
+    """Raw bytes of a signed transaction (rawTransaction was renamed in eth-account 0.13)"""
+    raw = getattr(signed, 'raw_transaction', None)
+    return raw if raw is not None else signed.rawTransaction
+
+
+# ========================================
+# Lanes
+# ========================================
+
+class ExecutionLane:
+    """
+    One wallet: its nonce sequence, token balances and funds committed to orders
+    """
+
+    def __init__(self, index, private_key):
+        self.index = index
+        self.private_key = private_key
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.lock = asyncio.Lock()
+        self.balances = {}      # token -> raw balance (as last read)
+        self.committed = {}     # token -> raw amount promised to assigned orders
+        self.shared = {}        # token -> raw amount promised to orders of other instances
+        self.shared_orders = 0  # Orders of other instances on this lane
+        self.eth_balance = 0
+        self.orders = set()
+        self.signer = None      # SigningService holding the key instead (see signing_service.py)
+        self._nonce = None
+
+    def __repr__(self):
+        return f"ExecutionLane({self.index}, {self.address})"
+
+    def attach_signer(self, signer):
+        """Sign in the signing service's workers from now on and drop the key from this process"""
+        if self.address not in signer.addresses:
+            raise ValueError(f"signing service has no key for lane {self.index} ({self.address})")
+        self.signer = signer
+        self.private_key = None
+        self.account = None
+
+    async def sign(self, transactions):
+        """
+        Sign transactions of this lane, returns [(raw transaction hex, tx hash hex), ...]
+        Off the event loop when a signing service is attached, inline otherwise
+        """
+        if self.signer is not None:
+            return await self.signer.sign(self.address, transactions)
+        return self.sign_blocking(transactions)
+
+    def sign_blocking(self, transactions):
+        if self.signer is not None:
+            return self.signer.sign_blocking(self.address, transactions)
+        signed = [Account.sign_transaction(tx, self.private_key) for tx in transactions]
+        return [(Web3.to_hex(raw_transaction(tx)), Web3.to_hex(tx.hash)) for tx in signed]
+
+    def refresh_balances(self, w3, tokens):
+        """Read ETH and token balances of the lane"""
+        self.eth_balance = w3.eth.get_balance(self.address)
+        for token in tokens:
+            contract = w3.eth.contract(address=token, abi=ERC20_ABI)
+            self.balances[token] = contract.functions.balanceOf(self.address).call()
+
+    def available(self, token):
+        """Token balance not yet committed to an order"""
+        return self.balances.get(token, 0) - self.committed.get(token, 0) - self.shared.get(token, 0)
+
+    def commit(self, order_id, token, amount):
+        self.committed[token] = self.committed.get(token, 0) + amount
+        self.orders.add(order_id)
+
+    def release(self, order_id, token, amount, spent=False):
+        """Free an order's commitment (and deduct it from the balance if it was spent)"""
+        if order_id not in self.orders:
+            return
+        self.orders.discard(order_id)
+        self.committed[token] = max(0, self.committed.get(token, 0) - amount)
+        if spent:
+            self.balances[token] = max(0, self.balances.get(token, 0) - amount)
+
+    def next_nonce(self, w3):
+        """Next unused nonce of the lane (read from chain only when unknown)"""
+        if self._nonce is None:
+            self._nonce = w3.eth.get_transaction_count(self.address, 'pending')
+        return self._nonce
+
+    def advance_nonce(self, count):
+        """Mark count nonces as used after a bundle was included"""
+        if self._nonce is not None:
+            self._nonce += count
+
+    def reset_nonce(self):
+        """Forget the local nonce so the next bundle re-reads it from chain"""
+        self._nonce = None
+
+
+class LanePool:
+    """All execution lanes of this process and the order -> lane assignment"""
+
+    def __init__(self, private_keys, state_dir=None):
+        self.lanes = [ExecutionLane(index, key) for index, key in enumerate(private_keys)]
+        self.assignments = {}   # order_id -> (lane, token, amount)
+        self.on_change = None   # Called with (order_id, lane, token, amount) on assign, lane None on release
+        self.state_dir = state_dir          # Shared with other instances - their orders count too
+        self._shared_loaded = None
+
+    def __len__(self):
+        return len(self.lanes)
+
+    def refresh_balances(self, w3, tokens):
+        for lane in self.lanes:
+            lane.refresh_balances(w3, set(tokens))
+
+    def assign(self, order_id, token, amount):
+        """
+        Assign an order to the lane with the fewest orders that can fund it
+        (ties go to the most uncommitted balance of token).
+        Returns the lane or None if no lane can fund the order.
+        """
+        if order_id in self.assignments:
+            return self.assignments[order_id][0]
+
+        # Held until the commitment is recorded, so instances starting together don't pick the same lane
+        lock = order_state.locked("lanes", self.state_dir) if self.state_dir else contextlib.nullcontext()
+        with lock:
+            if self.state_dir and (self._shared_loaded is None
+                                   or time.monotonic() - self._shared_loaded > SHARED_REFRESH):
+                self.load_shared_commitments(self.state_dir, other_processes=True)
+
+            candidates = [lane for lane in self.lanes if lane.available(token) >= amount]
+            if not candidates:
+                return None
+            lane = min(candidates, key=lambda lane: (len(lane.orders) + lane.shared_orders, -lane.available(token)))
+            lane.commit(order_id, token, amount)
+            self.assignments[order_id] = (lane, token, amount)
+            if self.on_change is not None:
+                self.on_change(order_id, lane, token, amount)
+        return lane
+
+    def release(self, order_id, spent=False):
+        assignment = self.assignments.pop(order_id, None)
+        if assignment:
+            lane, token, amount = assignment
+            lane.release(order_id, token, amount, spent=spent)
+            if self.on_change is not None:
+                self.on_change(order_id, None, token, amount)
+
+    def load_shared_commitments(self, state_dir=order_state.STATE_DIR, other_processes=False):
+        """
+        Read the funds orders of running instances have reserved (see order_state.py)
+        into the lanes' shared commitments, replacing what was read before
+        Returns the number of commitments on this pool's lanes
+        """
+        lanes = {lane.address: lane for lane in self.lanes}
+        for lane in self.lanes:
+            lane.shared, lane.shared_orders = {}, 0
+        count = 0
+        for _, commitment in order_state.load_commitments(state_dir, other_processes):
+            lane = lanes.get(commitment["address"])
+            if lane is not None:
+                token = commitment["token"]
+                lane.shared[token] = lane.shared.get(token, 0) + int(commitment["amount"])
+                lane.shared_orders += 1
+                count += 1
+        self._shared_loaded = time.monotonic()
+        return count
+
+    def plan_rebalance(self, token):
+        """
+        Transfers that even out the uncommitted balance of token across lanes
+        Returns a list of (from_lane, to_lane, amount)
+        """
+        if len(self.lanes) < 2:
+            return []
+
+        total_free = sum(max(0, lane.available(token)) for lane in self.lanes)
+        target = total_free // len(self.lanes)
+        surplus = [[lane, lane.available(token) - target] for lane in self.lanes if lane.available(token) > target]
+        deficit = [[lane, target - lane.available(token)] for lane in self.lanes if lane.available(token) < target]
+
+        transfers = []
+        for entry in deficit:
+            to_lane, needed = entry
+            for source in surplus:
+                if needed <= 0:
+                    break
+                amount = min(needed, source[1])
+                if amount <= 0:
+                    continue
+                transfers.append((source[0], to_lane, amount))
+                source[1] -= amount
+                needed -= amount
+        return transfers
+
+    def rebalance(self, w3, token, gas_price_gwei):
+        """
+        Execute a rebalance plan with plain ERC20 transfers
+        Returns the list of sent transaction hashes
+        """
+        contract = w3.eth.contract(address=token, abi=ERC20_ABI)
+        tx_hashes = []
+        for from_lane, to_lane, amount in self.plan_rebalance(token):
+            tx = contract.functions.transfer(to_lane.address, amount).build_transaction({
+                "from": from_lane.address,
+                "nonce": from_lane.next_nonce(w3),
+                "gas": TRANSFER_GAS_LIMIT,
+                "gasPrice": w3.to_wei(gas_price_gwei, 'gwei'),
+                "chainId": CHAIN_ID
+            })
+            (raw, _), = from_lane.sign_blocking([tx])
+            tx_hashes.append(Web3.to_hex(w3.eth.send_raw_transaction(raw)))
+            from_lane.advance_nonce(1)
+            from_lane.balances[token] = from_lane.balances.get(token, 0) - amount
+            to_lane.balances[token] = to_lane.balances.get(token, 0) + amount
+        return tx_hashes
+
+
+# ========================================
+# CLI
+# ========================================
+
+def print_lanes(pool, token):
+    for lane in pool.lanes:
+        print(f"   Lane {lane.index}: {lane.address}")
+        print(f"      Token: {lane.balances.get(token, 0)} "
+              f"(committed {lane.committed.get(token, 0) + lane.shared.get(token, 0)})")
+        print(f"      ETH: {Web3.from_wei(lane.eth_balance, 'ether')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and rebalance the wallet execution lanes")
+    parser.add_argument("command", choices=["status", "rebalance"])
+    parser.add_argument("--rpc-url", required=True, help="Ethereum RPC endpoint")
+    parser.add_argument("--token", required=True, help="Token to show / rebalance (checksummed address)")
+    parser.add_argument("--gas-price-gwei", type=float, default=50)
+    parser.add_argument("--execute", action="store_true",
+                        help="Actually send the rebalance transfers (default: only print the plan)")
+    parser.add_argument("--state-dir", default=order_state.STATE_DIR,
+                        help=f"Directory with the bot state files (default: {order_state.STATE_DIR})")
+    args = parser.parse_args()
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    pool = LanePool(get_wallet_keys())
+    pool.refresh_balances(w3, [args.token])
+    committed = pool.load_shared_commitments(args.state_dir)
+
+    print(f"💼 {len(pool)} execution lane(s), {committed} order(s) holding funds")
+    print_lanes(pool, args.token)
+
+    if args.command == "rebalance":
+        transfers = pool.plan_rebalance(args.token)
+        if not transfers:
+            print("\n✓ Lanes already balanced")
+            return
+        print(f"\n🔁 Rebalance plan:")
+        for from_lane, to_lane, amount in transfers:
+            print(f"   Lane {from_lane.index} → Lane {to_lane.index}: {amount}")
+        if args.execute:
+            for tx_hash in pool.rebalance(w3, args.token, args.gas_price_gwei):
+                print(f"   ✓ Sent {tx_hash}")
+        else:
+            print("\n   (dry run - pass --execute to send)")
+
+
+if __name__ == "__main__":
+    main()